@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Per-turn ReAct setup cost: rebuilding tool map + bind_tools every turn vs.
+reusing a precompiled CompiledAgent.
+
+No network calls are made; only the setup done before the first LLM call is
+timed (tool map, schema serialization, bind_tools).
+
+Usage:
+  python benchmarks/bench_agent_setup.py [turns]
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.agents.react_agents import CompiledAgent, _AGENT_TOOLS  # noqa: E402
+from src.config import sonnet_llm  # noqa: E402
+
+
+def _time(fn, turns: int) -> list[float]:
+    samples = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def main(turns: int) -> None:
+    print(f"{'agent':<14} {'tools':>5} {'per-turn us':>12} {'precompiled us':>15} {'compile once us':>16}")
+    for name, tools in _AGENT_TOOLS.items():
+        start = time.perf_counter()
+        agent = CompiledAgent(name, sonnet_llm, tools)
+        compile_us = (time.perf_counter() - start) * 1_000_000
+
+        def per_turn():
+            tool_map = {t.name: t for t in tools}
+            return tool_map, sonnet_llm.bind_tools(tools)
+
+        def precompiled():
+            return agent.tool_map, agent.bound_llm
+
+        rebuilt = statistics.median(_time(per_turn, turns))
+        reused = statistics.median(_time(precompiled, turns))
+        print(f"{name:<14} {len(tools):>5} {rebuilt:>12.1f} {reused:>15.2f} {compile_us:>16.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
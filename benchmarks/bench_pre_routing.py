@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Per-turn overhead of the standard vs fused pre-routing topology.
+
+Only LLM-free turns are timed (blocked input, locked session), so the numbers
+are pure graph overhead: scheduling, reducer merges and checkpoint writes.
+
+Usage:
+  python benchmarks/bench_pre_routing.py [turns]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from itertools import count
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+
+from src.graph.graph_builder import compile_graph  # noqa: E402
+
+_CUSTOMER = {
+    "customer_email": "sarah@example.com",
+    "customer_first_name": "Sarah",
+    "customer_last_name": "Jones",
+    "customer_shopify_id": "gid://shopify/Customer/7424155189325",
+}
+
+_THREAD_IDS = count()
+
+_CASES = {
+    "blocked_input": {"messages": [HumanMessage(content="?? !!")]},
+    "locked_session": {"messages": [HumanMessage(content="Any update?")], "is_escalated": True},
+}
+
+
+async def _time_turns(graph, input_state: dict, turns: int) -> list[float]:
+    samples = []
+    for _ in range(turns):
+        config = {"configurable": {"thread_id": f"bench_{next(_THREAD_IDS)}"}}
+        start = time.perf_counter()
+        await graph.ainvoke({**_CUSTOMER, **input_state}, config=config)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main(turns: int) -> None:
+    graphs = {
+        "standard": compile_graph(MemorySaver()),
+        "fused": compile_graph(MemorySaver(), fused_pre_routing=True),
+    }
+    print(f"{'case':<16} {'topology':<10} {'p50 ms':>8} {'mean ms':>8} {'steps':>6}")
+    for case, input_state in _CASES.items():
+        medians = {}
+        for name, graph in graphs.items():
+            await _time_turns(graph, input_state, 20)  # warm-up
+            samples = await _time_turns(graph, input_state, turns)
+            medians[name] = statistics.median(samples)
+            steps = len([
+                s async for s in graph.astream(
+                    {**_CUSTOMER, **input_state},
+                    config={"configurable": {"thread_id": f"steps_{name}_{case}"}},
+                )
+            ])
+            print(
+                f"{case:<16} {name:<10} {medians[name]:>8.3f} "
+                f"{statistics.mean(samples):>8.3f} {steps:>6}"
+            )
+        saved = medians["standard"] - medians["fused"]
+        print(f"{case:<16} {'saved':<10} {saved:>8.3f} ({saved / medians['standard']:.0%})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Offline load test: concurrent sessions through the full graph with the fake
+LLM backend (LLM_BACKEND=fake), so orchestration overhead, limiter queueing
+and parallel branches can be measured without network calls or spend.
+
+Latency per model comes from LLM_FAKE_SONNET_LATENCY / LLM_FAKE_HAIKU_LATENCY
+and responses from LLM_FAKE_SCRIPT (see src/llm/fake.py).
+
+Usage:
+  python benchmarks/load_test_fake.py [sessions] [turns_per_session]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+
+from src.graph.graph_builder import compile_graph  # noqa: E402
+
+_MESSAGES = [
+    "Hi, where is my order #1234?",
+    "The patches are not working for my son, I want my money back",
+    "Can I change the shipping address on my order?",
+    "My discount code isn't working",
+    "Thanks so much, the kids love them!",
+]
+
+
+async def _session(graph, index: int, turns: int) -> list[float]:
+    config = {"configurable": {"thread_id": f"load_{index}"}}
+    samples = []
+    for turn in range(turns):
+        message = _MESSAGES[(index + turn) % len(_MESSAGES)]
+        start = time.perf_counter()
+        await graph.ainvoke(
+            {
+                "messages": [HumanMessage(content=message)],
+                "customer_email": f"load{index}@example.com",
+                "customer_first_name": "Jane",
+                "customer_last_name": "Doe",
+                "customer_shopify_id": "",
+            },
+            config=config,
+        )
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def main(sessions: int, turns: int) -> None:
+    graph = compile_graph(MemorySaver())
+    start = time.perf_counter()
+    results = await asyncio.gather(*(_session(graph, i, turns) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    samples = sorted(s for result in results for s in result)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"sessions={sessions} turns/session={turns} backend={os.environ['LLM_BACKEND']}")
+    print(f"  throughput : {len(samples) / elapsed:.2f} turns/s ({elapsed:.2f}s total)")
+    print(f"  turn p50   : {statistics.median(samples) * 1000:.0f} ms")
+    print(f"  turn p95   : {p95 * 1000:.0f} ms")
+    print(f"  turn max   : {samples[-1] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3,
+    ))
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Prompt token budget check: tokens per agent/intent system prompt and per
+shared block, compared against benchmarks/prompt_budgets.json. Exits 1 when
+a prompt is over budget (or has none), so prompt bloat fails CI.
+
+Counts use the ~4 chars/token estimate; --exact asks the Anthropic
+count_tokens endpoint instead (needs the anthropic package and ANTHROPIC_API_KEY).
+
+Usage:
+  python benchmarks/prompt_budget.py [--exact] [--update]
+    --update   rewrite the budget file as current tokens + 10% headroom
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.prompts.budget import check_budgets, format_report, load_budgets, prompt_token_report  # noqa: E402
+
+BUDGET_FILE = os.path.join(os.path.dirname(__file__), "prompt_budgets.json")
+_HEADROOM = 1.10
+
+
+def _exact_counter():
+    import anthropic
+
+    client = anthropic.Anthropic()
+    model = "claude-sonnet-4-20250514"
+
+    def count(text: str) -> int:
+        messages = [{"role": "user", "content": "."}]
+        with_system = client.messages.count_tokens(model=model, system=text or ".", messages=messages)
+        baseline = client.messages.count_tokens(model=model, system=".", messages=messages)
+        return with_system.input_tokens - baseline.input_tokens
+
+    return count
+
+
+def main(argv: list[str]) -> int:
+    report = prompt_token_report(_exact_counter()) if "--exact" in argv else prompt_token_report()
+    if "--update" in argv:
+        budgets = {
+            f"{row['agent']}/{row['intent']}": math.ceil(row["total_tokens"] * _HEADROOM)
+            for row in report["prompts"]
+        }
+        with open(BUDGET_FILE, "w", encoding="utf-8") as f:
+            json.dump(budgets, f, indent=2)
+            f.write("\n")
+    budgets = load_budgets(BUDGET_FILE)
+
+    print(format_report(report, budgets))
+    problems = check_budgets(report, budgets)
+    if problems:
+        print("\nPROMPT BUDGET EXCEEDED:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return 1
+    print("\nAll prompts within budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
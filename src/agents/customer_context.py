@@ -0,0 +1,139 @@
+"""
+Customer context prefetch.
+
+/session/start already knows the customer's email, and almost every first
+turn opens with shopify_get_customer_orders (and often skio_get_subscriptions).
+customer_prefetch.start() runs both lookups in the background while the
+customer is still writing; the first /session/message takes the results
+(waiting at most CUSTOMER_PREFETCH_WAIT_SECONDS) into the turn's input state:
+
+- order_details / subscription_status: compacted results, rendered into the
+  agent's SESSION CONTEXT (format_customer_context). They describe the first
+  turn only: later turns clear them (main._prepare_turn), and so does a
+  successful state-changing tool call (_run_react_agent).
+- tool_calls_log entries for turn 1, so guardrails, reflection rules and
+  escalation payloads treat them like the agent's own lookups
+
+Prefetches never taken (no first message) are cancelled after
+CUSTOMER_PREFETCH_TTL_SECONDS.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Optional
+
+from src.config import (
+    CUSTOMER_PREFETCH_ENABLED,
+    CUSTOMER_PREFETCH_TTL_SECONDS,
+    CUSTOMER_PREFETCH_WAIT_SECONDS,
+)
+from src.tools.compaction import compact_tool_result
+from src.tools.shopify_tools import shopify_get_customer_orders
+from src.tools.skio_tools import skio_get_subscriptions
+
+# (tool, params from email) — params match what tool_call_guardrails would send,
+# so a repeat call by the agent is recognised as a duplicate.
+_LOOKUPS: tuple[tuple[Any, Callable[[str], dict]], ...] = (
+    (shopify_get_customer_orders, lambda email: {"email": email, "after": "null", "limit": 10}),
+    (skio_get_subscriptions, lambda email: {"email": email}),
+)
+
+# Prefetched lookups belong to the first customer turn.
+_FIRST_TURN = 1
+
+
+async def _lookup(tool, params: dict) -> dict:
+    try:
+        result = await tool.ainvoke(params)
+    except Exception as exc:
+        result = {"success": False, "error": str(exc)}
+    return {
+        "tool_name": tool.name,
+        "params": params,
+        "result": result if isinstance(result, dict) else str(result),
+        "turn_index": _FIRST_TURN,
+        "prefetched": True,
+    }
+
+
+def _state_update(entries: list[dict]) -> dict:
+    update: dict = {"tool_calls_log": entries}
+    for entry in entries:
+        result = entry["result"]
+        if not isinstance(result, dict) or not result.get("success"):
+            continue
+        data = compact_tool_result(entry["tool_name"], result).get("data")
+        if entry["tool_name"] == "shopify_get_customer_orders":
+            update["order_details"] = data
+        elif entry["tool_name"] == "skio_get_subscriptions":
+            update["subscription_status"] = data
+            subscription_id = data.get("subscriptionId") if isinstance(data, dict) else None
+            if isinstance(subscription_id, str) and subscription_id:
+                update["current_subscription_id"] = subscription_id
+    return update
+
+
+class CustomerContextPrefetch:
+    """Background customer lookups per session, handed to the session's first turn."""
+
+    def __init__(self, lookups=_LOOKUPS, ttl_seconds: float = CUSTOMER_PREFETCH_TTL_SECONDS) -> None:
+        self.lookups = lookups
+        self.ttl_seconds = ttl_seconds
+        self._tasks: dict[str, tuple[asyncio.Task, float]] = {}  # session -> (task, started at)
+        self.started = 0
+        self.used = 0
+        self.timed_out = 0
+        self.evicted = 0
+
+    def start(self, session_id: str, email: str) -> None:
+        if not CUSTOMER_PREFETCH_ENABLED or not email:
+            return
+        self._evict_expired()
+        self.discard(session_id)
+        self._tasks[session_id] = (asyncio.create_task(self._fetch(email)), time.monotonic())
+        self.started += 1
+
+    def discard(self, session_id: str) -> None:
+        """Cancel and drop a session's prefetch (no-op if there is none)."""
+        entry = self._tasks.pop(session_id, None)
+        if entry is not None:
+            entry[0].cancel()
+
+    def _evict_expired(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        for session_id in [sid for sid, (_, started) in self._tasks.items() if started < cutoff]:
+            self.discard(session_id)
+            self.evicted += 1
+
+    async def _fetch(self, email: str) -> list[dict]:
+        return list(await asyncio.gather(*(_lookup(tool, params(email)) for tool, params in self.lookups)))
+
+    async def take(self, session_id: str, timeout: Optional[float] = None) -> dict:
+        """State update for the session's first turn ({} if nothing was prefetched in time)."""
+        entry = self._tasks.pop(session_id, None)
+        if entry is None:
+            return {}
+        task = entry[0]
+        wait = CUSTOMER_PREFETCH_WAIT_SECONDS if timeout is None else timeout
+        try:
+            entries = await asyncio.wait_for(task, wait)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            return {}
+        self.used += 1
+        return _state_update(entries)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": CUSTOMER_PREFETCH_ENABLED,
+            "started": self.started,
+            "used": self.used,
+            "timed_out": self.timed_out,
+            "evicted": self.evicted,
+            "pending": len(self._tasks),
+        }
+
+
+customer_prefetch = CustomerContextPrefetch()
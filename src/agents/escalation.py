@@ -1,18 +1,29 @@
 """
 Escalation Handler + Post-Escalation Session Lock.
 
-Generates structured summary, customer message, and locks the session.
+Returns the customer message and locks the session immediately; the
+structured payload is queued for Monica and its Sonnet summary is written
+by a background task (the customer message does not depend on it). The
+finished summary, and the summary call's model_calls record, are written
+back into the session checkpoint through the queue's persister (main.py).
 """
 
 from __future__ import annotations
 
+import asyncio
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel
 
-from src.config import sonnet_llm
+from src.config import ESCALATION_QUEUE_MAX_FINISHED, sonnet_llm
+from src.llm.accounting import model_call_scope, model_call_step, track_model_calls
+from src.llm.hedging import LLMDeadlineExceeded
+from src.llm.limiter import Priority, llm_priority
 
 
 class EscalationPayload(BaseModel):
@@ -27,6 +38,8 @@ class EscalationPayload(BaseModel):
     conversation_history: list[str]
     escalated_to: str = "Monica - Head of CS"
     created_at: str = ""
+    escalation_id: str = ""
+    summary_status: str = "pending"  # pending → ready | fallback
 
 
 _HIGH_PRIORITY = {"health_concern", "chargeback_risk", "billing_error", "technical_error"}
@@ -125,33 +138,163 @@ def _resolve_subscription_id(state: dict) -> Optional[str]:
     return None
 
 
+def _resolve_draft_order_ids(state: dict) -> list[str]:
+    """Draft orders created this session (kept out of the LLM's hands)."""
+    ids = []
+    for log in state.get("tool_calls_log") or []:
+        if log.get("tool_name") != "shopify_create_draft_order":
+            continue
+        result = log.get("result")
+        data = result.get("data") if isinstance(result, dict) else None
+        if not isinstance(data, dict):
+            continue
+        draft_id = data.get("draftOrderId") or data.get("id")
+        if isinstance(draft_id, str) and draft_id and draft_id not in ids:
+            ids.append(draft_id)
+    return ids
+
+
+def _summary_facts(draft_order_ids: list[str]) -> str:
+    return f"\nDraft order(s): {', '.join(draft_order_ids)}" if draft_order_ids else ""
+
+
+def _clean_for_summary(text: str) -> str:
+    lines = text.split("\n")
+    cleaned = [
+        line
+        for line in lines
+        if not line.strip().lower().startswith(
+            ("thought:", "action:", "observation:", "escalate:", "handoff:")
+        )
+    ]
+    return "\n".join(cleaned).strip()
 
 
+# ─── Escalation Queue ───────────────────────────────────────────────────────
 
-async def escalation_handler_node(state: dict) -> dict:
-    """Build structured escalation payload + customer message."""
 
-    def _clean_for_summary(text: str) -> str:
-        lines = text.split("\n")
-        cleaned = [
-            line
-            for line in lines
-            if not line.strip().lower().startswith(
-                ("thought:", "action:", "observation:", "escalate:", "handoff:")
+class EscalationQueue:
+    """
+    In-memory queue of escalation payloads; summaries are filled in later.
+    Once a summary has landed (and been persisted), the payload counts as
+    finished; only the newest max_finished finished payloads are kept.
+    """
+
+    def __init__(self, max_finished: int = ESCALATION_QUEUE_MAX_FINISHED) -> None:
+        self.max_finished = max_finished
+        self._payloads: dict[str, dict] = {}
+        self._done: dict[str, asyncio.Event] = {}
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+        self._persister: Optional[Callable[[dict, dict], Awaitable[None]]] = None
+
+    def set_persister(self, persister: Optional[Callable[[dict, dict], Awaitable[None]]]) -> None:
+        """`await persister(thread_config, state_update)` writes a finished summary into the checkpoint."""
+        self._persister = persister
+
+    def add(self, payload: dict) -> None:
+        self._payloads[payload["escalation_id"]] = payload
+        self._done[payload["escalation_id"]] = asyncio.Event()
+
+    def get(self, escalation_id: str) -> Optional[dict]:
+        return self._payloads.get(escalation_id)
+
+    def list(self) -> list[dict]:
+        return sorted(self._payloads.values(), key=lambda p: p.get("created_at", ""), reverse=True)
+
+    def set_summary(self, escalation_id: str, summary: str, status: str) -> None:
+        payload = self._payloads.get(escalation_id)
+        if payload is None:
+            return
+        payload["summary"] = summary
+        payload["summary_status"] = status
+        done = self._done.pop(escalation_id, None)
+        if done is not None:
+            done.set()
+
+    async def persist(self, escalation_id: str, thread_config: Optional[dict], model_calls: list[dict]) -> None:
+        """Write the payload (with its summary) and the summary's model calls back to the session state."""
+        payload = self._payloads.get(escalation_id)
+        if self._persister is not None and thread_config and payload is not None:
+            try:
+                await self._persister(thread_config, {"escalation_payload": dict(payload), "model_calls": model_calls})
+            except Exception as exc:
+                print(f"⚠️ Escalation {escalation_id}: summary not written to checkpoint ({exc})")
+        self._finish(escalation_id)
+
+    def _finish(self, escalation_id: str) -> None:
+        """Mark a payload finished and drop the oldest finished ones over max_finished."""
+        if escalation_id not in self._payloads:
+            return
+        self._finished[escalation_id] = None
+        while len(self._finished) > max(0, self.max_finished):
+            oldest, _ = self._finished.popitem(last=False)
+            self._payloads.pop(oldest, None)
+
+    def track(self, task: asyncio.Task) -> None:
+        """Keep a reference so the background task isn't garbage-collected."""
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """Wait for pending background summaries (shutdown, tests)."""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+
+    async def wait_for_summary(self, escalation_id: str, timeout: Optional[float] = None) -> Optional[dict]:
+        done = self._done.get(escalation_id)
+        if done is not None:
+            await asyncio.wait_for(done.wait(), timeout)
+        return self.get(escalation_id)
+
+
+escalation_queue = EscalationQueue()
+
+
+async def _summarize_escalation(
+    escalation_id: str, msgs: list[str], fallback: str, facts: str, thread_config: Optional[dict] = None,
+) -> None:
+    """Background: Sonnet summary for Monica, written into the queued payload and the checkpoint."""
+    with model_call_scope("escalation_handler") as calls, model_call_step("summary"):
+        try:
+            with llm_priority(Priority.BACKGROUND):
+                summary_result = await sonnet_llm.ainvoke(
+                    "Summarize this customer support interaction in 2-3 sentences "
+                    "for handoff to a human agent. Include: what the customer wants, "
+                    "what was tried, and why it's being escalated.\n\n"
+                    f"Messages:\n{msgs}"
+                )
+            escalation_queue.set_summary(escalation_id, f"{summary_result.content}{facts}", "ready")
+        except asyncio.CancelledError:
+            escalation_queue.set_summary(escalation_id, fallback, "fallback")
+            raise
+        except LLMDeadlineExceeded:
+            escalation_queue.set_summary(
+                escalation_id, fallback.replace("(Summary pending.)", "(Summary unavailable — model deadline exceeded.)"),
+                "fallback",
             )
-        ]
-        return "\n".join(cleaned).strip()
+        except Exception as exc:
+            escalation_queue.set_summary(escalation_id, f"(Summary failed: {exc}) {fallback}", "fallback")
+    await escalation_queue.persist(escalation_id, thread_config, calls)
 
+
+def _thread_config(config: Optional[RunnableConfig]) -> Optional[dict]:
+    """Just the thread of the running graph config (safe to reuse after the run ends)."""
+    thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+    return {"configurable": {"thread_id": thread_id}} if thread_id else None
+
+
+@track_model_calls("escalation_handler")
+async def escalation_handler_node(state: dict, config: Optional[RunnableConfig] = None) -> dict:
+    """Build structured escalation payload + customer message (summary in background)."""
     raw_msgs = [m.content for m in state.get("messages", []) if hasattr(m, "content")]
     msgs = [_clean_for_summary(m) for m in raw_msgs]
     msgs = [m for m in msgs if m]
 
-    summary_result = await sonnet_llm.ainvoke(
-        "Summarize this customer support interaction in 2-3 sentences "
-        "for handoff to a human agent. Include: what the customer wants, "
-        "what was tried, and why it's being escalated.\n\n"
-        f"Messages:\n{msgs}"
-    )
+    # Placeholder until the background summary lands; carries the hard facts.
+    last_customer = msgs[-1][:300] if msgs else ""
+    facts = _summary_facts(_resolve_draft_order_ids(state))
+    summary = f"(Summary pending.) Last message: {last_customer}{facts}"
 
     category = state.get("escalation_reason", "uncertain")
     priority = "high" if category in _HIGH_PRIORITY else "normal"
@@ -167,11 +310,16 @@ async def escalation_handler_node(state: dict) -> dict:
         subscription_id=resolved_subscription_id,
         category=category,
         priority=priority,
-        summary=summary_result.content,
+        summary=summary,
         actions_taken=state.get("actions_taken", []),
         conversation_history=msgs[-10:],
         created_at=datetime.now(timezone.utc).isoformat(),
+        escalation_id=uuid.uuid4().hex[:12],
     )
+    escalation_queue.add(payload.model_dump())
+    escalation_queue.track(asyncio.create_task(
+        _summarize_escalation(payload.escalation_id, msgs, summary, facts, _thread_config(config))
+    ))
 
     if category == "health_concern":
         customer_message = (
@@ -196,7 +344,7 @@ async def escalation_handler_node(state: dict) -> dict:
         "escalation_payload": payload.model_dump(),
         "agent_reasoning": [
             f"ESCALATED [{priority.upper()}]: {category} - "
-            f"{payload.summary[:120]}"
+            f"summary queued ({payload.escalation_id})"
         ],
     }
     if resolved_order_id:
@@ -0,0 +1,152 @@
+"""
+Per-turn model choice for the ReAct agents.
+
+Simple turns (e.g. a first-contact WISMO status lookup: one read-only tool
+call and a policy-shaped reply) run on Haiku; everything else stays on
+Sonnet. Haiku is picked only when every signal agrees:
+- intent in AGENT_HAIKU_INTENTS and classifier confidence >= AGENT_HAIKU_MIN_CONFIDENCE
+- at most AGENT_HAIKU_MAX_TURNS customer turns so far (long threads carry
+  escalation / repeat-contact judgement)
+- no destructive tool in the likely plan (refund, cancel, address change, ...)
+- no earlier draft in the session needed a revision, no handoff this turn,
+  no risk flag from input guardrails
+
+A Haiku draft that fails the deterministic output guardrails or a reflection
+rule is discarded and the turn is rerun on Sonnet (haiku_draft_problem).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.config import (
+    AGENT_HAIKU_INTENTS,
+    AGENT_HAIKU_MAX_TURNS,
+    AGENT_HAIKU_MIN_CONFIDENCE,
+    AGENT_MODEL_ROUTING_ENABLED,
+    get_current_context,
+    haiku_llm,
+)
+from src.patterns.guardrails import output_guardrails_node
+from src.patterns.reflection_rules import evaluate_reflection_rules
+
+# Customer wording that points at a destructive tool in the plan.
+_DESTRUCTIVE_HINTS: dict[str, re.Pattern] = {
+    "shopify_refund_order": re.compile(r"\b(refund|money back|reimburse)", re.IGNORECASE),
+    "shopify_create_store_credit": re.compile(r"\bstore credit\b", re.IGNORECASE),
+    "shopify_cancel_order": re.compile(r"\bcancel", re.IGNORECASE),
+    "shopify_create_return": re.compile(r"\b(return|send (it|them) back)\b", re.IGNORECASE),
+    "shopify_update_order_shipping_address": re.compile(r"\baddress\b", re.IGNORECASE),
+    "shopify_create_discount_code": re.compile(r"\b(discount|coupon|promo)", re.IGNORECASE),
+    "skio_pause_subscription": re.compile(r"\b(pause|skip|subscription)", re.IGNORECASE),
+    "reship": re.compile(r"\b(reship|replacement|replace|resend)", re.IGNORECASE),
+}
+
+_RISK_FLAGS = (
+    "flag_escalation_risk",
+    "flag_chargeback_threat",
+    "flag_health_concern",
+    "flag_entire_order_wrong",
+    "flag_reship_acceptance",
+    "flag_partial_delivery",
+)
+
+
+@dataclass
+class ModelChoice:
+    tier: str  # "haiku" | "sonnet"
+    reasons: list[str] = field(default_factory=list)
+
+
+def _customer_turns(state: dict) -> tuple[int, str]:
+    messages = [m for m in state.get("messages") or [] if getattr(m, "type", None) == "human"]
+    last = messages[-1].content if messages and isinstance(messages[-1].content, str) else ""
+    return len(messages), last
+
+
+def likely_destructive_tools(message: str) -> list[str]:
+    return [tool for tool, hint in _DESTRUCTIVE_HINTS.items() if hint.search(message or "")]
+
+
+def choose_agent_model(agent: str, state: dict) -> ModelChoice:
+    """Haiku when the turn is simple on every signal, otherwise Sonnet (with why)."""
+    if not AGENT_MODEL_ROUTING_ENABLED or haiku_llm is None:
+        return ModelChoice("sonnet", ["routing disabled"])
+
+    intent = state.get("ticket_category") or "GENERAL"
+    confidence = int(state.get("intent_confidence") or 0)
+    turns, message = _customer_turns(state)
+    reasons = []
+    if intent not in AGENT_HAIKU_INTENTS:
+        reasons.append(f"intent {intent}")
+    if confidence < AGENT_HAIKU_MIN_CONFIDENCE:
+        reasons.append(f"confidence {confidence}% < {AGENT_HAIKU_MIN_CONFIDENCE}%")
+    if turns > AGENT_HAIKU_MAX_TURNS:
+        reasons.append(f"turn {turns} > {AGENT_HAIKU_MAX_TURNS}")
+    destructive = likely_destructive_tools(message)
+    if destructive:
+        reasons.append(f"destructive plan ({', '.join(destructive)})")
+    if int(state.get("reflection_failures") or 0):
+        reasons.append(f"{state['reflection_failures']} earlier revision(s)")
+    if int(state.get("handoff_count_this_turn") or 0):
+        reasons.append("handoff this turn")
+    flags = [flag for flag in _RISK_FLAGS if state.get(flag)]
+    if flags:
+        reasons.append(", ".join(flags))
+
+    if reasons:
+        return ModelChoice("sonnet", reasons)
+    return ModelChoice("haiku", [f"{intent} @ {confidence}%, turn {turns}, read-only plan"])
+
+
+def haiku_draft_problem(state: dict, result: dict) -> Optional[str]:
+    """Why a Haiku draft must be redone on Sonnet (output guardrails / rule engine), else None."""
+    draft = result["messages"][-1].content if result.get("messages") else ""
+    view = {
+        **state,
+        "tool_calls_log": result.get("tool_calls_log", state.get("tool_calls_log")),
+        "messages": list(state.get("messages") or []) + list(result.get("messages") or []),
+    }
+    guard = output_guardrails_node(view)
+    if not guard.get("output_guardrail_passed", True):
+        issues = guard.get("output_guardrail_issues") or ["output guardrails failed"]
+        return issues[0]
+    if guard.get("is_handoff") or guard.get("is_escalation"):
+        return None
+
+    turns, message = _customer_turns(state)
+    day = get_current_context()["day_of_week"]
+    for verdict in evaluate_reflection_rules(view, draft, message, turns, day):
+        if verdict.passed is False:
+            return f"{verdict.rule}: {verdict.reason}"
+    return None
+
+
+class ModelRouterStats:
+    """Turns per (agent, tier) and Haiku drafts upgraded to Sonnet."""
+
+    def __init__(self) -> None:
+        self.turns: dict[str, dict[str, int]] = {}
+        self.upgrades: dict[str, int] = {}
+
+    def record(self, agent: str, tier: str) -> None:
+        by_tier = self.turns.setdefault(agent, {"haiku": 0, "sonnet": 0})
+        by_tier[tier] += 1
+
+    def record_upgrade(self, agent: str) -> None:
+        self.upgrades[agent] = self.upgrades.get(agent, 0) + 1
+
+    def stats(self) -> dict:
+        haiku = sum(t["haiku"] for t in self.turns.values())
+        total = haiku + sum(t["sonnet"] for t in self.turns.values())
+        return {
+            "enabled": AGENT_MODEL_ROUTING_ENABLED,
+            "turns": {agent: dict(tiers) for agent, tiers in self.turns.items()},
+            "haiku_share": round(haiku / total, 3) if total else 0.0,
+            "upgrades": dict(self.upgrades),
+        }
+
+
+model_router_stats = ModelRouterStats()
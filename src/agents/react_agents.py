@@ -1,20 +1,49 @@
 """
 ReAct Sub-Agent factories.
 
-Each agent gets a dynamically-built system prompt injected with customer context
-and current date/day. We use LangGraph's create_react_agent for the reasoning loop.
+Each agent gets a system prompt made of a static, prompt-cached policy block
+followed by a small SESSION CONTEXT block (customer, date/day, wait promise,
+orders and subscriptions prefetched at session start, and after a handoff
+the lookups the previous agent already made this turn).
+Tool-bound models are precompiled per agent and model tier (CompiledAgent)
+and driven by a manual ReAct loop bounded by a ReactBudget; model_router picks
+the tier per turn.
+account_agent and issue_agent get the compact static prompt for the turn's
+intent when PROMPT_VARIANTS_ENABLED.
 """
 
 from __future__ import annotations
 
+import asyncio
+
 from langchain_core.messages import SystemMessage
 
-from src.config import get_current_context, sonnet_llm
+from src.agents.model_router import choose_agent_model, haiku_draft_problem, model_router_stats
+from src.agents.react_budget import ReactBudget, react_budget_stats
+from src.agents.tool_memo import TurnToolMemo, tool_memo_stats, turn_findings
+from src.config import (
+    PARALLEL_TOOL_CALLS_ENABLED,
+    PROMPT_VARIANTS_ENABLED,
+    get_current_context,
+    haiku_llm,
+    sonnet_llm,
+)
+from src.llm.accounting import model_call_step, track_model_calls
+from src.llm.hedging import LLMDeadlineExceeded
+from src.llm.streaming import CustomerTextFilter, TokenChannel, chunk_text, current_channel
+from src.llm.usage import format_cache_usage
 from src.patterns.guardrails import tool_call_guardrails
 from src.prompts.account_prompt import build_account_prompt
 from src.prompts.issue_prompt import build_issue_prompt
+from src.prompts.shared_blocks import format_customer_context, format_handoff_context
 from src.prompts.wismo_prompt import build_wismo_prompt
-from src.tools.tool_groups import account_tools, issue_tools, wismo_tools
+from src.tools.compaction import tool_message_content
+from src.tools.tool_groups import READ_ONLY_TOOLS, account_tools, issue_tools, wismo_tools
+
+try:
+    from langchain_anthropic.chat_models import convert_to_anthropic_tool as _tool_schema
+except ImportError:  # langchain_anthropic is optional (see src.config)
+    from langchain_core.utils.function_calling import convert_to_openai_tool as _tool_schema
 
 
 def _strip_internal_markers(text: str) -> str:
@@ -43,9 +72,24 @@ def _strip_internal_markers(text: str) -> str:
     return result
 
 
-def _build_system_message(builder_fn, state: dict) -> str:
-    """Build a system prompt string from state + current context."""
+def _current_turn_index(state: dict) -> int:
+    """1-based index of the customer turn (number of human messages so far)."""
+    humans = sum(1 for m in state.get("messages", []) if hasattr(m, "type") and m.type == "human")
+    return max(1, humans)
+
+
+def _build_system_message(builder_fn, state: dict, **extra) -> list[dict]:
+    """Build the system prompt content blocks from state + current context."""
     ctx = get_current_context()
+    handoff = format_handoff_context(
+        state.get("handoff_note"),
+        turn_findings(state.get("tool_calls_log") or [], _current_turn_index(state)),
+    )
+    context_parts = (
+        format_customer_context(state.get("order_details"), state.get("subscription_status")),
+        handoff,
+    )
+    customer_context = "\n".join(part for part in context_parts if part) or None
     return builder_fn(
         first_name=state.get("customer_first_name", "there"),
         last_name=state.get("customer_last_name", ""),
@@ -54,29 +98,162 @@ def _build_system_message(builder_fn, state: dict) -> str:
         current_date=ctx["current_date"],
         day_of_week=ctx["day_of_week"],
         wait_promise=ctx["wait_promise"],
+        customer_context=customer_context,
+        **extra,
     )
 
 
+# ─── Precompiled agents ─────────────────────────────────────────────────────
+# Tool schemas, tool maps and the tool-bound model are built once per agent
+# (at graph compile time) instead of on every turn.
+
+class CompiledAgent:
+    """Tool-bound model + tool map + serialized tool schemas for one agent."""
+
+    def __init__(self, name: str, llm, tools: list) -> None:
+        self.name = name
+        self.llm = llm
+        self.tools = list(tools)
+        self.tool_map = {t.name: t for t in self.tools}
+        self.tool_schemas = [_tool_schema(t) for t in self.tools]
+        self.bound_llm = llm.bind_tools(self.tool_schemas) if llm is not None else None
+
+
+_AGENT_TOOLS = {
+    "wismo_agent": wismo_tools,
+    "issue_agent": issue_tools,
+    "account_agent": account_tools,
+}
+
+_compiled_agents: dict[str, CompiledAgent] = {}
+_compiled_haiku_agents: dict[str, CompiledAgent] = {}
+
+
+def compile_agents(llm=None, haiku=None) -> dict[str, CompiledAgent]:
+    """(Re)build every agent's CompiledAgent (Sonnet + Haiku tiers); called from compile_graph()."""
+    llm = llm or sonnet_llm
+    haiku = haiku or haiku_llm
+    _compiled_agents.clear()
+    _compiled_haiku_agents.clear()
+    for name, tools in _AGENT_TOOLS.items():
+        _compiled_agents[name] = CompiledAgent(name, llm, tools)
+        if haiku is not None:
+            _compiled_haiku_agents[name] = CompiledAgent(name, haiku, tools)
+    return dict(_compiled_agents)
+
+
+def get_compiled_agent(name: str, tier: str = "sonnet") -> CompiledAgent:
+    """CompiledAgent for `name` on the given model tier, compiling all agents on first use."""
+    if name not in _compiled_agents:
+        compile_agents()
+    if tier == "haiku" and name in _compiled_haiku_agents:
+        return _compiled_haiku_agents[name]
+    return _compiled_agents[name]
+
+
 # ─── Thin wrappers that invoke the LLM with tools in a ReAct loop ───────────
 # We use the model.bind_tools + manual loop approach for full control.
 
-from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage, message_chunk_to_message
 import json
 
 
+_FALLBACK_RESPONSE = "I apologize, but I need a moment. Let me look into this further.\n\nCaz"
+
+# Sent before the last model call of a run whose ReactBudget is nearly spent.
+_FINALIZE_INSTRUCTION = (
+    "[INTERNAL] The budget for this turn is nearly used up. Do not call any more tools. "
+    "Write your final reply to the customer now, using only what you already know. "
+    "If something is still open, tell the customer what happens next instead of guessing. "
+    "HANDOFF / ESCALATE commands are still allowed."
+)
+
+
+def _tool_call_batches(tool_calls: list[dict]) -> list[list[dict]]:
+    """Split one AIMessage's tool calls into runs of read-only lookups and single other calls."""
+    batches: list[list[dict]] = []
+    for tc in tool_calls:
+        read_only = PARALLEL_TOOL_CALLS_ENABLED and tc["name"] in READ_ONLY_TOOLS
+        if read_only and batches and batches[-1][0]["name"] in READ_ONLY_TOOLS:
+            batches[-1].append(tc)
+        else:
+            batches.append([tc])
+    return batches
+
+
+async def _execute_tool(tool_map: dict, tool_name: str, is_allowed: bool, reason: str, args):
+    """Result of one tool call (or the guardrail / unknown-tool error in the same shape)."""
+    if not is_allowed:
+        return {"success": False, "error": f"Guardrail: {reason}"}
+    if tool_name not in tool_map:
+        return {"success": False, "error": f"Unknown tool: {tool_name}"}
+    try:
+        return await tool_map[tool_name].ainvoke(args)
+    except Exception as exc:
+        return {"success": False, "error": str(exc)}
+
+
+async def _stream_iteration(llm_with_tools, conversation: list, channel: TokenChannel) -> AIMessage:
+    """Stream one ReAct iteration, forwarding customer-facing text until tool calls appear."""
+    aggregate = None
+    text_filter = CustomerTextFilter()
+    forwarded = False
+    calling_tools = False
+    async for chunk in llm_with_tools.astream(conversation):
+        aggregate = chunk if aggregate is None else aggregate + chunk
+        if calling_tools:
+            continue
+        if getattr(chunk, "tool_call_chunks", None):
+            calling_tools = True
+            if forwarded:
+                channel.reset()
+            continue
+        delta = text_filter.feed(chunk_text(chunk))
+        if delta:
+            channel.token(delta)
+            forwarded = True
+
+    response = message_chunk_to_message(aggregate) if aggregate is not None else AIMessage(content="")
+    if calling_tools or response.tool_calls:
+        if forwarded and not calling_tools:
+            channel.reset()
+        return response
+
+    tail = text_filter.flush()
+    if tail:
+        channel.token(tail)
+        forwarded = True
+    if text_filter.control_seen and forwarded:
+        channel.reset()
+    return response
+
+
 async def _run_react_agent(
     llm,
     tools: list,
-    system_prompt: str,
+    system_prompt: str | list[dict],
     state: dict,
-    max_iterations: int = 6,
+    max_iterations: int | None = None,
+    *,
+    compiled: CompiledAgent | None = None,
+    budget: ReactBudget | None = None,
 ) -> dict:
     """
     Manual ReAct loop: system prompt → LLM (with tools bound) → tool calls → observe → repeat.
     Returns dict with messages, tool_calls_log, actions_taken, agent_reasoning.
+    When `compiled` is given its prebuilt tool map and bound model are reused.
+    The loop runs until the model answers or `budget` (default: the turn intent's
+    ReactBudget, capped at `max_iterations`) is spent; the last call is a forced
+    "finalize now" with tool_choice "none", so the model cannot call tools.
     """
-    tool_map = {t.name: t for t in tools}
-    llm_with_tools = llm.bind_tools(tools)
+    if budget is None:
+        budget = ReactBudget.for_intent(state.get("ticket_category"), max_iterations)
+    if compiled is not None:
+        tool_map = compiled.tool_map
+        llm_with_tools = compiled.bound_llm
+    else:
+        tool_map = {t.name: t for t in tools}
+        llm_with_tools = llm.bind_tools(tools)
 
     # Build conversation: system + all messages
     conversation = [SystemMessage(content=system_prompt)]
@@ -88,11 +265,9 @@ async def _run_react_agent(
     reasoning = []
     running_state = dict(state or {})
     running_state["tool_calls_log"] = tool_calls_log
-    current_turn_index = sum(
-        1 for m in state.get("messages", [])
-        if hasattr(m, "type") and m.type == "human"
-    )
-    running_state["current_turn_index"] = max(1, current_turn_index)
+    running_state["current_turn_index"] = _current_turn_index(state)
+    # Read-only lookups already made this turn (e.g. by the agent that handed off).
+    memo = TurnToolMemo(tool_calls_log, running_state["current_turn_index"])
 
     state_updates = {
         "current_order_id": state.get("current_order_id"),
@@ -103,7 +278,17 @@ async def _run_react_agent(
         "discount_code_created_count": int(state.get("discount_code_created_count", 0) or 0),
     }
 
+    compaction = {"tokens_saved": 0}
+    # A successful state-changing call makes the prefetched orders/subscriptions stale.
+    customer_state = {"changed": False}
+    finalize = None
+    stopped = None
+
     def _build_output(content: str) -> dict:
+        if compaction["tokens_saved"]:
+            reasoning.append(f"Tool result compaction: ~{compaction['tokens_saved']} tokens saved this turn")
+        reasoning.append(f"ReAct budget: {budget.summary()}")
+        react_budget_stats.record(finalize, stopped)
         output = {
             "messages": [AIMessage(content=_strip_internal_markers(content))],
             "tool_calls_log": tool_calls_log,
@@ -115,160 +300,299 @@ async def _run_react_agent(
         for key in ("current_order_id", "current_order_number", "current_subscription_id", "order_total"):
             if state_updates.get(key) is not None:
                 output[key] = state_updates[key]
+        if customer_state["changed"]:
+            output["order_details"] = None
+            output["subscription_status"] = None
         return output
 
-    for iteration in range(max_iterations):
-        response = await llm_with_tools.ainvoke(conversation)
+    def _record_tool_result(tc: dict, corrected_args, tool_result, reused: bool = False) -> None:
+        """Log one executed (or memo-served) call, pull live IDs into state, append its ToolMessage."""
+        tool_name = tc["name"]
+        # Log (use corrected_args for accurate logging)
+        log_entry = {
+            "tool_name": tool_name,
+            "params": corrected_args,
+            "result": tool_result if isinstance(tool_result, dict) else str(tool_result),
+            "turn_index": running_state["current_turn_index"],
+        }
+        if reused:
+            log_entry["reused"] = True
+        tool_calls_log.append(log_entry)
+        memo.record(log_entry)
+        if (
+            tool_name not in READ_ONLY_TOOLS
+            and isinstance(tool_result, dict)
+            and tool_result.get("success")
+        ):
+            customer_state["changed"] = True
+        running_state["tool_calls_log"] = tool_calls_log
+
+        # Keep key IDs live for downstream escalation payloads.
+        order_id_arg = corrected_args.get("orderId") if isinstance(corrected_args, dict) else None
+        if isinstance(order_id_arg, str):
+            if order_id_arg.startswith("gid://shopify/Order/"):
+                state_updates["current_order_id"] = order_id_arg
+            elif order_id_arg.startswith("#"):
+                state_updates["current_order_number"] = order_id_arg
+
+        if (
+            tool_name == "shopify_get_order_details"
+            and isinstance(tool_result, dict)
+            and tool_result.get("success")
+        ):
+            data = tool_result.get("data", {})
+            if isinstance(data, dict):
+                order_gid = data.get("id")
+                order_name = data.get("name")
+                if isinstance(order_gid, str) and order_gid.startswith("gid://shopify/Order/"):
+                    state_updates["current_order_id"] = order_gid
+                if isinstance(order_name, str) and order_name.startswith("#"):
+                    state_updates["current_order_number"] = order_name
+                total_price = data.get("totalPrice")
+                if total_price is not None:
+                    try:
+                        state_updates["order_total"] = float(total_price)
+                    except (TypeError, ValueError):
+                        pass
+
+        subscription_arg = corrected_args.get("subscriptionId") if isinstance(corrected_args, dict) else None
+        if isinstance(subscription_arg, str) and subscription_arg:
+            state_updates["current_subscription_id"] = subscription_arg
+
+        if (
+            tool_name == "skio_get_subscriptions"
+            and isinstance(tool_result, dict)
+            and tool_result.get("success")
+        ):
+            data = tool_result.get("data", {})
+            if isinstance(data, dict):
+                subscription_id = data.get("subscriptionId")
+                if isinstance(subscription_id, str) and subscription_id:
+                    state_updates["current_subscription_id"] = subscription_id
+
+        if (
+            tool_name == "shopify_create_discount_code"
+            and isinstance(tool_result, dict)
+            and tool_result.get("success")
+        ):
+            state_updates["discount_code_created"] = True
+            state_updates["discount_code_created_count"] = int(
+                state_updates.get("discount_code_created_count", 0) or 0
+            ) + 1
+
+        running_state["discount_code_created"] = state_updates["discount_code_created"]
+        running_state["discount_code_created_count"] = state_updates["discount_code_created_count"]
+
+        # Track actions
+        destructive = {"shopify_cancel_order", "shopify_refund_order",
+                       "shopify_create_store_credit", "shopify_create_discount_code",
+                       "shopify_update_order_shipping_address", "shopify_create_return",
+                       "skio_cancel_subscription", "skio_pause_subscription",
+                       "skio_skip_next_order_subscription", "skio_unpause_subscription"}
+        if tool_name in destructive:
+            result_status = "success" if (isinstance(tool_result, dict) and tool_result.get("success")) else "failed"
+            actions_taken.append(f"{tool_name}: {result_status}")
+
+        # Add tool message to conversation (compacted; the log keeps the full result)
+        result_str, saved = tool_message_content(tool_name, tool_result)
+        compaction["tokens_saved"] += saved
+        conversation.append(
+            ToolMessage(content=result_str, tool_call_id=tc["id"])
+        )
+
+    async def _call_model(model, iteration: int) -> AIMessage | None:
+        """One model call on the conversation (None when it missed its deadline)."""
+        channel = current_channel()
+        try:
+            with model_call_step(f"react_iteration_{iteration}"):
+                if channel is not None and hasattr(model, "astream"):
+                    response = await _stream_iteration(model, conversation, channel)
+                else:
+                    response = await model.ainvoke(conversation)
+        except LLMDeadlineExceeded as exc:
+            reasoning.append(f"ReAct iteration {iteration}: {exc}")
+            if channel is not None:
+                channel.reset()
+            return None
+        budget.charge_model_call(response)
         conversation.append(response)
-
-        # If no tool calls → we have the final answer
-        if not response.tool_calls:
-            reasoning.append(
-                f"ReAct iteration {iteration + 1}: Final response generated"
-            )
-            return _build_output(response.content)
-
-        # Process tool calls
-        for tc in response.tool_calls:
-            tool_name = tc["name"]
-            tool_args = tc["args"]
+        usage_line = format_cache_usage(response)
+        if usage_line:
+            reasoning.append(f"ReAct iteration {iteration}: {usage_line}")
+        return response
+
+    final_llm = []
+
+    def _final_model():
+        """The model with tool_choice "none": tools stay declared (so the tool_use /
+        tool_result history remains valid) but the model cannot call them."""
+        if not final_llm:
+            unbound = compiled.llm if compiled is not None else llm
+            schemas = compiled.tool_schemas if compiled is not None else tools
+            final_llm.append(unbound.bind_tools(schemas, tool_choice={"type": "none"}))
+        return final_llm[0]
+
+    def _text(response: AIMessage) -> str:
+        return response.content if isinstance(response.content, str) else chunk_text(response)
+
+    iteration = 0
+    while True:
+        stopped = budget.exhausted()
+        if stopped:
+            reasoning.append(f"ReAct budget exhausted ({stopped}) — one final call without tools")
+            break
+        finalize = budget.nearly_spent()
+        if finalize:
+            reasoning.append(f"ReAct budget nearly spent ({finalize}) — asking for the final answer now")
+            conversation.append(HumanMessage(content=_FINALIZE_INSTRUCTION))
+
+        iteration += 1
+        response = await _call_model(_final_model() if finalize else llm_with_tools, iteration)
+        if response is None:
+            return _build_output(_FALLBACK_RESPONSE)
+
+        # If no tool calls (or the budget is spent) → we have the final answer
+        if not response.tool_calls or finalize:
+            if response.tool_calls:
+                reasoning.append(
+                    f"ReAct iteration {iteration}: Ignored {len(response.tool_calls)} tool call(s) after finalize"
+                )
             reasoning.append(
-                f"ReAct iteration {iteration + 1}: Calling {tool_name}({json.dumps(tool_args, default=str)[:200]})"
-            )
-
-            # ── Tool Call Guardrails: validate & correct before execution ──
-            is_allowed, reason, corrected_args = tool_call_guardrails(
-                tool_name, tool_args, running_state
+                f"ReAct iteration {iteration}: Final response generated"
             )
-
-            if not is_allowed:
+            content = _text(response)
+            return _build_output(content if content.strip() else _FALLBACK_RESPONSE)
+
+        # Process tool calls: consecutive read-only lookups run concurrently,
+        # everything else one at a time in the model's order.
+        for batch in _tool_call_batches(response.tool_calls):
+            prepared = []
+            pending_log = []
+            for tc in batch:
                 reasoning.append(
-                    f"ReAct iteration {iteration + 1}: BLOCKED by guardrail — {reason}"
+                    f"ReAct iteration {iteration}: Calling {tc['name']}({json.dumps(tc['args'], default=str)[:200]})"
+                )
+                # ── Tool Call Guardrails: validate & correct before execution ──
+                # Earlier calls of the same batch count for duplicate detection.
+                guard_state = (
+                    {**running_state, "tool_calls_log": tool_calls_log + pending_log}
+                    if pending_log else running_state
+                )
+                is_allowed, reason, corrected_args = tool_call_guardrails(tc["name"], tc["args"], guard_state)
+                # A repeated read-only lookup (possibly blocked as a duplicate) is
+                # answered with this turn's earlier result instead of an error.
+                cached = memo.get(tc["name"], corrected_args)
+                if cached is None and not budget.allows_tool_call():
+                    is_allowed, reason = False, "ReAct budget: tool call limit reached"
+                if cached is not None:
+                    tool_memo_stats.record_hit(tc["name"])
+                    reasoning.append(
+                        f"ReAct iteration {iteration}: Reused {tc['name']} result from earlier this turn"
+                    )
+                elif is_allowed:
+                    budget.charge_tool_call()
+                    pending_log.append({
+                        "tool_name": tc["name"],
+                        "params": corrected_args,
+                        "turn_index": running_state["current_turn_index"],
+                    })
+                else:
+                    reasoning.append(
+                        f"ReAct iteration {iteration}: BLOCKED by guardrail — {reason}"
+                    )
+                prepared.append((tc, is_allowed, reason, corrected_args, cached))
+
+            results = await asyncio.gather(*(
+                asyncio.sleep(0, result=cached) if cached is not None
+                else _execute_tool(tool_map, tc["name"], is_allowed, reason, corrected_args)
+                for tc, is_allowed, reason, corrected_args, cached in prepared
+            ))
+            if len(pending_log) > 1:
+                reasoning.append(
+                    f"ReAct iteration {iteration}: Ran {len(pending_log)} read-only tools concurrently"
                 )
-                tool_result = {"success": False, "error": f"Guardrail: {reason}"}
-            elif tool_name in tool_map:
-                try:
-                    tool_result = await tool_map[tool_name].ainvoke(corrected_args)
-                except Exception as exc:
-                    tool_result = {"success": False, "error": str(exc)}
-            else:
-                tool_result = {"success": False, "error": f"Unknown tool: {tool_name}"}
-
-            # Log (use corrected_args for accurate logging)
-            log_entry = {
-                "tool_name": tool_name,
-                "params": corrected_args,
-                "result": tool_result if isinstance(tool_result, dict) else str(tool_result),
-                "turn_index": running_state["current_turn_index"],
-            }
-            tool_calls_log.append(log_entry)
-            running_state["tool_calls_log"] = tool_calls_log
-
-            # Keep key IDs live for downstream escalation payloads.
-            order_id_arg = corrected_args.get("orderId") if isinstance(corrected_args, dict) else None
-            if isinstance(order_id_arg, str):
-                if order_id_arg.startswith("gid://shopify/Order/"):
-                    state_updates["current_order_id"] = order_id_arg
-                elif order_id_arg.startswith("#"):
-                    state_updates["current_order_number"] = order_id_arg
-
-            if (
-                tool_name == "shopify_get_order_details"
-                and isinstance(tool_result, dict)
-                and tool_result.get("success")
-            ):
-                data = tool_result.get("data", {})
-                if isinstance(data, dict):
-                    order_gid = data.get("id")
-                    order_name = data.get("name")
-                    if isinstance(order_gid, str) and order_gid.startswith("gid://shopify/Order/"):
-                        state_updates["current_order_id"] = order_gid
-                    if isinstance(order_name, str) and order_name.startswith("#"):
-                        state_updates["current_order_number"] = order_name
-                    total_price = data.get("totalPrice")
-                    if total_price is not None:
-                        try:
-                            state_updates["order_total"] = float(total_price)
-                        except (TypeError, ValueError):
-                            pass
-
-            subscription_arg = corrected_args.get("subscriptionId") if isinstance(corrected_args, dict) else None
-            if isinstance(subscription_arg, str) and subscription_arg:
-                state_updates["current_subscription_id"] = subscription_arg
-
-            if (
-                tool_name == "skio_get_subscriptions"
-                and isinstance(tool_result, dict)
-                and tool_result.get("success")
-            ):
-                data = tool_result.get("data", {})
-                if isinstance(data, dict):
-                    subscription_id = data.get("subscriptionId")
-                    if isinstance(subscription_id, str) and subscription_id:
-                        state_updates["current_subscription_id"] = subscription_id
-
-            if (
-                tool_name == "shopify_create_discount_code"
-                and isinstance(tool_result, dict)
-                and tool_result.get("success")
-            ):
-                state_updates["discount_code_created"] = True
-                state_updates["discount_code_created_count"] = int(
-                    state_updates.get("discount_code_created_count", 0) or 0
-                ) + 1
-
-            running_state["discount_code_created"] = state_updates["discount_code_created"]
-            running_state["discount_code_created_count"] = state_updates["discount_code_created_count"]
-
-            # Track actions
-            destructive = {"shopify_cancel_order", "shopify_refund_order",
-                           "shopify_create_store_credit", "shopify_create_discount_code",
-                           "shopify_update_order_shipping_address", "shopify_create_return",
-                           "skio_cancel_subscription", "skio_pause_subscription",
-                           "skio_skip_next_order_subscription", "skio_unpause_subscription"}
-            if tool_name in destructive:
-                result_status = "success" if (isinstance(tool_result, dict) and tool_result.get("success")) else "failed"
-                actions_taken.append(f"{tool_name}: {result_status}")
-
-            # Add tool message to conversation
-            result_str = json.dumps(tool_result, default=str) if isinstance(tool_result, dict) else str(tool_result)
-            conversation.append(
-                ToolMessage(content=result_str, tool_call_id=tc["id"])
-            )
 
-    # Max iterations reached — return last response
-    last_ai = None
-    for m in reversed(conversation):
-        if isinstance(m, AIMessage) and m.content:
-            last_ai = m
-            break
+            for (tc, _, _, corrected_args, cached), tool_result in zip(prepared, results):
+                _record_tool_result(tc, corrected_args, tool_result, reused=cached is not None)
 
-    content = last_ai.content if last_ai else "I apologize, but I need a moment. Let me look into this further.\n\nCaz"
-    return _build_output(content)
+    # Time or tokens ran out before a final answer (often right after a tool-calling
+    # turn, whose text is only a preamble): one last call in which no tool can be called.
+    conversation.append(HumanMessage(content=_FINALIZE_INSTRUCTION))
+    response = await _call_model(_final_model(), iteration + 1)
+    if response is None:
+        return _build_output(_FALLBACK_RESPONSE)
+    if response.tool_calls:
+        reasoning.append(
+            f"ReAct iteration {iteration + 1}: Ignored {len(response.tool_calls)} tool call(s) after finalize"
+        )
+    reasoning.append(f"ReAct iteration {iteration + 1}: Final response generated")
+    content = _text(response)
+    return _build_output(content if content.strip() else _FALLBACK_RESPONSE)
 
 
 # ─── Public Agent Node Functions ─────────────────────────────────────────────
 
+# Keys a Sonnet rerun inherits from the discarded Haiku attempt (tools already ran).
+_RERUN_CARRY = (
+    "tool_calls_log", "actions_taken", "current_order_id", "current_order_number",
+    "current_subscription_id", "order_total", "discount_code_created", "discount_code_created_count",
+)
+
+
+# Agents whose prompt builders take an intent (compact per-intent prompt variants).
+_PROMPT_VARIANT_AGENTS = {"account_agent", "issue_agent"}
+
+
+async def _run_routed_agent(name: str, prompt_builder, state: dict) -> dict:
+    """Run one agent turn on the tier model_router picks; redo failed Haiku drafts on Sonnet."""
+    extra = {}
+    if PROMPT_VARIANTS_ENABLED and name in _PROMPT_VARIANT_AGENTS:
+        extra["intent"] = state.get("ticket_category")
+    prompt = _build_system_message(prompt_builder, state, **extra)
+    choice = choose_agent_model(name, state)
+    agent = get_compiled_agent(name, choice.tier)
+    tier = choice.tier
+    model_router_stats.record(name, tier)
+    reasoning = [f"MODEL ROUTER: {tier} — {'; '.join(choice.reasons)}"]
+
+    result = await _run_react_agent(agent.llm, agent.tools, prompt, state, compiled=agent)
+
+    if tier == "haiku":
+        problem = haiku_draft_problem(state, result)
+        new_actions = len(result.get("actions_taken") or []) > len(state.get("actions_taken") or [])
+        if problem and not new_actions:
+            model_router_stats.record_upgrade(name)
+            reasoning.extend(result["agent_reasoning"])
+            reasoning.append(f"MODEL ROUTER: Haiku draft rejected ({problem}), rerunning on sonnet")
+            # The rejected draft may already have been streamed; retract it.
+            if (channel := current_channel()) is not None:
+                channel.reset()
+            rerun_state = {**state, **{k: result[k] for k in _RERUN_CARRY if k in result}}
+            sonnet_agent = get_compiled_agent(name, "sonnet")
+            result = await _run_react_agent(
+                sonnet_agent.llm, sonnet_agent.tools, prompt, rerun_state, compiled=sonnet_agent
+            )
+            tier = "sonnet"
+
+    result["agent_reasoning"] = reasoning + result["agent_reasoning"]
+    result["current_agent"] = name
+    result["agent_model"] = tier
+    return result
+
+
+@track_model_calls("wismo_agent")
 async def wismo_agent_node(state: dict) -> dict:
     """WISMO Agent — shipping delay specialist."""
-    prompt = _build_system_message(build_wismo_prompt, state)
-    result = await _run_react_agent(sonnet_llm, wismo_tools, prompt, state)
-    result["current_agent"] = "wismo_agent"
-    return result
+    return await _run_routed_agent("wismo_agent", build_wismo_prompt, state)
 
 
+@track_model_calls("issue_agent")
 async def issue_agent_node(state: dict) -> dict:
     """Issue Agent — wrong/missing items, product issues, refunds."""
-    prompt = _build_system_message(build_issue_prompt, state)
-    result = await _run_react_agent(sonnet_llm, issue_tools, prompt, state)
-    result["current_agent"] = "issue_agent"
-    return result
+    return await _run_routed_agent("issue_agent", build_issue_prompt, state)
 
 
+@track_model_calls("account_agent")
 async def account_agent_node(state: dict) -> dict:
     """Account Agent — cancellations, address, subscriptions, discounts, positive."""
-    prompt = _build_system_message(build_account_prompt, state)
-    result = await _run_react_agent(sonnet_llm, account_tools, prompt, state)
-    result["current_agent"] = "account_agent"
-
-    return result
+    return await _run_routed_agent("account_agent", build_account_prompt, state)
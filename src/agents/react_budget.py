@@ -0,0 +1,140 @@
+"""
+Per-run budget for the ReAct loop.
+
+A fixed iteration cap let a looping agent spend six Sonnet calls and half a
+minute before giving up with whatever text it last produced. ReactBudget
+bounds one agent run by iterations, wall-clock time, tokens (input + output,
+cached included) and tool calls, with tighter defaults for simple intents:
+
+- nearly_spent(): the last iteration, FINALIZE_AT of the deadline or tokens,
+  or no tool calls left — _run_react_agent tells the model to answer now, in a
+  call where it cannot call tools (the iteration cap applies even when disabled)
+- exhausted(): deadline or token limit reached — the loop stops and makes one
+  final call in which the model cannot call tools
+
+summary() goes into agent_reasoning (and so the session trace) when the run ends.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from src.config import (
+    REACT_BUDGET_DEADLINE_S,
+    REACT_BUDGET_ENABLED,
+    REACT_BUDGET_MAX_TOKENS,
+    REACT_BUDGET_MAX_TOOL_CALLS,
+)
+
+# Share of the deadline / token limit after which the next call must be the final answer.
+FINALIZE_AT = 0.8
+
+DEFAULT_MAX_ITERATIONS = 6
+
+# intent -> (max_iterations, deadline_s, max_tokens, max_tool_calls); others use the config defaults.
+INTENT_BUDGETS: dict[str, tuple[int, float, int, int]] = {
+    "WISMO": (4, 20.0, 40_000, 4),
+    "POSITIVE": (3, 15.0, 30_000, 2),
+    "GENERAL": (4, 20.0, 40_000, 4),
+}
+
+
+@dataclass
+class ReactBudget:
+    max_iterations: int
+    deadline_s: float
+    max_tokens: int
+    max_tool_calls: int
+    enabled: bool = True
+    started: float = field(default_factory=time.monotonic)
+    iterations: int = 0
+    tokens: int = 0
+    tool_calls: int = 0
+
+    @classmethod
+    def for_intent(cls, intent: Optional[str], max_iterations: Optional[int] = None) -> "ReactBudget":
+        """Defaults for the turn's intent; an explicit max_iterations caps the intent default."""
+        defaults = INTENT_BUDGETS.get((intent or "").upper(), (
+            DEFAULT_MAX_ITERATIONS, REACT_BUDGET_DEADLINE_S, REACT_BUDGET_MAX_TOKENS, REACT_BUDGET_MAX_TOOL_CALLS,
+        ))
+        iterations, deadline_s, max_tokens, max_tool_calls = defaults
+        if max_iterations is not None:
+            iterations = min(iterations, max_iterations) if REACT_BUDGET_ENABLED else max_iterations
+        return cls(iterations, deadline_s, max_tokens, max_tool_calls, enabled=REACT_BUDGET_ENABLED)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def charge_model_call(self, response: Any) -> None:
+        usage = getattr(response, "usage_metadata", None) or {}
+        self.iterations += 1
+        self.tokens += int(usage.get("input_tokens") or 0) + int(usage.get("output_tokens") or 0)
+
+    def allows_tool_call(self) -> bool:
+        return not self.enabled or self.tool_calls < self.max_tool_calls
+
+    def charge_tool_call(self) -> None:
+        self.tool_calls += 1
+
+    def exhausted(self) -> Optional[str]:
+        """Why no further model call may be made (None while there is budget left)."""
+        if self.iterations >= self.max_iterations:
+            return "iterations"
+        if not self.enabled:
+            return None
+        if self.elapsed() >= self.deadline_s:
+            return "deadline"
+        if self.tokens >= self.max_tokens:
+            return "tokens"
+        return None
+
+    def nearly_spent(self) -> Optional[str]:
+        """Why the next model call has to be the final answer (None otherwise)."""
+        if self.iterations >= self.max_iterations - 1:
+            return "iterations"
+        if not self.enabled:
+            return None
+        if self.elapsed() >= FINALIZE_AT * self.deadline_s:
+            return "deadline"
+        if self.tokens >= FINALIZE_AT * self.max_tokens:
+            return "tokens"
+        if self.tool_calls >= self.max_tool_calls:
+            return "tool_calls"
+        return None
+
+    def summary(self) -> str:
+        return (
+            f"{self.iterations}/{self.max_iterations} iterations, "
+            f"{self.tool_calls}/{self.max_tool_calls} tool calls, "
+            f"{self.tokens}/{self.max_tokens} tokens, "
+            f"{self.elapsed():.1f}/{self.deadline_s:.1f}s"
+        )
+
+
+class ReactBudgetStats:
+    """Agent runs, and runs finalized early / stopped, per budget reason."""
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.finalized: dict[str, int] = {}
+        self.stopped: dict[str, int] = {}
+
+    def record(self, finalized: Optional[str], stopped: Optional[str]) -> None:
+        self.runs += 1
+        if finalized:
+            self.finalized[finalized] = self.finalized.get(finalized, 0) + 1
+        if stopped:
+            self.stopped[stopped] = self.stopped.get(stopped, 0) + 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": REACT_BUDGET_ENABLED,
+            "runs": self.runs,
+            "finalized": dict(self.finalized),
+            "stopped": dict(self.stopped),
+        }
+
+
+react_budget_stats = ReactBudgetStats()
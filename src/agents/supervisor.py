@@ -7,14 +7,18 @@ Note: Handoff routing logic is in src.patterns.handoff
 
 from __future__ import annotations
 
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
 from src.config import get_current_context, sonnet_llm
+from src.llm.accounting import track_model_calls
+from src.llm.hedging import LLMDeadlineExceeded
+from src.llm.usage import format_cache_usage
 from src.prompts.supervisor_prompt import build_supervisor_prompt
 
 
 # ─── Supervisor Agent ────────────────────────────────────────────────────────
 
+@track_model_calls("supervisor")
 async def supervisor_node(state: dict) -> dict:
     """Supervisor agent for low-confidence routing or complex queries."""
     ctx = get_current_context()
@@ -34,10 +38,16 @@ async def supervisor_node(state: dict) -> dict:
             customer_msg = m.content
             break
 
-    full_prompt = f"{prompt}\n\nCustomer message: {customer_msg}"
-
-    result = await sonnet_llm.ainvoke(full_prompt)
-    response_text = result.content.strip()
+    try:
+        result = await sonnet_llm.ainvoke([
+            SystemMessage(content=prompt),
+            HumanMessage(content=f"Customer message: {customer_msg}"),
+        ])
+        response_text = result.content.strip()
+    except LLMDeadlineExceeded:
+        # Falls through to the default respond_direct greeting below.
+        result = None
+        response_text = "REASON: deadline exceeded"
 
     # Parse the supervisor response
     lines = response_text.split("\n")
@@ -69,6 +79,9 @@ async def supervisor_node(state: dict) -> dict:
         "supervisor_route_decision": route_to,
         "agent_reasoning": [f"SUPERVISOR: Routing to {route_to} — {reason}"],
     }
+    usage_line = format_cache_usage(result)
+    if usage_line:
+        output["agent_reasoning"].append(f"SUPERVISOR: {usage_line}")
 
     # If responding directly, add the message
     if route_to == "respond_direct" and direct_response:
@@ -0,0 +1,94 @@
+"""
+Turn-scoped memo of read-only tool results.
+
+After a HANDOFF the target agent starts a fresh ReAct loop and usually repeats
+the lookups the first agent already made this turn (order details, customer
+orders). TurnToolMemo is seeded from the turn's tool_calls_log entries, so
+_run_react_agent answers a repeated read-only call from the memo instead of
+the API, and turn_findings() gives the target agent those results up front
+(SESSION CONTEXT) so it doesn't need an iteration to ask for them.
+
+A successful state-changing call clears the memo: lookups made before a
+cancel/refund/address change no longer describe the order.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+from src.tools.compaction import compact_tool_result
+from src.tools.tool_groups import READ_ONLY_TOOLS
+
+_FINDING_CHARS = 600
+
+
+def _succeeded(entry: dict) -> bool:
+    result = entry.get("result")
+    return isinstance(result, dict) and bool(result.get("success"))
+
+
+class TurnToolMemo:
+    """Successful read-only lookups of one turn, keyed by tool name + (corrected) params."""
+
+    def __init__(self, tool_calls_log: list[dict], turn_index: int) -> None:
+        self._entries: dict[tuple[str, str], dict] = {}
+        for entry in tool_calls_log or []:
+            if isinstance(entry, dict) and entry.get("turn_index") == turn_index:
+                self.record(entry)
+
+    @staticmethod
+    def key(tool_name: str, params) -> tuple[str, str]:
+        return tool_name, json.dumps(params, sort_keys=True, default=str)
+
+    def get(self, tool_name: str, params) -> Optional[dict]:
+        if tool_name not in READ_ONLY_TOOLS:
+            return None
+        entry = self._entries.get(self.key(tool_name, params))
+        return entry["result"] if entry is not None else None
+
+    def entries(self) -> list[dict]:
+        """Log entries currently served by the memo (latest per tool + params)."""
+        return list(self._entries.values())
+
+    def record(self, entry: dict) -> None:
+        tool_name = entry.get("tool_name")
+        if not _succeeded(entry):
+            return
+        if tool_name in READ_ONLY_TOOLS:
+            self._entries[self.key(tool_name, entry.get("params"))] = entry
+        else:
+            self._entries.clear()
+
+
+def turn_findings(tool_calls_log: list[dict], turn_index: int) -> list[str]:
+    """
+    This turn's lookups as SESSION CONTEXT lines for a handoff target (compacted;
+    prefetched lookups are already shown as ORDERS / SUBSCRIPTIONS).
+    """
+    lines = []
+    for entry in TurnToolMemo(tool_calls_log, turn_index).entries():
+        if entry.get("prefetched"):
+            continue
+        data = json.dumps(compact_tool_result(entry["tool_name"], entry["result"]).get("data"), default=str)
+        if len(data) > _FINDING_CHARS:
+            data = data[:_FINDING_CHARS] + "…"
+        params = json.dumps(entry.get("params"), default=str)
+        lines.append(f"  • {entry['tool_name']}({params}) → {data}")
+    return lines
+
+
+class ToolMemoStats:
+    """Read-only tool calls answered from the turn memo instead of the API."""
+
+    def __init__(self) -> None:
+        self.hits: dict[str, int] = {}
+
+    def record_hit(self, tool_name: str) -> None:
+        self.hits[tool_name] = self.hits.get(tool_name, 0) + 1
+
+    def stats(self) -> dict:
+        return {"hits": dict(self.hits), "hits_total": sum(self.hits.values())}
+
+
+tool_memo_stats = ToolMemoStats()
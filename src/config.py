@@ -9,10 +9,15 @@ from __future__ import annotations
 
 import importlib
 import os
+import random
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from typing import Any
 
+from src.llm.cassette import CassetteChatModel, CassetteStore
+from src.llm.hedging import HedgedChatModel
+from src.llm.limiter import ModelLimiter, RateLimitedChatModel
+
 
 # ── Optional dotenv ───────────────────────────────────────────────────────────
 def _load_dotenv_if_available() -> None:
@@ -30,14 +35,105 @@ _load_dotenv_if_available()
 ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")
 API_URL: str = os.getenv("API_URL", "https://lookfor-backend.ngrok.app/v1/api")
 APP_TIMEZONE: str = os.getenv("APP_TIMEZONE", "UTC")
+FUSED_PRE_ROUTING: bool = os.getenv("FUSED_PRE_ROUTING", "false").lower() == "true"
+
+# "anthropic" (default) or "fake": offline scripted stand-in, see src/llm/fake.py
+LLM_BACKEND: str = os.getenv("LLM_BACKEND", "anthropic").lower()
+LLM_FAKE_SCRIPT: str = os.getenv("LLM_FAKE_SCRIPT", "")
+LLM_FAKE_SEED: int = int(os.getenv("LLM_FAKE_SEED", "0"))
+LLM_FAKE_SONNET_LATENCY: str = os.getenv("LLM_FAKE_SONNET_LATENCY", "lognormal:1500:0.4")
+LLM_FAKE_HAIKU_LATENCY: str = os.getenv("LLM_FAKE_HAIKU_LATENCY", "lognormal:400:0.3")
+
+# Record/replay LLM calls ("off", "record", "replay", "auto"), see src/llm/cassette.py
+LLM_CASSETTE_MODE: str = os.getenv("LLM_CASSETTE_MODE", "off").lower()
+LLM_CASSETTE_DIR: str = os.getenv("LLM_CASSETTE_DIR", "tests/cassettes")
+cassette_store = CassetteStore(LLM_CASSETTE_DIR)
+
+
+# ── Rate Limits (per model; 0 = unlimited) ──────────────────────────────────
+sonnet_limiter = ModelLimiter(
+    "sonnet",
+    max_in_flight=int(os.getenv("SONNET_MAX_IN_FLIGHT", "8")),
+    requests_per_minute=int(os.getenv("SONNET_RPM", "50")),
+    tokens_per_minute=int(os.getenv("SONNET_TPM", "30000")),
+    output_tokens_per_minute=int(os.getenv("SONNET_OTPM", "8000")),
+)
+
+haiku_limiter = ModelLimiter(
+    "haiku",
+    max_in_flight=int(os.getenv("HAIKU_MAX_IN_FLIGHT", "16")),
+    requests_per_minute=int(os.getenv("HAIKU_RPM", "50")),
+    tokens_per_minute=int(os.getenv("HAIKU_TPM", "50000")),
+    output_tokens_per_minute=int(os.getenv("HAIKU_OTPM", "10000")),
+)
+
+
+# ── Deadlines & Hedging (see src/llm/hedging.py; 0 = disabled) ──────────────
+LLM_HEDGING_ENABLED: bool = os.getenv("LLM_HEDGING_ENABLED", "true").lower() == "true"
+LLM_CALL_TIMEOUT_S: float = float(os.getenv("LLM_CALL_TIMEOUT_S", "60"))
+SONNET_HEDGE_AFTER_S: float = float(os.getenv("SONNET_HEDGE_AFTER_S", "8"))
+HAIKU_HEDGE_AFTER_S: float = float(os.getenv("HAIKU_HEDGE_AFTER_S", "3"))
+# "haiku" → a slow Sonnet call is hedged with Haiku; "sonnet" → with a second Sonnet attempt
+SONNET_HEDGE_TARGET: str = os.getenv("SONNET_HEDGE_TARGET", "haiku").lower()
+# Only these read-only nodes are hedged. The ReAct agents' tool-bound calls can take
+# actions, so they stay on their routed model and get deadlines only.
+LLM_HEDGE_NODES: frozenset[str] = frozenset(
+    name.strip()
+    for name in os.getenv(
+        "LLM_HEDGE_NODES", "intent_classifier,intent_shift_check,reflection_validator,escalation_handler"
+    ).split(",")
+    if name.strip()
+)
+
+# Total LLM time per graph node, measured from node start (seconds).
+NODE_TIME_BUDGETS_S: dict[str, float] = {
+    "intent_classifier": 10,
+    "intent_shift_check": 10,
+    "supervisor": 20,
+    "wismo_agent": 90,
+    "issue_agent": 90,
+    "account_agent": 90,
+    "reflection_validator": 15,
+    "revise_response": 30,
+    "escalation_handler": 30,
+}
 
 
 # ── Model Builders ───────────────────────────────────────────────────────────
-def _build_chat_model(*, model: str, temperature: float, max_tokens: int) -> Any:
+def _build_chat_model(
+    *,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    limiter: ModelLimiter | None = None,
+) -> Any:
     """
-    Create a langchain_anthropic.ChatAnthropic instance if available.
+    Create a langchain_anthropic.ChatAnthropic instance if available,
+    wrapped in the model's rate limiter.
     Returns None if langchain_anthropic isn't installed.
+    LLM_BACKEND=fake builds a FakeChatModel instead (no network, no spend).
+    LLM_CASSETTE_MODE records/replays calls (replay needs neither).
     """
+    if LLM_CASSETTE_MODE == "replay":
+        chat_model = None
+    elif LLM_BACKEND == "fake":
+        chat_model = _build_fake_model(model=model)
+    else:
+        chat_model = _build_anthropic_model(model=model, temperature=temperature, max_tokens=max_tokens)
+        if chat_model is None:
+            return None
+
+    if LLM_CASSETTE_MODE != "off":
+        params = {"model": model, "temperature": temperature, "max_tokens": max_tokens}
+        chat_model = CassetteChatModel(chat_model, cassette_store, LLM_CASSETTE_MODE, params)
+        if LLM_CASSETTE_MODE == "replay":
+            # Unthrottled: replays are local reads; the proxy still does accounting.
+            limiter = ModelLimiter(limiter.name if limiter else model)
+
+    return RateLimitedChatModel(chat_model, limiter, model) if limiter else chat_model
+
+
+def _build_anthropic_model(*, model: str, temperature: float, max_tokens: int) -> Any:
     if importlib.util.find_spec("langchain_anthropic") is None:
         return None
 
@@ -57,19 +153,57 @@ def _build_chat_model(*, model: str, temperature: float, max_tokens: int) -> Any
     )
 
 
+_fake_script = None
+
+
+def _build_fake_model(*, model: str) -> Any:
+    """FakeChatModel sharing one script; latency from the per-model spec."""
+    global _fake_script
+    from src.llm.fake import FakeChatModel, FakeScript, parse_latency
+
+    if _fake_script is None:
+        _fake_script = FakeScript.load(LLM_FAKE_SCRIPT)
+    spec = LLM_FAKE_HAIKU_LATENCY if "haiku" in model else LLM_FAKE_SONNET_LATENCY
+    rng = random.Random(f"{LLM_FAKE_SEED}:{model}")
+    return FakeChatModel(model, script=_fake_script, latency=parse_latency(spec, rng))
+
+
+def _hedged(primary: Any, fallback: Any, hedge_after_s: float) -> Any:
+    """Wrap a model with deadlines + hedging (unchanged when disabled/unavailable)."""
+    if primary is None or not LLM_HEDGING_ENABLED:
+        return primary
+    return HedgedChatModel(
+        primary,
+        fallback,
+        hedge_after_s=hedge_after_s,
+        call_timeout_s=LLM_CALL_TIMEOUT_S,
+        node_budgets_s=NODE_TIME_BUDGETS_S,
+        hedge_nodes=LLM_HEDGE_NODES,
+    )
+
+
 # ── Model Instances ──────────────────────────────────────────────────────────
-sonnet_llm = _build_chat_model(
+_sonnet_base = _build_chat_model(
     model="claude-sonnet-4-20250514",
     temperature=0.0,
     max_tokens=2048,
+    limiter=sonnet_limiter,
 )
 
-haiku_llm = _build_chat_model(
+_haiku_base = _build_chat_model(
     model="claude-haiku-4-5-20251001",
     temperature=0.0,
     max_tokens=1024,
+    limiter=haiku_limiter,
 )
 
+sonnet_llm = _hedged(
+    _sonnet_base,
+    _haiku_base if SONNET_HEDGE_TARGET == "haiku" else None,
+    SONNET_HEDGE_AFTER_S,
+)
+haiku_llm = _hedged(_haiku_base, None, HAIKU_HEDGE_AFTER_S)
+
 
 # ── Constants ────────────────────────────────────────────────────────────────
 CONFIDENCE_THRESHOLD: int = 80
@@ -77,6 +211,66 @@ INTENT_SHIFT_THRESHOLD: int = 85
 MAX_HANDOFFS_PER_TURN: int = 1
 MAX_REFLECTION_CYCLES: int = 1
 
+# Intent cache (see src/patterns/intent_cache.py). Empty DB path = memory only.
+INTENT_CACHE_ENABLED: bool = os.getenv("INTENT_CACHE_ENABLED", "true").lower() == "true"
+INTENT_CACHE_SIZE: int = int(os.getenv("INTENT_CACHE_SIZE", "2048"))
+INTENT_CACHE_TTL_SECONDS: int = int(os.getenv("INTENT_CACHE_TTL_SECONDS", "86400"))
+INTENT_CACHE_DB_PATH: str = os.getenv("INTENT_CACHE_DB_PATH", "")
+
+# Start intent classification at turn start, overlapping input guardrails.
+SPECULATIVE_INTENT_ENABLED: bool = os.getenv("SPECULATIVE_INTENT_ENABLED", "true").lower() == "true"
+
+# Template fast-path (see src/patterns/fast_path.py): intent → min classifier confidence.
+FAST_PATH_ENABLED: bool = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+FAST_PATH_MIN_CONFIDENCE: dict[str, int] = {
+    intent.strip().upper(): int(threshold)
+    for intent, _, threshold in (
+        item.partition(":") for item in os.getenv("FAST_PATH_INTENTS", "POSITIVE:90,GENERAL:90").split(",")
+    )
+    if intent.strip() and threshold.strip()
+}
+
+# Per-turn Haiku/Sonnet choice for the ReAct agents (see src/agents/model_router.py).
+AGENT_MODEL_ROUTING_ENABLED: bool = os.getenv("AGENT_MODEL_ROUTING_ENABLED", "true").lower() == "true"
+AGENT_HAIKU_INTENTS: set[str] = {
+    intent.strip().upper() for intent in os.getenv("AGENT_HAIKU_INTENTS", "WISMO").split(",") if intent.strip()
+}
+AGENT_HAIKU_MIN_CONFIDENCE: int = int(os.getenv("AGENT_HAIKU_MIN_CONFIDENCE", "90"))
+AGENT_HAIKU_MAX_TURNS: int = int(os.getenv("AGENT_HAIKU_MAX_TURNS", "2"))
+
+# Per-intent compact system prompts for account_agent / issue_agent
+# (see ACCOUNT_PROMPT_VARIANTS / ISSUE_PROMPT_VARIANTS; budgets in benchmarks/prompt_budget.py).
+PROMPT_VARIANTS_ENABLED: bool = os.getenv("PROMPT_VARIANTS_ENABLED", "true").lower() == "true"
+
+# Run an iteration's consecutive read-only tool calls concurrently (READ_ONLY_TOOLS).
+PARALLEL_TOOL_CALLS_ENABLED: bool = os.getenv("PARALLEL_TOOL_CALLS_ENABLED", "true").lower() == "true"
+
+# Project lookup results to the fields the prompts use before they go back to the
+# model (src/tools/compaction.py); tool_calls_log keeps the full payload.
+TOOL_RESULT_COMPACTION_ENABLED: bool = os.getenv("TOOL_RESULT_COMPACTION_ENABLED", "true").lower() == "true"
+
+# Look up the customer's orders and subscriptions when /session/start is called
+# (src/agents/customer_context.py); the first turn waits at most this long for them.
+CUSTOMER_PREFETCH_ENABLED: bool = os.getenv("CUSTOMER_PREFETCH_ENABLED", "true").lower() == "true"
+CUSTOMER_PREFETCH_WAIT_SECONDS: float = float(os.getenv("CUSTOMER_PREFETCH_WAIT_SECONDS", "1.5"))
+# Prefetches not taken by a first message within this time are cancelled and dropped.
+CUSTOMER_PREFETCH_TTL_SECONDS: float = float(os.getenv("CUSTOMER_PREFETCH_TTL_SECONDS", "900"))
+
+# Finished escalations kept in memory for GET /escalations (oldest dropped first; the
+# checkpoint keeps each session's copy). Pending summaries are never dropped.
+ESCALATION_QUEUE_MAX_FINISHED: int = int(os.getenv("ESCALATION_QUEUE_MAX_FINISHED", "500"))
+
+# Per-run ReAct budget (src/agents/react_budget.py; per-intent overrides in INTENT_BUDGETS).
+# When disabled only the iteration cap applies.
+REACT_BUDGET_ENABLED: bool = os.getenv("REACT_BUDGET_ENABLED", "true").lower() == "true"
+REACT_BUDGET_DEADLINE_S: float = float(os.getenv("REACT_BUDGET_DEADLINE_S", "30"))
+REACT_BUDGET_MAX_TOKENS: int = int(os.getenv("REACT_BUDGET_MAX_TOKENS", "60000"))
+REACT_BUDGET_MAX_TOOL_CALLS: int = int(os.getenv("REACT_BUDGET_MAX_TOOL_CALLS", "8"))
+
+# Batched classification (classify_intents) for bulk triage / backfills.
+INTENT_BATCH_SIZE: int = 25
+INTENT_BATCH_CONCURRENCY: int = 4
+
 VALID_INTENTS: set[str] = {
     "WISMO",
     "WRONG_MISSING",
@@ -147,3 +341,13 @@ def get_current_context() -> dict[str, str]:
         "day_of_week": now.strftime("%A"),
         "wait_promise": wait_promise,
     }
+
+
+# Prompts embed today's date: pin cassette runs to the recording date so replays hash the same.
+if LLM_CASSETTE_MODE != "off":
+    _cassette_context = cassette_store.pinned_context(get_current_context())
+    set_time_override(
+        _cassette_context["current_date"],
+        _cassette_context["day_of_week"],
+        _cassette_context["wait_promise"],
+    )
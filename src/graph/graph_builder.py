@@ -11,24 +11,35 @@ from langgraph.graph import END, START, StateGraph
 from src.agents.escalation import escalation_handler_node, post_escalation_node
 from src.agents.react_agents import (
     account_agent_node,
+    compile_agents,
     issue_agent_node,
     wismo_agent_node,
 )
 from src.agents.supervisor import supervisor_node, supervisor_route
 from src.graph.state import CustomerSupportState
+from src.patterns.fast_path import fast_path_node, measure_agent_path, route_fast_path
 from src.patterns.guardrails import input_guardrails_node, output_guardrails_node
 from src.patterns.handoff import handoff_router_node
 from src.patterns.intent_classifier import (
+    discard_speculative_classification,
     intent_classifier_node,
     intent_shift_check_node,
     route_after_shift_check,
     route_by_confidence,
+    start_speculative_classification,
+)
+from src.patterns.reflection import (
+    reflection_check_node,
+    revise_response_node,
 )
-from src.patterns.reflection import reflection_validator_node, revise_response_node
 
 
 async def escalation_lock_node(state: dict) -> dict:
-    """Check escalation lock and reset per-turn volatile flags."""
+    """
+    Check escalation lock and reset per-turn volatile flags.
+    Active sessions also start the turn's intent classification here, so the
+    Haiku call overlaps input guardrails instead of waiting for them.
+    """
     turn_reset = {
         "was_revised": False,
         "handoff_count_this_turn": 0,
@@ -40,6 +51,7 @@ async def escalation_lock_node(state: dict) -> dict:
         "reflection_feedback": None,
         "reflection_rule_violated": None,
         "reflection_suggested_fix": None,
+        "reflection_verdict": None,
         "input_blocked": False,
         "override_response": None,
         "flag_escalation_risk": False,
@@ -49,6 +61,7 @@ async def escalation_lock_node(state: dict) -> dict:
         "flag_reship_acceptance": False,
         "flag_partial_delivery": False,
         "handoff_target": None,
+        "handoff_note": None,
         "intent_shifted": False,
     }
 
@@ -58,12 +71,21 @@ async def escalation_lock_node(state: dict) -> dict:
             "is_escalated": True,
             "agent_reasoning": ["ESCALATION LOCK: Session is locked"],
         }
+    start_speculative_classification(state)
     return {
         **turn_reset,
         "agent_reasoning": ["ESCALATION LOCK: Session active"],
     }
 
 
+def _route_after_classifier(state: dict) -> str:
+    return route_fast_path(route_by_confidence(state), state)
+
+
+def _route_after_shift(state: dict) -> str:
+    return route_fast_path(route_after_shift_check(state), state)
+
+
 def _route_escalation_lock(state: dict) -> str:
     if state.get("is_escalated"):
         return "post_escalation"
@@ -71,6 +93,13 @@ def _route_escalation_lock(state: dict) -> str:
 
 
 def _route_after_input_guardrails(state: dict) -> str:
+    route = _input_guardrails_route(state)
+    if route not in ("intent_classifier", "intent_shift_check"):
+        discard_speculative_classification(state)
+    return route
+
+
+def _input_guardrails_route(state: dict) -> str:
     if state.get("input_blocked"):
         return "__end__"
 
@@ -164,12 +193,62 @@ def _route_after_output_guardrails(state: dict) -> str:
         return "handoff_router"
     if not state.get("output_guardrail_passed", True):
         return "revise_response"
-    # Selective reflection: skip for non-destructive responses
-    if _should_run_reflection(state):
-        return "reflection_validator"
+    # Drafts that need reflection were reviewed on the parallel path (see _route_draft).
     return "__end__"
 
 
+# ─── Parallel Draft Review: output checks ‖ reflection → review_join ──────
+_CONTROL_PREFIXES = ("HANDOFF:", "ESCALATE:")
+_PARALLEL_REVIEW = ["output_checks", "reflection_check"]
+
+
+def _is_control_draft(state: dict) -> bool:
+    messages = state.get("messages") or []
+    content = getattr(messages[-1], "content", "") if messages else ""
+    return isinstance(content, str) and content.strip().startswith(_CONTROL_PREFIXES)
+
+
+def _route_draft(state: dict) -> str | list[str]:
+    """
+    Fan out a fresh draft. Drafts that need reflection get the deterministic
+    output checks and the Haiku reflection call in the same step; handoff /
+    escalation commands and info-only replies take the serial output_guardrails
+    path, so no reflection call is started for them.
+    """
+    if _is_control_draft(state) or not _should_run_reflection(state):
+        return "output_guardrails"
+    return list(_PARALLEL_REVIEW)
+
+
+def _route_after_supervisor(state: dict) -> str | list[str]:
+    route = supervisor_route(state)
+    if route == "respond_direct":
+        return _route_draft(state)
+    return route
+
+
+async def review_join_node(state: dict) -> dict:
+    """
+    Merge the parallel review. A failed output guardrail wins (its reflection_*
+    feedback drives the revision); otherwise the reflection verdict is applied.
+    """
+    verdict = state.get("reflection_verdict") or {}
+    if not state.get("output_guardrail_passed", True):
+        update: dict = {"reflection_verdict": None}
+        if verdict.get("reflection_passed") is False:
+            update["agent_reasoning"] = [
+                "REFLECTION: Verdict superseded by output guardrail failure"
+            ]
+        return update
+    return {**verdict, "reflection_verdict": None}
+
+
+def _route_after_review(state: dict) -> str:
+    if not state.get("output_guardrail_passed", True):
+        return "revise_response"
+    return _route_after_reflection(state)
+
+
 def _route_after_reflection(state: dict) -> str:
     if state.get("reflection_passed", True):
         return "__end__"
@@ -193,27 +272,94 @@ def _route_after_handoff(state: dict) -> str:
     return target if target in valid else "supervisor"
 
 
-def build_graph() -> StateGraph:
-    """Construct and compile the full multi-agent graph."""
-    graph = StateGraph(CustomerSupportState)
+# ─── Fused Pre-Routing: escalation lock + input guardrails + auto-escalate ──
+_AUTO_ESCALATE_NODES = {
+    "auto_escalate_health": auto_escalate_health_node,
+    "auto_escalate_chargeback": auto_escalate_chargeback_node,
+    "auto_escalate_reship": auto_escalate_reship_node,
+}
+
+# Channels with a concatenating reducer (see CustomerSupportState).
+_APPEND_KEYS = ("messages", "agent_reasoning", "model_calls")
+
+
+def _merge_node_updates(*updates: dict) -> dict:
+    """Combine several node updates the way the graph reducers would."""
+    merged: dict = {}
+    for update in updates:
+        for key, value in update.items():
+            if key in _APPEND_KEYS:
+                merged[key] = list(merged.get(key) or []) + list(value or [])
+            else:
+                merged[key] = value
+    return merged
+
+
+def _apply_update(state: dict, update: dict) -> dict:
+    """Return a state view with a node update applied (append channels extended)."""
+    applied = {**state, **update}
+    for key in _APPEND_KEYS:
+        if key in update:
+            applied[key] = list(state.get(key) or []) + list(update[key] or [])
+    return applied
+
+
+async def pre_routing_node(state: dict) -> dict:
+    """
+    Deterministic pre-routing in a single super-step.
+    Same semantics as escalation_lock → input_guardrails → auto_escalate_*
+    (or post_escalation), without the per-node scheduling and checkpoints.
+    """
+    lock_update = await escalation_lock_node(state)
+    if lock_update.get("is_escalated"):
+        post_update = await post_escalation_node(_apply_update(state, lock_update))
+        return _merge_node_updates(lock_update, post_update)
+
+    # The guardrail reads the latest message (and rewrites it in place when
+    # redacting PII), so it must see the original message objects.
+    guard_state = {**state, **{k: v for k, v in lock_update.items() if k not in _APPEND_KEYS}}
+    guard_update = input_guardrails_node(guard_state)
+    update = _merge_node_updates(lock_update, guard_update)
+
+    route = _route_after_input_guardrails({**guard_state, **guard_update})
+    auto_escalate = _AUTO_ESCALATE_NODES.get(route)
+    if auto_escalate is not None:
+        escalate_update = await auto_escalate(_apply_update(state, update))
+        update = _merge_node_updates(update, escalate_update)
+    return update
+
+
+def _route_after_pre_routing(state: dict) -> str:
+    if state.get("is_escalated"):
+        return "__end__"
+    route = _route_after_input_guardrails(state)
+    if route in _AUTO_ESCALATE_NODES:
+        return "escalation_handler"
+    return route
+
+
+def _add_pre_routing_nodes(graph: StateGraph, *, fused: bool) -> None:
+    """Wire START → intent_classifier / intent_shift_check / escalation / END."""
+    if fused:
+        graph.add_node("pre_routing", pre_routing_node)
+        graph.add_edge(START, "pre_routing")
+        graph.add_conditional_edges(
+            "pre_routing",
+            _route_after_pre_routing,
+            {
+                "__end__": END,
+                "escalation_handler": "escalation_handler",
+                "intent_classifier": "intent_classifier",
+                "intent_shift_check": "intent_shift_check",
+            },
+        )
+        return
 
     graph.add_node("escalation_lock", escalation_lock_node)
     graph.add_node("input_guardrails", input_guardrails_node)
     graph.add_node("auto_escalate_health", auto_escalate_health_node)
     graph.add_node("auto_escalate_chargeback", auto_escalate_chargeback_node)
     graph.add_node("auto_escalate_reship", auto_escalate_reship_node)
-    graph.add_node("intent_classifier", intent_classifier_node)
-    graph.add_node("intent_shift_check", intent_shift_check_node)
-    graph.add_node("supervisor", supervisor_node)
-    graph.add_node("wismo_agent", wismo_agent_node)
-    graph.add_node("issue_agent", issue_agent_node)
-    graph.add_node("account_agent", account_agent_node)
-    graph.add_node("output_guardrails", output_guardrails_node)
-    graph.add_node("output_guardrails_final", output_guardrails_final_node)
-    graph.add_node("handoff_router", handoff_router_node)
-    graph.add_node("reflection_validator", reflection_validator_node)
-    graph.add_node("revise_response", revise_response_node)
-    graph.add_node("escalation_handler", escalation_handler_node)
     graph.add_node("post_escalation", post_escalation_node)
 
     graph.add_edge(START, "escalation_lock")
@@ -240,44 +386,88 @@ def build_graph() -> StateGraph:
     graph.add_edge("auto_escalate_health", "escalation_handler")
     graph.add_edge("auto_escalate_chargeback", "escalation_handler")
     graph.add_edge("auto_escalate_reship", "escalation_handler")
+    graph.add_edge("post_escalation", END)
+
+
+def build_graph(*, fused_pre_routing: bool = False) -> StateGraph:
+    """
+    Construct the full multi-agent graph.
+    fused_pre_routing=True collapses the deterministic lock/guardrail/auto-escalate
+    steps into one "pre_routing" node (identical semantics, fewer super-steps).
+    """
+    graph = StateGraph(CustomerSupportState)
+
+    _add_pre_routing_nodes(graph, fused=fused_pre_routing)
+    graph.add_node("intent_classifier", intent_classifier_node)
+    graph.add_node("intent_shift_check", intent_shift_check_node)
+    graph.add_node("fast_path", fast_path_node)
+    graph.add_node("supervisor", measure_agent_path(supervisor_node))
+    graph.add_node("wismo_agent", wismo_agent_node)
+    graph.add_node("issue_agent", issue_agent_node)
+    graph.add_node("account_agent", measure_agent_path(account_agent_node))
+    graph.add_node("output_guardrails", output_guardrails_node)
+    graph.add_node("output_checks", output_guardrails_node)
+    graph.add_node("reflection_check", reflection_check_node)
+    graph.add_node("review_join", review_join_node)
+    graph.add_node("output_guardrails_final", output_guardrails_final_node)
+    graph.add_node("handoff_router", handoff_router_node)
+    graph.add_node("revise_response", revise_response_node)
+    graph.add_node("escalation_handler", escalation_handler_node)
 
     graph.add_conditional_edges(
         "intent_classifier",
-        route_by_confidence,
+        _route_after_classifier,
         {
             "wismo_agent": "wismo_agent",
             "issue_agent": "issue_agent",
             "account_agent": "account_agent",
             "supervisor": "supervisor",
+            "fast_path": "fast_path",
         },
     )
 
     graph.add_conditional_edges(
         "intent_shift_check",
-        route_after_shift_check,
+        _route_after_shift,
         {
             "wismo_agent": "wismo_agent",
             "issue_agent": "issue_agent",
             "account_agent": "account_agent",
             "supervisor": "supervisor",
+            "fast_path": "fast_path",
         },
     )
 
     graph.add_conditional_edges(
         "supervisor",
-        supervisor_route,
+        _route_after_supervisor,
         {
             "wismo_agent": "wismo_agent",
             "issue_agent": "issue_agent",
             "account_agent": "account_agent",
-            "respond_direct": "output_guardrails",
+            "output_guardrails": "output_guardrails",
+            "output_checks": "output_checks",
+            "reflection_check": "reflection_check",
             "escalate": "escalation_handler",
         },
     )
 
-    graph.add_edge("wismo_agent", "output_guardrails")
-    graph.add_edge("issue_agent", "output_guardrails")
-    graph.add_edge("account_agent", "output_guardrails")
+    draft_review = {
+        "output_guardrails": "output_guardrails",
+        "output_checks": "output_checks",
+        "reflection_check": "reflection_check",
+    }
+    for agent in ("wismo_agent", "issue_agent", "account_agent"):
+        graph.add_conditional_edges(agent, _route_draft, draft_review)
+
+    # Both parallel branches finish in the same step, so review_join runs once.
+    graph.add_edge("output_checks", "review_join")
+    graph.add_edge("reflection_check", "review_join")
+    graph.add_conditional_edges(
+        "review_join",
+        _route_after_review,
+        {"__end__": END, "revise_response": "revise_response"},
+    )
 
     graph.add_conditional_edges(
         "output_guardrails",
@@ -287,7 +477,6 @@ def build_graph() -> StateGraph:
             "escalation_handler": "escalation_handler",
             "handoff_router": "handoff_router",
             "revise_response": "revise_response",
-            "reflection_validator": "reflection_validator",
         },
     )
 
@@ -302,21 +491,16 @@ def build_graph() -> StateGraph:
         },
     )
 
-    graph.add_conditional_edges(
-        "reflection_validator",
-        _route_after_reflection,
-        {"__end__": END, "revise_response": "revise_response"},
-    )
-
     graph.add_edge("revise_response", "output_guardrails_final")
     graph.add_edge("output_guardrails_final", END)
     graph.add_edge("escalation_handler", END)
-    graph.add_edge("post_escalation", END)
+    graph.add_edge("fast_path", END)
 
     return graph
 
 
-def compile_graph(checkpointer=None):
+def compile_graph(checkpointer=None, *, fused_pre_routing: bool = False):
     """Build, compile, and return the runnable graph with checkpointer."""
-    graph = build_graph()
+    compile_agents()
+    graph = build_graph(fused_pre_routing=fused_pre_routing)
     return graph.compile(checkpointer=checkpointer)
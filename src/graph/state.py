@@ -32,6 +32,7 @@ class CustomerSupportState(TypedDict, total=False):
 
     # ── Routing ──────────────────────────────────────────────────────────────
     current_agent: str  # supervisor | wismo_agent | issue_agent | account_agent
+    agent_model: Optional[str]  # haiku | sonnet — model tier of the last agent draft
 
     # ── Shared Context ───────────────────────────────────────────────────────
     order_details: Optional[dict]
@@ -60,13 +61,16 @@ class CustomerSupportState(TypedDict, total=False):
     is_escalation: bool  # control command for escalation handler
     handoff_target: Optional[str]
     handoff_count_this_turn: int
+    handoff_note: Optional[str]  # "<from> → <to>: <reason>" for the handoff target this turn
 
     # ── Reflection State ─────────────────────────────────────────────────────
     reflection_passed: bool
     reflection_feedback: Optional[str]
     reflection_rule_violated: Optional[str]
     reflection_suggested_fix: Optional[str]
+    reflection_verdict: Optional[dict]  # parallel review: reflection result awaiting review_join
     was_revised: bool
+    reflection_failures: int  # drafts revised this session (keeps later turns on Sonnet)
 
     # ── Escalation ───────────────────────────────────────────────────────────
     is_escalated: bool
@@ -80,3 +84,4 @@ class CustomerSupportState(TypedDict, total=False):
     current_turn_index: int
     actions_taken: list[str]
     agent_reasoning: Annotated[list[str], lambda a, b: (a or []) + (b or [])]
+    model_calls: Annotated[list[dict], lambda a, b: (a or []) + (b or [])]  # per-LLM-call accounting
@@ -0,0 +1,50 @@
+# LLM package - Shared infrastructure around the chat models
+"""
+Infrastructure wrapped around sonnet_llm / haiku_llm (built in src.config).
+- ModelLimiter / RateLimitedChatModel: concurrency + RPM/TPM limits with priorities
+- llm_priority / Priority: mark calls as INTERACTIVE or BACKGROUND
+- cache_usage / format_cache_usage: cached vs uncached input tokens per call
+- track_model_calls / model_call_ledger: per-call tokens, latency, cost (per node, per day)
+- TokenChannel / stream_to: per-request streaming of the final agent answer
+- HedgedChatModel / LLMDeadlineExceeded: per-node deadlines + hedged requests
+- CassetteChatModel / CassetteStore: record/replay LLM calls keyed by prompt hash
+
+Note: modules in this package must not import src.config (config imports them).
+"""
+
+from src.llm.accounting import (
+    model_call_ledger,
+    model_call_step,
+    summarize_model_calls,
+    track_model_calls,
+)
+from src.llm.cassette import CassetteChatModel, CassetteMiss, CassetteStore
+from src.llm.hedging import HedgedChatModel, LLMDeadlineExceeded
+from src.llm.limiter import (
+    ModelLimiter,
+    Priority,
+    RateLimitedChatModel,
+    llm_priority,
+)
+from src.llm.streaming import TokenChannel, stream_to
+from src.llm.usage import cache_usage, format_cache_usage
+
+__all__ = [
+    "ModelLimiter",
+    "Priority",
+    "RateLimitedChatModel",
+    "llm_priority",
+    "cache_usage",
+    "format_cache_usage",
+    "model_call_ledger",
+    "model_call_step",
+    "summarize_model_calls",
+    "track_model_calls",
+    "TokenChannel",
+    "stream_to",
+    "HedgedChatModel",
+    "LLMDeadlineExceeded",
+    "CassetteChatModel",
+    "CassetteMiss",
+    "CassetteStore",
+]
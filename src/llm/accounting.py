@@ -0,0 +1,200 @@
+"""
+Per-call model accounting: tokens, latency and estimated cost.
+
+RateLimitedChatModel reports every ainvoke/astream here. Each call is:
+- appended to the active node scope (track_model_calls), which graph nodes
+  return as the `model_calls` state key → SessionTrace.model_calls
+- added to the process-wide per-day ledger (exported via /metrics)
+
+Costs are estimates from MODEL_PRICING (USD per million tokens).
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+from src.llm.usage import cache_usage
+
+# input / output / cache read / cache write, USD per 1M tokens
+MODEL_PRICING: dict[str, dict[str, float]] = {
+    "claude-sonnet-4": {"input": 3.00, "output": 15.00, "cache_read": 0.30, "cache_creation": 3.75},
+    "claude-haiku-4-5": {"input": 1.00, "output": 5.00, "cache_read": 0.10, "cache_creation": 1.25},
+}
+
+_current_calls: ContextVar[Optional[list]] = ContextVar("model_calls", default=None)
+_current_node: ContextVar[str] = ContextVar("model_call_node", default="")
+_current_step: ContextVar[str] = ContextVar("model_call_step", default="")
+_node_started: ContextVar[Optional[float]] = ContextVar("model_call_node_started", default=None)
+
+
+def _pricing(model: str) -> Optional[dict[str, float]]:
+    for prefix, prices in MODEL_PRICING.items():
+        if model.startswith(prefix):
+            return prices
+    return None
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int,
+                  cache_read: int = 0, cache_creation: int = 0) -> float:
+    """Estimated USD cost of one call; 0.0 for unknown models."""
+    prices = _pricing(model or "")
+    if prices is None:
+        return 0.0
+    uncached = max(0, input_tokens - cache_read - cache_creation)
+    cost = (
+        uncached * prices["input"]
+        + output_tokens * prices["output"]
+        + cache_read * prices["cache_read"]
+        + cache_creation * prices["cache_creation"]
+    ) / 1_000_000
+    return round(cost, 6)
+
+
+# ─── Scopes ─────────────────────────────────────────────────────────────────
+
+@contextmanager
+def model_call_scope(node: str) -> Iterator[list[dict]]:
+    """Collect the model calls made inside the block, labelled with `node`."""
+    calls: list[dict] = []
+    calls_token = _current_calls.set(calls)
+    node_token = _current_node.set(node)
+    started_token = _node_started.set(time.monotonic())
+    try:
+        yield calls
+    finally:
+        _node_started.reset(started_token)
+        _current_node.reset(node_token)
+        _current_calls.reset(calls_token)
+
+
+def current_node() -> str:
+    """Name of the graph node whose model calls are being tracked ("" outside a node)."""
+    return _current_node.get()
+
+
+def node_elapsed() -> float:
+    """Seconds since the current node scope started (0.0 outside a node)."""
+    started = _node_started.get()
+    return time.monotonic() - started if started is not None else 0.0
+
+
+@contextmanager
+def model_call_step(step: str) -> Iterator[None]:
+    """Label calls inside the block with a sub-step (e.g. "react_iteration_2")."""
+    token = _current_step.set(step)
+    try:
+        yield
+    finally:
+        _current_step.reset(token)
+
+
+def track_model_calls(node: str):
+    """Decorator for async graph nodes: adds the node's model calls to its output."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(state, *args, **kwargs):
+            with model_call_scope(node) as calls:
+                output = await fn(state, *args, **kwargs)
+            if calls and isinstance(output, dict):
+                output = {**output, "model_calls": list(output.get("model_calls") or []) + calls}
+            return output
+        return wrapper
+    return decorator
+
+
+# ─── Recording ──────────────────────────────────────────────────────────────
+
+def record_model_call(model: str, result: Any, latency_s: float) -> dict:
+    """Build the record for one finished call and publish it to scope + ledger."""
+    usage = cache_usage(result)
+    meta = getattr(result, "usage_metadata", None) or {}
+    output_tokens = int(meta.get("output_tokens") or 0)
+    record = {
+        "node": _current_node.get() or "unscoped",
+        "step": _current_step.get() or None,
+        "model": model,
+        "input_tokens": usage["input_tokens"],
+        "output_tokens": output_tokens,
+        "cache_read_tokens": usage["cache_read"],
+        "cache_creation_tokens": usage["cache_creation"],
+        "latency_ms": round(latency_s * 1000, 1),
+        "cost_usd": estimate_cost(
+            model, usage["input_tokens"], output_tokens,
+            usage["cache_read"], usage["cache_creation"],
+        ),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+    calls = _current_calls.get()
+    if calls is not None:
+        calls.append(record)
+    model_call_ledger.add(record)
+    return record
+
+
+def _empty_totals() -> dict:
+    return {
+        "calls": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_creation_tokens": 0,
+        "latency_ms": 0.0,
+        "cost_usd": 0.0,
+    }
+
+
+def _accumulate(totals: dict, record: dict) -> None:
+    totals["calls"] += 1
+    for key in ("input_tokens", "output_tokens", "cache_read_tokens", "cache_creation_tokens"):
+        totals[key] += int(record.get(key) or 0)
+    totals["latency_ms"] = round(totals["latency_ms"] + float(record.get("latency_ms") or 0), 1)
+    totals["cost_usd"] = round(totals["cost_usd"] + float(record.get("cost_usd") or 0), 6)
+
+
+def _new_summary() -> dict:
+    return {"totals": _empty_totals(), "by_node": {}, "by_model": {}}
+
+
+def _add_to_summary(summary: dict, record: dict) -> None:
+    _accumulate(summary["totals"], record)
+    _accumulate(summary["by_node"].setdefault(record.get("node") or "unscoped", _empty_totals()), record)
+    _accumulate(summary["by_model"].setdefault(record.get("model") or "unknown", _empty_totals()), record)
+
+
+def summarize_model_calls(calls: list[dict]) -> dict:
+    """Totals plus per-node and per-model breakdowns for a list of call records."""
+    summary = _new_summary()
+    for record in calls or []:
+        _add_to_summary(summary, record)
+    return summary
+
+
+class ModelCallLedger:
+    """Process-wide per-day (UTC) aggregation of model calls."""
+
+    def __init__(self, max_days: int = 30) -> None:
+        self.max_days = max_days
+        self._days: OrderedDict[str, dict] = OrderedDict()
+
+    def add(self, record: dict) -> None:
+        day = (record.get("timestamp") or datetime.now(timezone.utc).isoformat())[:10]
+        if day not in self._days:
+            self._days[day] = _new_summary()
+            while len(self._days) > self.max_days:
+                self._days.popitem(last=False)
+        _add_to_summary(self._days[day], record)
+
+    def clear(self) -> None:
+        self._days.clear()
+
+    def stats(self) -> dict:
+        return {"per_day": dict(self._days)}
+
+
+model_call_ledger = ModelCallLedger()
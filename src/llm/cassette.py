@@ -0,0 +1,269 @@
+"""
+Record/replay cassettes for LLM calls (LLM_CASSETTE_MODE).
+
+CassetteChatModel wraps a chat model and keys every call by a SHA-256 of the
+model params, the bound tools (+ bind kwargs such as tool_choice) and the
+serialized input messages (content, tool_calls, tool_call_id). Tool results
+are normalized first: timestamps, generated IDs / codes and tokens from the
+mock API change on every run, so they are masked before hashing.
+- record: call the model and store the response (content, tool_calls, usage)
+- replay: serve from the store; a miss raises CassetteMiss (no network)
+- auto:   replay on hit, record on miss
+
+Each response is one JSON file (<key>.json) in the cassette directory, so
+concurrent recordings never clobber each other and diffs stay readable.
+Responses carry the recorded tool_call ids, so the tool messages of the next
+ReAct iteration hash the same on replay.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Any, Optional
+
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    convert_to_messages,
+    message_to_dict,
+    messages_from_dict,
+)
+
+CASSETTE_MODES = ("off", "record", "replay", "auto")
+
+
+class CassetteMiss(LookupError):
+    """Replay mode found no recorded response for this call."""
+
+
+# ─── Keys ───────────────────────────────────────────────────────────────────
+
+
+def _tool_schema(tool: Any) -> Any:
+    try:
+        from langchain_core.utils.function_calling import convert_to_openai_tool
+
+        return convert_to_openai_tool(tool)
+    except Exception:
+        return repr(tool)
+
+
+# Tool-result fields that differ between runs of the same conversation.
+_VOLATILE_KEY_RE = re.compile(r"(?:At|_at|[Tt]imestamp|[Tt]oken|^code)$")
+_VOLATILE_VALUE_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?"  # ISO timestamps
+    r"|\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"  # UUIDs
+    r"|(?<=/)(?=[0-9]*[a-f])[0-9a-f]{8,}\b"  # hex GID suffixes (numeric GIDs are stable)
+)
+
+
+def _mask_volatile(value: Any, key: str = "") -> Any:
+    if isinstance(value, dict):
+        return {k: _mask_volatile(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_mask_volatile(v) for v in value]
+    if isinstance(value, str):
+        return "<volatile>" if _VOLATILE_KEY_RE.search(key) else _VOLATILE_VALUE_RE.sub("<volatile>", value)
+    return value
+
+
+def _tool_result_content(content: Any) -> Any:
+    """Tool result with its run-specific fields masked."""
+    if not isinstance(content, str):
+        return _mask_volatile(content)
+    try:
+        return _mask_volatile(json.loads(content))
+    except ValueError:
+        return _VOLATILE_VALUE_RE.sub("<volatile>", content)
+
+
+def _message_fields(message: Any) -> dict:
+    return {
+        "type": message.type,
+        "content": _tool_result_content(message.content) if message.type == "tool" else message.content,
+        "tool_calls": [
+            {"name": c["name"], "args": c["args"], "id": c.get("id")}
+            for c in getattr(message, "tool_calls", None) or []
+        ],
+        "tool_call_id": getattr(message, "tool_call_id", None),
+    }
+
+
+def _input_messages(input: Any) -> list:
+    if isinstance(input, str):
+        return convert_to_messages([("human", input)])
+    if hasattr(input, "to_messages"):
+        return input.to_messages()
+    return convert_to_messages(list(input))
+
+
+def cassette_key(params: dict, tools: list, bind_kwargs: dict, input: Any) -> str:
+    """Stable hash of everything that determines the model's answer."""
+    payload = {
+        "params": params,
+        "tools": [_tool_schema(t) for t in tools],
+        "bind": bind_kwargs,
+        "messages": [_message_fields(m) for m in _input_messages(input)],
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# ─── Store ──────────────────────────────────────────────────────────────────
+
+
+class CassetteStore:
+    """Directory of recorded responses, one <key>.json per call."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def get(self, key: str) -> Optional[AIMessage]:
+        try:
+            with open(self._file(key), encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return messages_from_dict([entry["response"]])[0]
+
+    def put(self, key: str, model: str, response: Any) -> None:
+        message = response
+        if isinstance(response, AIMessageChunk):
+            message = AIMessage(
+                content=response.content,
+                tool_calls=response.tool_calls,
+                usage_metadata=response.usage_metadata,
+                response_metadata=response.response_metadata,
+            )
+        os.makedirs(self.path, exist_ok=True)
+        entry = {"model": model, "response": message_to_dict(message)}
+        tmp = f"{self._file(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(entry, fh, indent=2, ensure_ascii=False, default=str)
+        os.replace(tmp, self._file(key))
+        with self._lock:
+            self.recorded += 1
+
+    def pinned_context(self, current: dict[str, str]) -> dict[str, str]:
+        """
+        Date context the cassettes were recorded under (saved on first use),
+        so prompts that embed today's date hash the same on later replays.
+        """
+        meta = os.path.join(self.path, "_context.json")
+        try:
+            with open(meta, encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            os.makedirs(self.path, exist_ok=True)
+            with open(meta, "w", encoding="utf-8") as fh:
+                json.dump(current, fh, indent=2)
+            return current
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "hits": self.hits,
+                "misses": self.misses,
+                "recorded": self.recorded,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# ─── Model ──────────────────────────────────────────────────────────────────
+
+
+class CassetteChatModel:
+    """Chat-model proxy that records responses to / replays them from a CassetteStore."""
+
+    def __init__(
+        self,
+        model: Any,
+        store: CassetteStore,
+        mode: str,
+        params: dict,
+        *,
+        tools: Optional[list] = None,
+        bind_kwargs: Optional[dict] = None,
+    ) -> None:
+        if mode not in CASSETTE_MODES[1:]:
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        self._model = model
+        self.store = store
+        self.mode = mode
+        self.params = dict(params)
+        self.tools = list(tools or [])
+        self.bind_kwargs = dict(bind_kwargs or {})
+
+    def _key(self, input: Any) -> str:
+        return cassette_key(self.params, self.tools, self.bind_kwargs, input)
+
+    def _lookup(self, key: str) -> Optional[AIMessage]:
+        if self.mode == "record":
+            return None
+        recorded = self.store.get(key)
+        if recorded is None and (self.mode == "replay" or self._model is None):
+            raise CassetteMiss(f"No cassette for {self.params.get('model')} call {key[:12]} in {self.store.path}")
+        return recorded
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        key = self._key(input)
+        recorded = self._lookup(key)
+        if recorded is not None:
+            return recorded
+        result = await self._model.ainvoke(input, config, **kwargs)
+        self.store.put(key, self.params.get("model", ""), result)
+        return result
+
+    async def astream(self, input: Any, config: Any = None, **kwargs: Any):
+        key = self._key(input)
+        recorded = self._lookup(key)
+        if recorded is not None:
+            yield AIMessageChunk(
+                content=recorded.content,
+                tool_call_chunks=[
+                    {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                    for i, c in enumerate(recorded.tool_calls)
+                ],
+                usage_metadata=recorded.usage_metadata,
+                response_metadata=recorded.response_metadata,
+            )
+            return
+        merged = None
+        async for chunk in self._model.astream(input, config, **kwargs):
+            merged = chunk if merged is None else merged + chunk
+            yield chunk
+        if merged is not None:
+            self.store.put(key, self.params.get("model", ""), merged)
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "CassetteChatModel":
+        bound = self._model.bind_tools(tools, **kwargs) if self._model is not None else None
+        return CassetteChatModel(
+            bound,
+            self.store,
+            self.mode,
+            self.params,
+            tools=list(tools),
+            bind_kwargs=kwargs,
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        if self._model is None:
+            raise AttributeError(name)
+        return getattr(self._model, name)
@@ -0,0 +1,244 @@
+"""
+Offline stand-in for ChatAnthropic (LLM_BACKEND=fake).
+
+FakeChatModel answers from a script of regex rules (LLM_FAKE_SCRIPT, a JSON
+file) and otherwise from built-in defaults that keep every node's parser happy:
+"INTENT|CONF" for the classifier, "INDEX|INTENT|CONF" lines for batches,
+ROUTE/REASON/RESPONSE for the supervisor, a passing reflection verdict and a
+signed customer reply for agents. Latency is drawn from a configurable
+distribution, and usage_metadata is filled in so the limiter and model-call
+accounting behave as with the real model.
+
+Script rules (first match wins):
+    [{"model": "sonnet",                 # substring of the model name (optional)
+      "match": "where is my order",      # regex over the prompt text (optional)
+      "when": "no_tool_result",          # or "tool_result" (optional)
+      "times": 1,                        # uses before the rule expires (optional)
+      "response": "text" | {"content": "...", "tool_calls": [{"name": ..., "args": {...}}]}}]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import re
+import uuid
+from typing import Any, Callable, Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+# ─── Latency ────────────────────────────────────────────────────────────────
+
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    """
+    Latency sampler (seconds) from "fixed:MS", "uniform:LO_MS:HI_MS",
+    "normal:MEAN_MS:SD_MS" or "lognormal:MEDIAN_MS:SIGMA". Empty → 0.
+    """
+    kind, _, rest = (spec or "fixed:0").partition(":")
+    args = [float(x) for x in rest.split(":") if x]
+    kind = kind.strip().lower()
+    if kind == "fixed":
+        return lambda: args[0] / 1000
+    if kind == "uniform":
+        return lambda: rng.uniform(args[0], args[1]) / 1000
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(args[0], args[1])) / 1000
+    if kind == "lognormal":
+        mu = math.log(max(args[0], 1e-6))
+        return lambda: rng.lognormvariate(mu, args[1]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec!r}")
+
+
+# ─── Script ─────────────────────────────────────────────────────────────────
+
+
+class FakeScript:
+    """Ordered regex rules shared by every FakeChatModel built from one file."""
+
+    def __init__(self, rules: Optional[list[dict]] = None) -> None:
+        self.rules = [dict(rule) for rule in (rules or [])]
+
+    @classmethod
+    def load(cls, path: str) -> "FakeScript":
+        if not path:
+            return cls()
+        with open(path, encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+    def match(self, model: str, text: str, after_tool: bool) -> Any:
+        for rule in self.rules:
+            if rule.get("times") is not None and rule["times"] <= 0:
+                continue
+            if rule.get("model") and rule["model"] not in model:
+                continue
+            when = rule.get("when")
+            if when == "tool_result" and not after_tool:
+                continue
+            if when == "no_tool_result" and after_tool:
+                continue
+            if rule.get("match") and not re.search(rule["match"], text, re.IGNORECASE | re.DOTALL):
+                continue
+            if rule.get("times") is not None:
+                rule["times"] -= 1
+            return rule.get("response", "")
+        return None
+
+
+# ─── Default responses ──────────────────────────────────────────────────────
+
+_KEYWORD_INTENTS: list[tuple[str, str]] = [
+    ("refund", "REFUND"),
+    ("money back", "REFUND"),
+    ("wrong item", "WRONG_MISSING"),
+    ("missing", "WRONG_MISSING"),
+    ("not working", "NO_EFFECT"),
+    ("doesn't work", "NO_EFFECT"),
+    ("subscription", "SUBSCRIPTION"),
+    ("cancel", "ORDER_MODIFY"),
+    ("address", "ORDER_MODIFY"),
+    ("discount", "DISCOUNT"),
+    ("code", "DISCOUNT"),
+    ("love", "POSITIVE"),
+    ("amazing", "POSITIVE"),
+    ("where", "WISMO"),
+    ("track", "WISMO"),
+    ("shipp", "WISMO"),
+    ("order", "WISMO"),
+]
+
+_DEFAULT_REPLY = (
+    "Hey there! Thanks for reaching out — I'm looking into this for you "
+    "and will follow up shortly.\n\nCaz"
+)
+_BATCH_LINE_RE = re.compile(r"^\[(\d+)\]\s*(.*)$", re.MULTILINE)
+
+
+def _keyword_intent(message: str) -> str:
+    lower = message.lower()
+    for keyword, intent in _KEYWORD_INTENTS:
+        if keyword in lower:
+            return intent
+    return "GENERAL"
+
+
+def _default_response(text: str, tool_names: list[str]) -> Any:
+    if "ReflectionVerdict" in tool_names:
+        return {"tool_calls": [{"name": "ReflectionVerdict", "args": {"pass": True}}]}
+    if "INDEX|CATEGORY|CONFIDENCE" in text:
+        messages = text.split("Customer messages:", 1)[-1]
+        return "\n".join(
+            f"{idx}|{_keyword_intent(msg)}|90" for idx, msg in _BATCH_LINE_RE.findall(messages)
+        )
+    if "CATEGORY|CONFIDENCE" in text:
+        message = text.rsplit("Customer message:", 1)[-1]
+        intent = _keyword_intent(message)
+        return f"{intent}|{60 if intent == 'GENERAL' else 90}"
+    if "QA reviewer" in text:
+        return '{"pass": true}'
+    if "ROUTE:" in text:
+        return f"ROUTE: respond_direct\nREASON: offline stand-in\nRESPONSE: {_DEFAULT_REPLY}"
+    return _DEFAULT_REPLY
+
+
+# ─── Model ──────────────────────────────────────────────────────────────────
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            block.get("text", "") if isinstance(block, dict) else str(block) for block in content
+        )
+    return str(content or "")
+
+
+def _prompt_text(input: Any) -> tuple[str, bool]:
+    """(all prompt text, whether the last message is a tool result)."""
+    if isinstance(input, str):
+        return input, False
+    messages = input.to_messages() if hasattr(input, "to_messages") else list(input or [])
+    text = "\n".join(_content_text(getattr(m, "content", m)) for m in messages)
+    after_tool = bool(messages) and getattr(messages[-1], "type", "") == "tool"
+    return text, after_tool
+
+
+def _tool_name(tool: Any) -> str:
+    if isinstance(tool, dict):
+        return tool.get("name") or tool.get("function", {}).get("name", "")
+    return getattr(tool, "name", None) or getattr(tool, "__name__", "")
+
+
+class FakeChatModel:
+    """Scripted, latency-simulating replacement for ChatAnthropic."""
+
+    def __init__(
+        self,
+        model: str,
+        *,
+        script: Optional[FakeScript] = None,
+        latency: Callable[[], float] = lambda: 0.0,
+        tool_names: Optional[list[str]] = None,
+    ) -> None:
+        self.model = model
+        self.script = script or FakeScript()
+        self.latency = latency
+        self.tool_names = list(tool_names or [])
+
+    def bind_tools(self, tools: Any, **_kwargs: Any) -> "FakeChatModel":
+        return FakeChatModel(
+            self.model,
+            script=self.script,
+            latency=self.latency,
+            tool_names=[_tool_name(t) for t in tools],
+        )
+
+    def _respond(self, input: Any) -> AIMessage:
+        text, after_tool = _prompt_text(input)
+        response = self.script.match(self.model, text, after_tool)
+        if response is None:
+            response = _default_response(text, self.tool_names)
+        if isinstance(response, str):
+            response = {"content": response}
+        tool_calls = [
+            {"name": call["name"], "args": call.get("args", {}), "id": f"toolu_{uuid.uuid4().hex[:12]}"}
+            for call in response.get("tool_calls") or []
+        ]
+        content = response.get("content", "")
+        input_tokens = max(1, len(text) // 4)
+        output_tokens = max(1, (len(content) + len(json.dumps([c["args"] for c in tool_calls]))) // 4)
+        return AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+            response_metadata={"model_name": self.model, "stop_reason": "tool_use" if tool_calls else "end_turn"},
+        )
+
+    async def ainvoke(self, input: Any, config: Any = None, **_kwargs: Any) -> AIMessage:
+        message = self._respond(input)
+        await asyncio.sleep(self.latency())
+        return message
+
+    async def astream(self, input: Any, config: Any = None, **_kwargs: Any):
+        message = self._respond(input)
+        total = self.latency()
+        words = re.findall(r"\S+\s*", message.content) or [""]
+        await asyncio.sleep(total * 0.3)  # time to first token
+        for word in words:
+            yield AIMessageChunk(content=word)
+            await asyncio.sleep(total * 0.7 / len(words))
+        yield AIMessageChunk(
+            content="",
+            tool_call_chunks=[
+                {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                for i, c in enumerate(message.tool_calls)
+            ],
+            usage_metadata=message.usage_metadata,
+        )
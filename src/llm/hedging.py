@@ -0,0 +1,167 @@
+"""
+Deadline-aware hedged LLM calls.
+
+HedgedChatModel wraps a primary chat model (and optionally a fallback):
+- every call gets a timeout: min(call_timeout_s, what is left of the current
+  node's budget); node budgets are keyed by the node name set by
+  track_model_calls, measured from when the node started
+- if the primary has not answered after hedge_after_s, a second request is
+  fired (to the fallback model, or the primary again); the first successful
+  answer wins and the other request is cancelled; with hedge_nodes set, only
+  calls made inside those nodes are hedged (the rest are deadline-only)
+- when the deadline passes, LLMDeadlineExceeded is raised so the node can
+  degrade instead of stalling the whole turn
+
+astream() is deadline-only (a stream is not hedged once it has started).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Optional
+
+from src.llm.accounting import current_node, node_elapsed
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """The model call did not finish within its call timeout / node budget."""
+
+
+class _HedgeStats:
+    """Counters shared by a HedgedChatModel and the models bound from it."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.deadlines_exceeded = 0
+
+
+class HedgedChatModel:
+    """Chat-model proxy adding per-call deadlines and a delayed hedge request."""
+
+    def __init__(
+        self,
+        primary: Any,
+        fallback: Any = None,
+        *,
+        hedge_after_s: float = 0.0,
+        call_timeout_s: float = 0.0,
+        node_budgets_s: Optional[dict[str, float]] = None,
+        hedge_nodes: Optional[frozenset[str]] = None,
+        _stats: Optional[_HedgeStats] = None,
+    ) -> None:
+        self._primary = primary
+        self._fallback = fallback
+        self.hedge_after_s = hedge_after_s
+        self.call_timeout_s = call_timeout_s
+        self.node_budgets_s = dict(node_budgets_s or {})
+        self.hedge_nodes = hedge_nodes
+        self._stats = _stats or _HedgeStats()
+
+    def _timeout(self) -> Optional[float]:
+        """Seconds this call may take (None → unbounded)."""
+        limits = []
+        if self.call_timeout_s > 0:
+            limits.append(self.call_timeout_s)
+        budget = self.node_budgets_s.get(current_node())
+        if budget:
+            limits.append(max(0.0, budget - node_elapsed()))
+        return min(limits) if limits else None
+
+    def _hedges(self) -> bool:
+        """Whether a call made in the current node may fire a hedge request."""
+        if self.hedge_after_s <= 0:
+            return False
+        return self.hedge_nodes is None or current_node() in self.hedge_nodes
+
+    def _exceeded(self, timeout: Optional[float]) -> LLMDeadlineExceeded:
+        self._stats.deadlines_exceeded += 1
+        node = current_node() or "unscoped"
+        return LLMDeadlineExceeded(f"LLM call in {node} exceeded its {timeout:.1f}s deadline")
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        self._stats.calls += 1
+        timeout = self._timeout()
+        if timeout is not None and timeout <= 0:
+            raise self._exceeded(timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def _remaining() -> Optional[float]:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        primary = asyncio.ensure_future(self._primary.ainvoke(input, config, **kwargs))
+        pending = {primary}
+        hedge = None
+        try:
+            if self._hedges() and (timeout is None or self.hedge_after_s < timeout):
+                done, _ = await asyncio.wait(pending, timeout=self.hedge_after_s)
+                if not done:
+                    target = self._fallback or self._primary
+                    hedge = asyncio.ensure_future(target.ainvoke(input, config, **kwargs))
+                    pending.add(hedge)
+                    self._stats.hedges_fired += 1
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=_remaining(), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise self._exceeded(timeout)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._stats.hedges_won += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def astream(self, input: Any, config: Any = None, **kwargs: Any):
+        timeout = self._timeout()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        stream = self._primary.astream(input, config, **kwargs)
+        try:
+            while True:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise self._exceeded(timeout)
+                try:
+                    chunk = await asyncio.wait_for(stream.__anext__(), timeout=remaining)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    raise self._exceeded(timeout) from None
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "HedgedChatModel":
+        return HedgedChatModel(
+            self._primary.bind_tools(tools, **kwargs),
+            self._fallback.bind_tools(tools, **kwargs) if self._fallback is not None else None,
+            hedge_after_s=self.hedge_after_s,
+            call_timeout_s=self.call_timeout_s,
+            node_budgets_s=self.node_budgets_s,
+            hedge_nodes=self.hedge_nodes,
+            _stats=self._stats,
+        )
+
+    def stats(self) -> dict:
+        return {
+            "hedge_after_s": self.hedge_after_s,
+            "call_timeout_s": self.call_timeout_s,
+            "hedge_nodes": sorted(self.hedge_nodes) if self.hedge_nodes is not None else None,
+            "calls": self._stats.calls,
+            "hedges_fired": self._stats.hedges_fired,
+            "hedges_won": self._stats.hedges_won,
+            "deadlines_exceeded": self._stats.deadlines_exceeded,
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._primary, name)
@@ -0,0 +1,283 @@
+"""
+Per-model concurrency + rate limiting for LLM calls.
+
+Every node talks to sonnet_llm / haiku_llm directly, so bursts (several
+sessions hitting the ReAct loop at once) used to go straight to the provider.
+ModelLimiter coordinates them:
+- max in-flight requests
+- requests/min, input tokens/min and output tokens/min token buckets; like the
+  provider's limits, input counts only uncached prompt tokens (cache reads are
+  free) and output is charged to its own bucket once the usage is known
+- priority classes: INTERACTIVE calls (customer is waiting) are always
+  granted before BACKGROUND ones (escalation summaries, bulk triage)
+
+RateLimitedChatModel wraps a chat model and acquires a slot around every
+ainvoke/astream; bind_tools() keeps the wrapper. Queue-wait time is kept per
+limiter and exported through stats(). Finished calls are reported to
+src.llm.accounting (tokens, latency, cost).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from types import SimpleNamespace
+from typing import Any, Iterator, Optional
+
+from langchain_core.messages.ai import add_usage
+
+from src.llm.accounting import record_model_call
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_current_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """Run the enclosed LLM calls under the given priority class."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def estimate_tokens(payload: Any) -> int:
+    """Cheap input-token estimate (~4 chars/token) for str, messages or prompt values."""
+    if payload is None:
+        return 0
+    if isinstance(payload, str):
+        return max(1, len(payload) // 4)
+    if hasattr(payload, "to_messages"):
+        payload = payload.to_messages()
+    if isinstance(payload, (list, tuple)):
+        return sum(estimate_tokens(getattr(m, "content", m)) for m in payload)
+    if isinstance(payload, dict):
+        return estimate_tokens(payload.get("text") or payload.get("content") or "")
+    return estimate_tokens(str(payload))
+
+
+def rate_limited_tokens(usage: Optional[dict]) -> Optional[tuple[int, int]]:
+    """(uncached input, output) tokens that count against the TPM limits; None if unknown."""
+    if not usage:
+        return None
+    details = usage.get("input_token_details") or {}
+    cache_read = int(details.get("cache_read") or 0)
+    input_tokens = int(usage.get("input_tokens") or 0)
+    return max(0, input_tokens - cache_read), int(usage.get("output_tokens") or 0)
+
+
+class _TokenBucket:
+    """Continuous-refill bucket; capacity 0 means unlimited."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (0 when available now)."""
+        if self.capacity <= 0:
+            return 0.0
+        self._refill()
+        needed = min(amount, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        """Charge `amount` (a negative amount gives back an over-estimate)."""
+        if self.capacity > 0:
+            self._refill()
+            self.level = min(self.capacity, self.level - amount)
+
+
+class ModelLimiter:
+    """Priority-aware in-flight + RPM + TPM limiter for one model."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_in_flight: int = 0,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        output_tokens_per_minute: int = 0,
+    ) -> None:
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.output_tokens_per_minute = output_tokens_per_minute
+        self._requests = _TokenBucket(requests_per_minute)
+        self._tokens = _TokenBucket(tokens_per_minute)
+        self._output_tokens = _TokenBucket(output_tokens_per_minute)
+        self._in_flight = 0
+        self._queue: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waits: deque[float] = deque(maxlen=1000)
+        self.granted = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond = asyncio.Condition()
+            self._loop = loop
+            self._queue = []
+            self._in_flight = 0
+        return self._cond
+
+    def _delay(self, tokens: int) -> Optional[float]:
+        """0 → grant now, float → retry after, None → wait for a release."""
+        if self.max_in_flight and self._in_flight >= self.max_in_flight:
+            return None
+        return max(
+            self._requests.delay_for(1),
+            self._tokens.delay_for(tokens),
+            self._output_tokens.delay_for(1),  # output is charged after the call
+        )
+
+    async def acquire(self, tokens: int = 0, priority: Optional[Priority] = None) -> float:
+        """Wait for a slot; returns the queue-wait time in seconds."""
+        cond = self._condition()
+        ticket = (int(_current_priority.get() if priority is None else priority), next(self._seq))
+        started = time.monotonic()
+        async with cond:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    delay = self._delay(tokens) if self._queue[0] == ticket else None
+                    if delay == 0:
+                        break
+                    try:
+                        await asyncio.wait_for(cond.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                cond.notify_all()
+                raise
+            heapq.heappop(self._queue)
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self._in_flight += 1
+            cond.notify_all()
+
+        waited = time.monotonic() - started
+        self.granted += 1
+        self.total_wait_s += waited
+        self.max_wait_s = max(self.max_wait_s, waited)
+        self._waits.append(waited)
+        return waited
+
+    async def release(self, estimate: int = 0, usage: Optional[tuple[int, int]] = None) -> None:
+        """
+        Free the slot. `usage` is the call's (uncached input, output) tokens: the
+        input estimate charged at acquire is replaced by the real input, and the
+        output is charged to the output bucket. Without usage the estimate stands.
+        """
+        cond = self._condition()
+        async with cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            if usage is not None:
+                input_tokens, output_tokens = usage
+                self._tokens.take(input_tokens - estimate)
+                self._output_tokens.take(output_tokens)
+                self.input_tokens += input_tokens
+                self.output_tokens += output_tokens
+            else:
+                self.input_tokens += estimate
+            cond.notify_all()
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+
+        def _pct(p: float) -> float:
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))] * 1000, 2) if waits else 0.0
+
+        return {
+            "max_in_flight": self.max_in_flight,
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "output_tokens_per_minute": self.output_tokens_per_minute,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "in_flight": self._in_flight,
+            "queued": len(self._queue),
+            "granted": self.granted,
+            "queue_wait_ms_avg": round(self.total_wait_s / self.granted * 1000, 2) if self.granted else 0.0,
+            "queue_wait_ms_p50": _pct(0.50),
+            "queue_wait_ms_p95": _pct(0.95),
+            "queue_wait_ms_max": round(self.max_wait_s * 1000, 2),
+        }
+
+
+class RateLimitedChatModel:
+    """Chat-model proxy that runs every call through a ModelLimiter."""
+
+    def __init__(self, model: Any, limiter: ModelLimiter, model_name: Optional[str] = None) -> None:
+        self._model = model
+        self.limiter = limiter
+        self.model_name = model_name or getattr(model, "model", "") or limiter.name
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        estimate = estimate_tokens(input)
+        await self.limiter.acquire(estimate)
+        started = time.perf_counter()
+        result = None
+        try:
+            result = await self._model.ainvoke(input, config, **kwargs)
+            return result
+        finally:
+            usage = getattr(result, "usage_metadata", None) if result is not None else None
+            await self.limiter.release(estimate, rate_limited_tokens(usage))
+            if result is not None:
+                record_model_call(self.model_name, result, time.perf_counter() - started)
+
+    async def astream(self, input: Any, config: Any = None, **kwargs: Any):
+        estimate = estimate_tokens(input)
+        await self.limiter.acquire(estimate)
+        started = time.perf_counter()
+        usage = None
+        try:
+            async for chunk in self._model.astream(input, config, **kwargs):
+                chunk_usage = getattr(chunk, "usage_metadata", None)
+                if chunk_usage:
+                    usage = add_usage(usage, chunk_usage)
+                yield chunk
+        finally:
+            await self.limiter.release(estimate, rate_limited_tokens(usage))
+            if usage is not None:
+                record_model_call(
+                    self.model_name,
+                    SimpleNamespace(usage_metadata=usage),
+                    time.perf_counter() - started,
+                )
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "RateLimitedChatModel":
+        return RateLimitedChatModel(self._model.bind_tools(tools, **kwargs), self.limiter, self.model_name)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._model, name)
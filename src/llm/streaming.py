@@ -0,0 +1,136 @@
+"""
+Per-request token streaming for the final ReAct iteration.
+
+A request handler opens a TokenChannel and runs the graph inside
+stream_to(channel). While a channel is active, _run_react_agent streams each
+iteration and forwards customer-facing text as it arrives:
+- THOUGHT/ACTION/OBSERVATION lines are never forwarded
+- HANDOFF:/ESCALATE: control lines are held back and the stream is reset
+- if the model turns out to be calling tools, already-forwarded text is
+  retracted with a "reset" event
+
+Streamed tokens are provisional. The complete text still goes through output
+guardrails / reflection; the handler closes the channel with a "final" event
+that carries the authoritative response.
+
+Events: {"type": "token", "text"}, {"type": "reset"}, {"type": "final", ...},
+{"type": "error", "detail"}.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Iterator, Optional
+
+_HIDDEN_PREFIXES = ("thought:", "action:", "observation:")
+_CONTROL_PREFIXES = ("handoff:", "escalate:")
+_ALL_PREFIXES = _HIDDEN_PREFIXES + _CONTROL_PREFIXES
+
+
+class TokenChannel:
+    """Queue of stream events for one request."""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[Optional[dict]] = asyncio.Queue()
+        self.closed = False
+
+    def token(self, text: str) -> None:
+        if text and not self.closed:
+            self._queue.put_nowait({"type": "token", "text": text})
+
+    def reset(self) -> None:
+        if not self.closed:
+            self._queue.put_nowait({"type": "reset"})
+
+    def close(self, event: dict) -> None:
+        """Send the terminal event ("final" or "error") and end the stream."""
+        if not self.closed:
+            self.closed = True
+            self._queue.put_nowait(event)
+            self._queue.put_nowait(None)
+
+    async def events(self) -> AsyncIterator[dict]:
+        while True:
+            event = await self._queue.get()
+            if event is None:
+                return
+            yield event
+
+
+_current_channel: ContextVar[Optional[TokenChannel]] = ContextVar("token_channel", default=None)
+
+
+@contextmanager
+def stream_to(channel: TokenChannel) -> Iterator[TokenChannel]:
+    """Stream final agent answers produced inside the block to `channel`."""
+    token = _current_channel.set(channel)
+    try:
+        yield channel
+    finally:
+        _current_channel.reset(token)
+
+
+def current_channel() -> Optional[TokenChannel]:
+    return _current_channel.get()
+
+
+def chunk_text(chunk: Any) -> str:
+    """Text delta of a streamed chunk (str content or Anthropic content blocks)."""
+    content = getattr(chunk, "content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "")
+        for block in content or []
+        if isinstance(block, dict) and block.get("type") == "text"
+    )
+
+
+class CustomerTextFilter:
+    """Line-aware filter that only lets customer-facing text through."""
+
+    def __init__(self) -> None:
+        self._line = ""
+        self._visible: Optional[bool] = None  # None → current line still undecided
+        self.control_seen = False
+
+    def _decide(self, final: bool) -> None:
+        head = self._line.lstrip().lower()
+        if not final and any(p.startswith(head) for p in _ALL_PREFIXES):
+            return  # could still become a marker line
+        if head.startswith(_CONTROL_PREFIXES):
+            self.control_seen = True
+        self._visible = not head.startswith(_ALL_PREFIXES)
+
+    def feed(self, text: str) -> str:
+        out = []
+        for piece in re.split(r"(\n)", text):
+            if not piece:
+                continue
+            if piece == "\n":
+                if self._visible is None:
+                    self._decide(final=True)
+                    if self._visible:
+                        out.append(self._line)
+                if self._visible:
+                    out.append("\n")
+                self._line, self._visible = "", None
+                continue
+            if self._visible is None:
+                self._line += piece
+                self._decide(final=False)
+                if self._visible:
+                    out.append(self._line)
+            elif self._visible:
+                self._line += piece
+                out.append(piece)
+        return "".join(out)
+
+    def flush(self) -> str:
+        if self._visible is None and self._line:
+            self._decide(final=True)
+            return self._line if self._visible else ""
+        return ""
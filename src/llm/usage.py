@@ -0,0 +1,37 @@
+"""
+Token usage helpers for LangChain chat-model results.
+
+Anthropic reports prompt-cache activity in usage_metadata.input_token_details
+(cache_read / cache_creation); input_tokens already includes both.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def cache_usage(result: Any) -> dict:
+    """Input-token breakdown for one call: total, cache_read, cache_creation, uncached."""
+    usage = getattr(result, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    total = int(usage.get("input_tokens") or 0)
+    cache_read = int(details.get("cache_read") or 0)
+    cache_creation = int(details.get("cache_creation") or 0)
+    return {
+        "input_tokens": total,
+        "cache_read": cache_read,
+        "cache_creation": cache_creation,
+        "uncached": max(0, total - cache_read - cache_creation),
+    }
+
+
+def format_cache_usage(result: Any) -> str:
+    """One-line summary for agent_reasoning; empty when the call reported no usage."""
+    usage = cache_usage(result)
+    if not usage["input_tokens"]:
+        return ""
+    return (
+        f"input tokens {usage['input_tokens']} "
+        f"(cached {usage['cache_read']}, cache write {usage['cache_creation']}, "
+        f"uncached {usage['uncached']})"
+    )
@@ -4,13 +4,16 @@ FastAPI application — multi-agent customer support system.
 Endpoints:
   POST /session/start     → Start a new email session
   POST /session/message   → Send a message in an existing session
+  POST /session/message/stream → Same, as server-sent events (tokens, then final)
   GET  /session/{id}/trace → Get session trace
   GET  /sessions          → List past sessions (history)
   GET  /health            → Health check
+  GET  /metrics           → Performance counters (caches, limiter, per-day model usage)
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import uuid
 import re
@@ -20,13 +23,36 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 
+from src.agents.customer_context import customer_prefetch
+from src.agents.escalation import escalation_queue
+from src.agents.model_router import model_router_stats
+from src.agents.react_budget import react_budget_stats
+from src.agents.tool_memo import tool_memo_stats
 from src.graph.graph_builder import compile_graph
 from src.tracing.models import build_session_trace
-from src.config import set_time_override, clear_time_override
+from src.config import (
+    FUSED_PRE_ROUTING,
+    LLM_CASSETTE_MODE,
+    cassette_store,
+    clear_time_override,
+    haiku_limiter,
+    haiku_llm,
+    set_time_override,
+    sonnet_limiter,
+    sonnet_llm,
+)
+from src.llm.accounting import model_call_ledger
+from src.llm.hedging import HedgedChatModel
+from src.llm.streaming import TokenChannel, stream_to
+from src.patterns.fast_path import fast_path_stats
+from src.patterns.intent_cache import intent_cache
+from src.patterns.reflection_rules import reflection_stats
+from src.tools.compaction import tool_compaction_stats
 from src import database  # <--- Persistence module
 
 # ── Global Graph (Initialized in lifespan) ──────────────────────────────────
@@ -66,6 +92,29 @@ def _is_workspace_usage_limit_error(exc: Exception) -> tuple[bool, str | None]:
             return True, _extract_workspace_limit_reset_at(msg)
     return False, None
 
+
+_ESCALATION_DRAIN_SECONDS = 10.0
+_CHECKPOINT_WAIT_ATTEMPTS = 25
+_CHECKPOINT_WAIT_SECONDS = 0.2
+
+
+async def _persist_escalation_update(config: dict, update: dict) -> None:
+    """
+    Write a finished escalation summary into the session checkpoint.
+    Waits until the escalating turn itself is checkpointed, so the update
+    lands on top of it instead of being overwritten by it.
+    """
+    escalation_id = update["escalation_payload"]["escalation_id"]
+    for _ in range(_CHECKPOINT_WAIT_ATTEMPTS):
+        snapshot = await graph.aget_state(config)
+        stored = ((snapshot.values if snapshot else None) or {}).get("escalation_payload") or {}
+        if stored.get("escalation_id") == escalation_id:
+            await graph.aupdate_state(config, update, as_node="escalation_handler")
+            return
+        await asyncio.sleep(_CHECKPOINT_WAIT_SECONDS)
+    raise TimeoutError("escalating turn was never checkpointed")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -81,9 +130,13 @@ async def lifespan(app: FastAPI):
     # from_conn_string uses aiosqlite internally
     async with AsyncSqliteSaver.from_conn_string("history.db") as checkpointer:
         global graph
-        graph = compile_graph(checkpointer)
+        graph = compile_graph(checkpointer, fused_pre_routing=FUSED_PRE_ROUTING)
+        escalation_queue.set_persister(_persist_escalation_update)
         print("✅ Graph compiled with AsyncSqliteSaver connected to history.db")
         yield
+        # Let in-flight escalation summaries reach the checkpoint before it closes.
+        await escalation_queue.drain(timeout=_ESCALATION_DRAIN_SECONDS)
+        escalation_queue.set_persister(None)
         print("🛑 Graph checkpointer closed")
 
 app = FastAPI(
@@ -158,6 +211,32 @@ async def health():
     return {"status": "ok", "version": "3.0"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Performance counters for caches and model usage."""
+    return {
+        "intent_cache": intent_cache.stats(),
+        "llm_limiter": {
+            "sonnet": sonnet_limiter.stats(),
+            "haiku": haiku_limiter.stats(),
+        },
+        "llm_hedging": {
+            name: llm.stats()
+            for name, llm in (("sonnet", sonnet_llm), ("haiku", haiku_llm))
+            if isinstance(llm, HedgedChatModel)
+        },
+        "model_calls": model_call_ledger.stats(),
+        "reflection": reflection_stats.stats(),
+        "fast_path": fast_path_stats.stats(),
+        "agent_model_routing": model_router_stats.stats(),
+        "tool_compaction": tool_compaction_stats.stats(),
+        "customer_prefetch": customer_prefetch.stats(),
+        "tool_memo": tool_memo_stats.stats(),
+        "react_budget": react_budget_stats.stats(),
+        "llm_cassette": {"mode": LLM_CASSETTE_MODE, **cassette_store.stats()},
+    }
+
+
 @app.post("/session/start", response_model=SessionStartResponse)
 async def start_session(req: SessionStartRequest):
     """Start a new customer support email session."""
@@ -174,7 +253,10 @@ async def start_session(req: SessionStartRequest):
         "created_at": created_at,
     }
 
-    # 2. Store in SQLite (for sidebar history)
+    # 2. Look up orders / subscriptions while the customer writes the first message
+    customer_prefetch.start(session_id, req.email)
+
+    # 3. Store in SQLite (for sidebar history)
     database.add_session(
         session_id=session_id,
         email=req.email,
@@ -188,12 +270,8 @@ async def start_session(req: SessionStartRequest):
     )
 
 
-@app.post("/session/message", response_model=MessageResponse)
-async def send_message(req: MessageRequest):
-    """Send a customer message and get an agent response."""
-    if graph is None:
-        raise HTTPException(503, "Graph not initialized")
-
+async def _prepare_turn(req: MessageRequest) -> tuple[dict, dict]:
+    """Graph config + input state for one customer message."""
     # Try to get from memory first
     session = sessions.get(req.session_id)
     
@@ -216,6 +294,10 @@ async def send_message(req: MessageRequest):
         "customer_last_name": session["customer_last_name"],
         "customer_shopify_id": session["customer_shopify_id"],
     }
+    # First turn only: orders / subscriptions prefetched at /session/start.
+    # Later turns clear them so agents never act on a session-start snapshot.
+    input_state.update({"order_details": None, "subscription_status": None})
+    input_state.update(await customer_prefetch.take(req.session_id))
 
     # Update preview in DB (async, best effort)
     try:
@@ -223,32 +305,29 @@ async def send_message(req: MessageRequest):
     except Exception:
         pass
 
-    # Invoke graph (State is automatically loaded/saved via AsyncSqliteSaver)
-    try:
-        result = await graph.ainvoke(input_state, config=config)
-    except Exception as e:
-        is_limit, reset_at = _is_workspace_usage_limit_error(e)
-        if is_limit:
-            reset_hint = f" after {reset_at}" if reset_at else " after the provider reset window"
-            return MessageResponse(
-                session_id=req.session_id,
-                response=(
-                    "Our AI provider workspace quota is currently exhausted. "
-                    f"Please try again{reset_hint}. "
-                    "If this is urgent, contact a human support agent."
-                ),
-                is_escalated=False,
-                actions_taken=["LLM_UNAVAILABLE_WORKSPACE_LIMIT"],
-                agent="system_unavailable",
-                intent="GENERAL",
-                intent_confidence=0,
-                was_revised=False,
-                intent_shifted=False,
-            )
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(500, f"Graph execution failed: {e}")
+    return config, input_state
+
+
+def _workspace_limit_response(session_id: str, reset_at: str | None) -> MessageResponse:
+    reset_hint = f" after {reset_at}" if reset_at else " after the provider reset window"
+    return MessageResponse(
+        session_id=session_id,
+        response=(
+            "Our AI provider workspace quota is currently exhausted. "
+            f"Please try again{reset_hint}. "
+            "If this is urgent, contact a human support agent."
+        ),
+        is_escalated=False,
+        actions_taken=["LLM_UNAVAILABLE_WORKSPACE_LIMIT"],
+        agent="system_unavailable",
+        intent="GENERAL",
+        intent_confidence=0,
+        was_revised=False,
+        intent_shifted=False,
+    )
 
+
+def _message_response(session_id: str, result: dict) -> MessageResponse:
     # Extract final AI response
     final_response = ""
     for m in reversed(result.get("messages", [])):
@@ -257,7 +336,7 @@ async def send_message(req: MessageRequest):
             break
 
     return MessageResponse(
-        session_id=req.session_id,
+        session_id=session_id,
         response=final_response,
         is_escalated=result.get("is_escalated", False),
         actions_taken=result.get("actions_taken", []),
@@ -269,6 +348,69 @@ async def send_message(req: MessageRequest):
     )
 
 
+@app.post("/session/message", response_model=MessageResponse)
+async def send_message(req: MessageRequest):
+    """Send a customer message and get an agent response."""
+    if graph is None:
+        raise HTTPException(503, "Graph not initialized")
+
+    config, input_state = await _prepare_turn(req)
+
+    # Invoke graph (State is automatically loaded/saved via AsyncSqliteSaver)
+    try:
+        result = await graph.ainvoke(input_state, config=config)
+    except Exception as e:
+        is_limit, reset_at = _is_workspace_usage_limit_error(e)
+        if is_limit:
+            return _workspace_limit_response(req.session_id, reset_at)
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(500, f"Graph execution failed: {e}")
+
+    return _message_response(req.session_id, result)
+
+
+@app.post("/session/message/stream")
+async def send_message_stream(req: MessageRequest):
+    """
+    Same as /session/message, streamed as server-sent events.
+    "token" events carry the agent's answer as it is generated (provisional;
+    "reset" retracts them). The "final" event carries the MessageResponse after
+    output guardrails / reflection and is the authoritative reply.
+    """
+    if graph is None:
+        raise HTTPException(503, "Graph not initialized")
+
+    config, input_state = await _prepare_turn(req)
+    channel = TokenChannel()
+
+    async def _run_turn() -> None:
+        with stream_to(channel):
+            try:
+                result = await graph.ainvoke(input_state, config=config)
+                response = _message_response(req.session_id, result)
+            except Exception as e:
+                is_limit, reset_at = _is_workspace_usage_limit_error(e)
+                if not is_limit:
+                    import traceback
+                    traceback.print_exc()
+                    channel.close({"type": "error", "detail": f"Graph execution failed: {e}"})
+                    return
+                response = _workspace_limit_response(req.session_id, reset_at)
+            channel.close({"type": "final", **response.model_dump()})
+
+    # The turn runs to completion even if the client disconnects, so the
+    # checkpointed session state stays consistent.
+    task = asyncio.create_task(_run_turn())
+
+    async def _events():
+        async for event in channel.events():
+            yield f"data: {json.dumps(event)}\n\n"
+        await task
+
+    return StreamingResponse(_events(), media_type="text/event-stream")
+
+
 @app.get("/session/{session_id}/trace", response_model=TraceResponse)
 async def get_trace(session_id: str):
     """Get the full session trace for observability."""
@@ -282,6 +424,13 @@ async def get_trace(session_id: str):
         state_snapshot = await graph.aget_state(config)
         state = state_snapshot.values if state_snapshot else {}
 
+        # The summary is written to the checkpoint when it lands; until then
+        # (or if that write failed) the queue has the newer copy.
+        payload = state.get("escalation_payload") or {}
+        queued = escalation_queue.get(payload.get("escalation_id", ""))
+        if queued:
+            state = {**state, "escalation_payload": queued}
+
         trace = build_session_trace(session_id, state)
 
         return TraceResponse(session_id=session_id, trace=trace.model_dump())
@@ -291,6 +440,12 @@ async def get_trace(session_id: str):
         raise HTTPException(status_code=500, detail=f"Trace error: {str(e)}")
 
 
+@app.get("/escalations")
+async def list_escalations():
+    """Escalation payloads queued for Monica (summaries fill in asynchronously)."""
+    return escalation_queue.list()
+
+
 @app.get("/sessions", response_model=List[SessionListItem])
 async def list_past_sessions(email: Optional[str] = None):
     """List all available chat sessions from history."""
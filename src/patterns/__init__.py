@@ -4,6 +4,7 @@ Agent patterns for the multi-agent system.
 - Guardrails: Input/output validation, PII redaction, safety checks
 - Handoff: Cross-agent routing
 - Intent Classifier: 2-stage classification with confidence scoring
+- Intent Cache: LRU+TTL cache of classifications keyed by normalized message
 - Reflection: Quality validation and revision
 """
 
@@ -13,8 +14,10 @@ from src.patterns.guardrails import (
     tool_call_guardrails,
 )
 from src.patterns.handoff import handoff_router_node
+from src.patterns.intent_cache import IntentCache, intent_cache, normalize_message
 from src.patterns.intent_classifier import (
     classify_intent,
+    classify_intents,
     intent_classifier_node,
     intent_shift_check_node,
     route_by_confidence,
@@ -34,10 +37,14 @@ __all__ = [
     "handoff_router_node",
     # Intent Classification
     "classify_intent",
+    "classify_intents",
     "intent_classifier_node",
     "intent_shift_check_node",
     "route_by_confidence",
     "route_after_shift_check",
+    "IntentCache",
+    "intent_cache",
+    "normalize_message",
     # Reflection
     "reflection_validator_node",
     "revise_response_node",
@@ -0,0 +1,247 @@
+"""
+Template fast-path for tool-free intents.
+
+Pure positive feedback (and the yes/no to its review request) and bare
+greetings need no tools and no reasoning, yet would otherwise pay for a
+Sonnet ReAct loop (account_agent) or a supervisor call. When the classifier
+is confident enough (FAST_PATH_MIN_CONFIDENCE, per intent) and the message
+is unambiguous, fast_path_node answers from a template instead: Caz persona,
+customer's first name, workflow-manual wording. Anything mixed (a question,
+a complaint, an order reference) falls through to the normal agents.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+import time
+from typing import Optional
+
+from langchain_core.messages import AIMessage
+
+from src.config import FAST_PATH_ENABLED, FAST_PATH_MIN_CONFIDENCE
+
+# ─── Templates ──────────────────────────────────────────────────────────────
+
+_REVIEW_ASK = "would you mind if I send you a feedback request"
+_REVIEW_LINK = "https://trustpilot.com/evaluate/naturalpatch.com"
+_REVIEW_DECLINED = "Just knowing you're happy makes our day!"
+
+TEMPLATES: dict[str, str] = {
+    "positive_feedback": (
+        "Awww 🥰 {first_name}!\n\n"
+        "That is so amazing! 🙏 Thank you for that epic feedback!\n\n"
+        "If it's okay with you, " + _REVIEW_ASK + " so you can share your "
+        "thoughts on NATPAT and our response overall?\n\n"
+        "It's totally fine if you don't have the time, but I thought I'd ask "
+        "before sending a feedback request email 😊\n\n"
+        "Caz"
+    ),
+    "review_link": (
+        "Awwww, thank you! ❤️\n\n"
+        "Here's the link to the review page: " + _REVIEW_LINK + "\n\n"
+        "Thanks so much! 🙏\n\n"
+        "Caz xx"
+    ),
+    "review_declined": (
+        "No problem at all, {first_name}! " + _REVIEW_DECLINED + " 😊\n\n"
+        "Caz xx"
+    ),
+    "closing": "You're so welcome, {first_name}! Have a lovely day 💛\n\nCaz xx",
+    "greeting": "Hey {first_name}! Thanks for reaching out. How can I help you today? 💛\n\nCaz",
+}
+
+# Agent that owns the conversation after each template (for later turns).
+_TEMPLATE_AGENT = {
+    "positive_feedback": "account_agent",
+    "review_link": "account_agent",
+    "review_declined": "account_agent",
+    "closing": "account_agent",
+    "greeting": "supervisor",
+}
+
+# ─── Matching ───────────────────────────────────────────────────────────────
+
+_CLEAN_RE = re.compile(r"[^a-z0-9'\s]")
+_GREETING_RE = re.compile(
+    r"^(hi+|hello+|hey+|hiya|howdy|good (morning|afternoon|evening))"
+    r"( there| caz| team| natpat| everyone| all)?$"
+)
+# Anything that hints at a need beyond "thank you" keeps the agent path.
+_NEED_RE = re.compile(
+    r"\?|#\d|\b(where|when|why|how|help|code|address|skip|pause|rash|itch|hives)\b|"
+    r"\b(refund|cancel|return|exchang|order|ship|deliver|track|wrong|missing|broke|problem|"
+    r"issue|subscri|discount|charg|bill|allerg|reaction)\w*",
+    re.IGNORECASE,
+)
+_NEGATION_RE = re.compile(
+    r"\b(but|however|although|though|except|unfortunately|not|no|never|"
+    r"didn't|doesn't|don't|won't|isn't|wasn't|can't|cannot)\b",
+    re.IGNORECASE,
+)
+_MAX_POSITIVE_WORDS = 60
+_YES_RE = re.compile(r"^(yes|yeah|yep|yup|sure|ok|okay|of course|absolutely|definitely|go ahead|please do)\b")
+_NO_RE = re.compile(r"^(no|nope|nah|not really|no thanks|no thank you|maybe later|i'?m ok|i'?m good)\b")
+
+
+def _clean(text: str) -> str:
+    return " ".join(_CLEAN_RE.sub(" ", (text or "").lower()).split())
+
+
+def _is_bare_greeting(text: str) -> bool:
+    return bool(_GREETING_RE.match(_clean(text)))
+
+
+def _is_pure_positive(text: str) -> bool:
+    return (
+        bool(text.strip())
+        and len(text.split()) <= _MAX_POSITIVE_WORDS
+        and not _NEED_RE.search(text)
+        and not _NEGATION_RE.search(text)
+    )
+
+
+def _review_reply(text: str) -> Optional[str]:
+    cleaned = _clean(text)
+    if len(cleaned.split()) > 8 or _NEED_RE.search(text):
+        return None
+    if _NO_RE.match(cleaned):
+        return "review_declined"
+    if _YES_RE.match(cleaned):
+        return "review_link"
+    return None
+
+
+def _last_message(state: dict, kind: str):
+    for message in reversed(state.get("messages") or []):
+        if getattr(message, "type", None) == kind:
+            return message
+    return None
+
+
+def _review_already_handled(state: dict) -> bool:
+    """An earlier AI message already asked for a review, sent the link or took the no."""
+    return any(
+        getattr(message, "type", None) == "ai"
+        and any(marker in str(message.content) for marker in (_REVIEW_ASK, _REVIEW_LINK, _REVIEW_DECLINED))
+        for message in state.get("messages") or []
+    )
+
+
+def _confident(state: dict) -> bool:
+    threshold = FAST_PATH_MIN_CONFIDENCE.get(state.get("ticket_category") or "")
+    return threshold is not None and int(state.get("intent_confidence") or 0) >= threshold
+
+
+def match_fast_path(state: dict) -> Optional[str]:
+    """Template key for this turn, or None to take the normal agent path."""
+    if not FAST_PATH_ENABLED or not _confident(state):
+        return None
+    customer = _last_message(state, "human")
+    text = customer.content if customer is not None and isinstance(customer.content, str) else ""
+    intent = state.get("ticket_category")
+
+    if intent == "POSITIVE":
+        previous = _last_message(state, "ai")
+        if previous is not None and _REVIEW_ASK in str(previous.content):
+            return _review_reply(text)
+        if not _is_pure_positive(text):
+            return None
+        # Never ask for a review twice: a later "thank you" just gets a closing.
+        return "closing" if _review_already_handled(state) else "positive_feedback"
+    if intent == "GENERAL" and _is_bare_greeting(text):
+        return "greeting"
+    return None
+
+
+# ─── Node ───────────────────────────────────────────────────────────────────
+
+
+async def fast_path_node(state: dict) -> dict:
+    """Answer from a template (no LLM, no tools)."""
+    started = time.perf_counter()
+    template = match_fast_path(state) or "greeting"
+    content = TEMPLATES[template].format(first_name=state.get("customer_first_name") or "there")
+    fast_path_stats.record_hit(state.get("ticket_category") or "GENERAL", time.perf_counter() - started)
+    return {
+        "messages": [AIMessage(content=content)],
+        "current_agent": _TEMPLATE_AGENT[template],
+        "agent_reasoning": [
+            f"FAST PATH: {template} template "
+            f"({state.get('ticket_category')} @ {state.get('intent_confidence')}%, no LLM)"
+        ],
+    }
+
+
+# ─── Stats ──────────────────────────────────────────────────────────────────
+
+
+class FastPathStats:
+    """
+    Fast-path hit rate per intent, and latency saved: hits × the mean time the
+    replaced agent node took for the same intent when the template didn't apply.
+    """
+
+    def __init__(self) -> None:
+        self.eligible: dict[str, int] = {}
+        self.hits: dict[str, int] = {}
+        self.fast_s: dict[str, float] = {}
+        self.slow_s: dict[str, float] = {}
+        self.slow_turns: dict[str, int] = {}
+
+    def record_eligible(self, intent: str) -> None:
+        self.eligible[intent] = self.eligible.get(intent, 0) + 1
+
+    def record_hit(self, intent: str, seconds: float) -> None:
+        self.hits[intent] = self.hits.get(intent, 0) + 1
+        self.fast_s[intent] = self.fast_s.get(intent, 0.0) + seconds
+
+    def record_slow(self, intent: str, seconds: float) -> None:
+        self.slow_turns[intent] = self.slow_turns.get(intent, 0) + 1
+        self.slow_s[intent] = self.slow_s.get(intent, 0.0) + seconds
+
+    def stats(self) -> dict:
+        by_intent = {}
+        for intent in sorted(set(self.eligible) | set(self.hits)):
+            eligible = self.eligible.get(intent, 0)
+            hits = self.hits.get(intent, 0)
+            slow_turns = self.slow_turns.get(intent, 0)
+            slow_ms = self.slow_s.get(intent, 0.0) * 1000 / slow_turns if slow_turns else None
+            fast_ms = self.fast_s.get(intent, 0.0) * 1000 / hits if hits else 0.0
+            by_intent[intent] = {
+                "eligible": eligible,
+                "hits": hits,
+                "hit_rate": round(hits / eligible, 3) if eligible else 0.0,
+                "agent_path_ms": round(slow_ms, 1) if slow_ms is not None else None,
+                "saved_ms_est": round(hits * (slow_ms - fast_ms), 1) if slow_ms is not None else None,
+            }
+        return {
+            "enabled": FAST_PATH_ENABLED,
+            "min_confidence": dict(FAST_PATH_MIN_CONFIDENCE),
+            "by_intent": by_intent,
+        }
+
+
+fast_path_stats = FastPathStats()
+
+
+def route_fast_path(route: str, state: dict) -> str:
+    """Divert a classifier route to the fast path when a template applies."""
+    intent = state.get("ticket_category") or ""
+    if intent not in FAST_PATH_MIN_CONFIDENCE or not FAST_PATH_ENABLED:
+        return route
+    fast_path_stats.record_eligible(intent)
+    return "fast_path" if match_fast_path(state) else route
+
+
+def measure_agent_path(node):
+    """Time agent turns for fast-path intents that took the LLM path (baseline)."""
+    @functools.wraps(node)
+    async def wrapper(state, *args, **kwargs):
+        started = time.perf_counter()
+        output = await node(state, *args, **kwargs)
+        intent = state.get("ticket_category") or ""
+        if intent in FAST_PATH_MIN_CONFIDENCE:
+            fast_path_stats.record_slow(intent, time.perf_counter() - started)
+        return output
+    return wrapper
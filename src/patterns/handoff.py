@@ -57,6 +57,7 @@ def handoff_router_node(state: dict) -> dict:
             "handoff_target": target,
             "current_agent": target,
             "handoff_count_this_turn": count + 1,
+            "handoff_note": f"{state.get('current_agent', '?')} → {target}: {reason or 'no reason given'}",
             "agent_reasoning": [
                 f"HANDOFF: {state.get('current_agent', '?')} -> {target} ({reason})"
             ],
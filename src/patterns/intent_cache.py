@@ -0,0 +1,174 @@
+"""
+Intent classification cache.
+
+Many inbound emails are near-identical ("where is my order", "cancel my
+subscription"), so classify_intent() results are cached under a normalized
+form of the message:
+- lowercased, punctuation stripped, whitespace collapsed
+- emails and order numbers masked (so "#43189" and "#51234" share a key)
+
+In-memory LRU + TTL, optionally persisted to SQLite so the cache survives
+restarts and is shared between workers.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.config import (
+    INTENT_CACHE_DB_PATH,
+    INTENT_CACHE_SIZE,
+    INTENT_CACHE_TTL_SECONDS,
+)
+
+
+# ─── Normalization ──────────────────────────────────────────────────────────
+
+_EMAIL_RE = re.compile(r"\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b")
+_REDACTED_RE = re.compile(r"\[[a-z ]+redacted\]")
+_ORDER_RE = re.compile(r"(?:#|\b)(?:np)?\d{3,}\b")
+_PUNCT_RE = re.compile(r"[^\w\s<>]")
+
+
+def normalize_message(message: str) -> str:
+    """Return the cache key for a customer message."""
+    text = (message or "").lower()
+    text = _EMAIL_RE.sub(" <email> ", text)
+    text = _REDACTED_RE.sub(" <redacted> ", text)
+    text = _ORDER_RE.sub(" <order> ", text)
+    text = _PUNCT_RE.sub(" ", text)
+    return " ".join(text.split())
+
+
+# ─── Cache ──────────────────────────────────────────────────────────────────
+
+class IntentCache:
+    """LRU + TTL cache of (intent, confidence) keyed by normalized message."""
+
+    def __init__(
+        self,
+        max_size: int = 2048,
+        ttl_seconds: float = 86400,
+        db_path: Optional[str] = None,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._entries: OrderedDict[str, tuple[str, int, float]] = OrderedDict()
+        self._db_ready = False
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ── SQLite persistence (optional) ──────────────────────────────────
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10.0)
+        if not self._db_ready:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS intent_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    intent TEXT,
+                    confidence INTEGER,
+                    created_at REAL
+                )
+            """)
+            conn.commit()
+            self._db_ready = True
+        return conn
+
+    def _load(self, key: str) -> Optional[tuple[str, int, float]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT intent, confidence, created_at FROM intent_cache WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+        finally:
+            conn.close()
+        return (row[0], int(row[1]), float(row[2])) if row else None
+
+    def _store(self, key: str, entry: tuple[str, int, float]) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO intent_cache (cache_key, intent, confidence, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, *entry),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def _is_fresh(self, entry: tuple[str, int, float]) -> bool:
+        return (time.time() - entry[2]) < self.ttl_seconds
+
+    def get(self, message: str) -> Optional[tuple[str, int]]:
+        """Return cached (intent, confidence) or None."""
+        key = normalize_message(message)
+        if not key:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None and not self._is_fresh(entry):
+            del self._entries[key]
+            entry = None
+
+        if entry is None and self.db_path:
+            entry = self._load(key)
+            if entry is not None and self._is_fresh(entry):
+                self.disk_hits += 1
+                self._remember(key, entry)
+            else:
+                entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0], entry[1]
+
+    def put(self, message: str, intent: str, confidence: int) -> None:
+        """Cache a classification result."""
+        key = normalize_message(message)
+        if not key:
+            return
+        entry = (intent, int(confidence), time.time())
+        self._remember(key, entry)
+        if self.db_path:
+            self._store(key, entry)
+
+    def _remember(self, key: str, entry: tuple[str, int, float]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop in-memory entries and reset counters (persisted rows are kept)."""
+        self._entries.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "persistent": bool(self.db_path),
+        }
+
+
+intent_cache = IntentCache(
+    max_size=INTENT_CACHE_SIZE,
+    ttl_seconds=INTENT_CACHE_TTL_SECONDS,
+    db_path=INTENT_CACHE_DB_PATH or None,
+)
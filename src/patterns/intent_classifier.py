@@ -1,9 +1,11 @@
 """
 2-Stage Intent Classification + Multi-Turn Intent Shift Detection.
 
-Stage 1: Haiku classifies intent with confidence score.
+Stage 1: Haiku classifies intent with confidence score (cached by normalized message).
 Stage 2: Deterministic code routes to agent (or supervisor fallback).
 Multi-turn: Haiku re-classifies to detect intent shifts.
+Bulk: classify_intents() packs many messages into one indexed Haiku prompt.
+Speculative: the turn's classification starts with the turn, overlapping input guardrails.
 
 Updates:
 - Robust parsing: supports "INTENT|85" OR JSON {"intent": "...", "confidence": 85}
@@ -14,18 +16,33 @@ Updates:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import re
+import time
+from dataclasses import dataclass
 from typing import Any, Tuple
 
 from src.config import (
     CONFIDENCE_THRESHOLD,
+    INTENT_BATCH_CONCURRENCY,
+    INTENT_BATCH_SIZE,
+    INTENT_CACHE_ENABLED,
     INTENT_SHIFT_THRESHOLD,
     INTENT_TO_AGENT,
+    SPECULATIVE_INTENT_ENABLED,
     VALID_INTENTS,
     haiku_llm,
 )
-from src.prompts.intent_classifier_prompt import INTENT_CLASSIFIER_PROMPT
+from src.llm.accounting import model_call_scope, track_model_calls
+from src.llm.hedging import LLMDeadlineExceeded
+from src.llm.limiter import Priority, llm_priority
+from src.patterns.guardrails import sanitize_customer_text
+from src.patterns.intent_cache import intent_cache
+from src.prompts.intent_classifier_prompt import (
+    BATCH_INTENT_CLASSIFIER_PROMPT,
+    INTENT_CLASSIFIER_PROMPT,
+)
 
 
 # ─── Helpers ────────────────────────────────────────────────────────────────
@@ -65,6 +82,30 @@ def _parse_classifier_output(text: str) -> Tuple[str, int]:
     return intent, confidence
 
 
+_BATCH_LINE_RE = re.compile(r"^\s*\[?(\d+)\]?\s*[|:.)-]?\s*(.+)$")
+
+
+def _parse_batch_output(text: str, count: int) -> dict[int, Tuple[str, int]]:
+    """
+    Parse "INDEX|INTENT|CONF" lines (1-based) into {0-based index: (intent, conf)}.
+    Each line's remainder goes through _parse_classifier_output, so the same
+    pipe/JSON rules apply. Missing, duplicate or invalid items are left out.
+    """
+    parsed: dict[int, Tuple[str, int]] = {}
+    raw = (text or "").replace("```", "")
+    for line in raw.splitlines():
+        match = _BATCH_LINE_RE.match(line)
+        if not match:
+            continue
+        idx = int(match.group(1)) - 1
+        if not 0 <= idx < count or idx in parsed:
+            continue
+        intent, confidence = _parse_classifier_output(match.group(2))
+        if intent in VALID_INTENTS:
+            parsed[idx] = (intent, confidence)
+    return parsed
+
+
 _ACK_RE = re.compile(r"[^a-z0-9\s]")
 _SHORT_ACKS: set[str] = {
     "yes",
@@ -101,7 +142,7 @@ def _is_short_acknowledgement(message: str) -> bool:
 
 # ─── Core Classifier ────────────────────────────────────────────────────────
 
-async def classify_intent(message: str, *, strict: bool = False) -> tuple[str, int]:
+async def classify_with_llm(message: str, *, strict: bool = False) -> tuple[str, int]:
     """
     Run Haiku to classify intent + confidence.
     If haiku_llm is unavailable:
@@ -129,21 +170,224 @@ async def classify_intent(message: str, *, strict: bool = False) -> tuple[str, i
     return intent, confidence
 
 
+async def classify_intent(message: str, *, strict: bool = False) -> tuple[str, int]:
+    """
+    Classify intent + confidence, cheapest source first:
+      1. intent_cache (repeat phrasings, no LLM call)
+      2. Haiku via classify_with_llm (result cached)
+    A Haiku deadline miss returns ("GENERAL", 50) uncached (→ supervisor) unless strict.
+    """
+    if INTENT_CACHE_ENABLED:
+        cached = intent_cache.get(message)
+        if cached is not None:
+            return cached
+
+    try:
+        intent, confidence = await classify_with_llm(message, strict=strict)
+    except LLMDeadlineExceeded:
+        if strict:
+            raise
+        return "GENERAL", 50
+    if INTENT_CACHE_ENABLED and haiku_llm is not None and intent in VALID_INTENTS:
+        intent_cache.put(message, intent, confidence)
+    return intent, confidence
+
+
+_BATCH_MESSAGE_CHARS = 1000
+
+
+async def _classify_one(message: str) -> tuple[str, int] | None:
+    """Single-message fallback inside a bulk job (None when the call fails)."""
+    try:
+        return await classify_with_llm(message, strict=True)
+    except Exception:  # noqa: BLE001 — one message must not fail the bulk job
+        return None
+
+
+async def _classify_batch(messages: list[str]) -> list[tuple[str, int] | None]:
+    """
+    One Haiku call for a batch. Items the reply leaves out, or the whole batch when
+    the call itself fails (deadline, API error), fall back to single-message calls;
+    None marks a message that could not be classified at all.
+    """
+    numbered = "\n".join(
+        f"[{i}] {' '.join(m.split())[:_BATCH_MESSAGE_CHARS]}"
+        for i, m in enumerate(messages, start=1)
+    )
+    try:
+        result = await haiku_llm.ainvoke(BATCH_INTENT_CLASSIFIER_PROMPT.format(messages=numbered))
+        parsed: dict[int, tuple[str, int] | None] = dict(
+            _parse_batch_output(getattr(result, "content", ""), len(messages))
+        )
+    except Exception:  # noqa: BLE001 — classify this batch's messages one by one
+        parsed = {}
+
+    missing = [i for i in range(len(messages)) if i not in parsed]
+    fallbacks = await asyncio.gather(*(_classify_one(messages[i]) for i in missing))
+    parsed.update(zip(missing, fallbacks))
+    return [parsed[i] for i in range(len(messages))]
+
+
+async def classify_intents(
+    messages: list[str],
+    *,
+    batch_size: int = INTENT_BATCH_SIZE,
+    max_concurrency: int = INTENT_BATCH_CONCURRENCY,
+) -> list[tuple[str, int]]:
+    """
+    Classify many messages with far fewer Haiku requests than classify_intent.
+    Cache hits are resolved first; the rest are packed
+    batch_size per prompt and run at most max_concurrency batches at a time,
+    at BACKGROUND priority so live conversations are served first. A failed
+    batch falls back per message, so it never loses the batches that succeeded.
+    Returns (intent, confidence) per message, in input order.
+    """
+    results: list[tuple[str, int] | None] = [None] * len(messages)
+    pending: list[int] = []
+    for i, message in enumerate(messages):
+        results[i] = intent_cache.get(message) if INTENT_CACHE_ENABLED else None
+        if results[i] is None:
+            pending.append(i)
+
+    if pending and haiku_llm is None:
+        for i in pending:
+            results[i] = ("GENERAL", 50)
+        pending = []
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _run(indices: list[int]) -> None:
+        async with semaphore:
+            with llm_priority(Priority.BACKGROUND):
+                batch = await _classify_batch([messages[i] for i in indices])
+        for i, classified in zip(indices, batch):
+            # Unclassifiable messages get the uncached GENERAL/50 fallback (→ supervisor).
+            results[i] = classified or ("GENERAL", 50)
+            if classified is not None and INTENT_CACHE_ENABLED:
+                intent_cache.put(messages[i], *classified)
+
+    size = max(1, batch_size)
+    await asyncio.gather(*(_run(pending[k:k + size]) for k in range(0, len(pending), size)))
+    return results
+
+
+# ─── Speculative Classification ─────────────────────────────────────────────
+# escalation_lock_node starts the turn's classification before input guardrails
+# run; intent_classifier / intent_shift_check pick up the result, and blocked or
+# auto-escalated turns cancel it via discard_speculative_classification.
+
+_SPECULATION_TTL_S = 120.0
+
+
+@dataclass
+class _Speculation:
+    raw: str
+    text: str
+    task: asyncio.Task
+    calls: list[dict]
+    started: float
+
+
+_speculations: dict[str, _Speculation] = {}
+
+
+def _human_count(messages: list) -> int:
+    return sum(1 for m in messages if getattr(m, "type", None) == "human")
+
+
+def _expire_speculations() -> None:
+    cutoff = time.monotonic() - _SPECULATION_TTL_S
+    for message_id, spec in list(_speculations.items()):
+        if spec.started < cutoff:
+            spec.task.cancel()
+            del _speculations[message_id]
+
+
+def start_speculative_classification(state: dict) -> bool:
+    """
+    Start classify_intent for the turn's customer message without awaiting it.
+    Classifies the guardrail-sanitised text (same text the node would see, no raw
+    PII) and skips turns whose node would not classify. Returns True if running.
+    """
+    if not SPECULATIVE_INTENT_ENABLED:
+        return False
+    messages = state.get("messages") or []
+    message = messages[-1] if messages else None
+    message_id = getattr(message, "id", None)
+    raw = getattr(message, "content", None)
+    if not message_id or getattr(message, "type", None) != "human" or not isinstance(raw, str):
+        return False
+
+    _expire_speculations()
+    if message_id in _speculations:
+        return True
+
+    text, _ = sanitize_customer_text(raw)
+    if len(" ".join(text.split())) < 3:
+        return False
+    multi_turn = _human_count(messages) > 1
+    if multi_turn and _is_short_acknowledgement(text):
+        return False
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    node = "intent_shift_check" if multi_turn else "intent_classifier"
+    with model_call_scope(node) as calls:
+        task = loop.create_task(classify_intent(text))
+    _speculations[message_id] = _Speculation(raw, text, task, calls, time.monotonic())
+    return True
+
+
+def discard_speculative_classification(state: dict) -> None:
+    """Cancel the turn's speculative classification (route does not need it)."""
+    messages = state.get("messages") or []
+    message_id = getattr(messages[-1], "id", None) if messages else None
+    spec = _speculations.pop(message_id, None) if message_id else None
+    if spec is not None:
+        spec.task.cancel()
+
+
+async def _classify_turn_message(message: Any) -> tuple[tuple[str, int], list[dict]]:
+    """
+    classify_intent for the turn's message, reusing a matching speculative run.
+    Returns ((intent, confidence), model calls made by the speculative run).
+    """
+    content = message.content
+    message_id = getattr(message, "id", None)
+    spec = _speculations.pop(message_id, None) if message_id else None
+    if spec is None:
+        return await classify_intent(content), []
+    if content in (spec.raw, spec.text) and not spec.task.cancelled():
+        try:
+            return await spec.task, spec.calls
+        except Exception:  # noqa: BLE001 — classify inline below
+            pass
+    else:
+        spec.task.cancel()
+    return await classify_intent(content), spec.calls
+
+
 # ─── Graph Nodes ─────────────────────────────────────────────────────────────
 
+@track_model_calls("intent_classifier")
 async def intent_classifier_node(state: dict) -> dict:
     """Intent classification for the FIRST human message."""
-    customer_message = state["messages"][-1].content
-    intent, confidence = await classify_intent(customer_message)
+    (intent, confidence), speculative_calls = await _classify_turn_message(state["messages"][-1])
 
-    return {
+    output = {
         "ticket_category": intent,
         "intent_confidence": confidence,
         "current_agent": INTENT_TO_AGENT.get(intent, "supervisor"),
         "agent_reasoning": [f"INTENT CLASSIFIER: {intent} (confidence: {confidence}%)"],
     }
+    if speculative_calls:
+        output["model_calls"] = speculative_calls
+    return output
 
 
+@track_model_calls("intent_shift_check")
 async def intent_shift_check_node(state: dict) -> dict:
     """Check if customer intent changed mid-conversation (multi-turn)."""
     new_message = state["messages"][-1].content
@@ -157,20 +401,19 @@ async def intent_shift_check_node(state: dict) -> dict:
             ],
         }
 
-    new_intent, confidence = await classify_intent(new_message)
+    (new_intent, confidence), speculative_calls = await _classify_turn_message(state["messages"][-1])
     expected_agent = INTENT_TO_AGENT.get(new_intent, "supervisor")
 
     if new_intent == "GENERAL" and current_agent != "supervisor":
-        return {
+        output = {
             "intent_shifted": False,
             "agent_reasoning": [
                 f"MULTI-TURN: Ignoring GENERAL drift, continuing with {current_agent} "
                 f"(checked: {new_intent} @ {confidence}%)"
             ],
         }
-
-    if expected_agent != current_agent and confidence >= INTENT_SHIFT_THRESHOLD:
-        return {
+    elif expected_agent != current_agent and confidence >= INTENT_SHIFT_THRESHOLD:
+        output = {
             "ticket_category": new_intent,
             "intent_confidence": confidence,
             "current_agent": expected_agent,
@@ -180,14 +423,33 @@ async def intent_shift_check_node(state: dict) -> dict:
                 f"(new intent: {new_intent}, confidence: {confidence}%)"
             ],
         }
-
-    return {
-        "intent_shifted": False,
-        "agent_reasoning": [
-            f"MULTI-TURN: Continuing with {current_agent} "
-            f"(checked: {new_intent} @ {confidence}%)"
-        ],
-    }
+    elif (
+        expected_agent == current_agent
+        and new_intent != state.get("ticket_category")
+        and confidence >= INTENT_SHIFT_THRESHOLD
+    ):
+        # Same agent, different workflow (e.g. SUBSCRIPTION → DISCOUNT): keep the
+        # category current so the agent's per-intent prompt variant follows it.
+        output = {
+            "ticket_category": new_intent,
+            "intent_confidence": confidence,
+            "intent_shifted": False,
+            "agent_reasoning": [
+                f"MULTI-TURN: Continuing with {current_agent}, "
+                f"intent {state.get('ticket_category')} → {new_intent} ({confidence}%)"
+            ],
+        }
+    else:
+        output = {
+            "intent_shifted": False,
+            "agent_reasoning": [
+                f"MULTI-TURN: Continuing with {current_agent} "
+                f"(checked: {new_intent} @ {confidence}%)"
+            ],
+        }
+    if speculative_calls:
+        output["model_calls"] = speculative_calls
+    return output
 
 
 # ─── Routing Functions ───────────────────────────────────────────────────────
@@ -1,23 +1,57 @@
 """
 Reflection Validator (8-rule check) + Revision Node.
 Uses Haiku for cheap/fast QA, Sonnet for revision when needed.
+The Haiku verdict comes back as a forced ReflectionVerdict tool call, so it is
+schema-checked instead of parsed from free text.
+reflection_check_node is the same check for the parallel draft review, where
+the verdict is parked in reflection_verdict until review_join merges it.
 """
 
 from __future__ import annotations
 
 import json
 from datetime import datetime
+from typing import Any
 
 from langchain_core.messages import AIMessage
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 from src.config import get_current_context, haiku_llm, sonnet_llm
+from src.llm.accounting import model_call_step, track_model_calls
+from src.llm.hedging import LLMDeadlineExceeded
+from src.patterns.reflection_rules import evaluate_reflection_rules, reflection_stats
 from src.prompts.reflection_prompt import REFLECTION_PROMPT, REVISION_PROMPT
 
 
 # ─── Reflection Validator ────────────────────────────────────────────────────
 
+_VERDICT_KEYS = (
+    "reflection_passed",
+    "reflection_feedback",
+    "reflection_rule_violated",
+    "reflection_suggested_fix",
+)
+
+
+@track_model_calls("reflection_validator")
 async def reflection_validator_node(state: dict) -> dict:
     """Lightweight 8-rule check on the draft response. Max 1 cycle."""
+    return await _validate_draft(state)
+
+
+@track_model_calls("reflection_validator")
+async def reflection_check_node(state: dict) -> dict:
+    """
+    reflection_validator_node for the parallel draft review. Runs in the same
+    step as output guardrails, so the verdict goes to reflection_verdict and
+    review_join decides whether it applies.
+    """
+    update = await _validate_draft(state)
+    verdict = {key: update.pop(key) for key in _VERDICT_KEYS if key in update}
+    return {**update, "reflection_verdict": verdict}
+
+
+async def _validate_draft(state: dict) -> dict:
     draft = state["messages"][-1].content
 
     # Gather context
@@ -36,38 +70,158 @@ async def reflection_validator_node(state: dict) -> dict:
 
     ctx = get_current_context()
 
+    # ── Rule engine first: Haiku only for rules code cannot decide ───────
+    verdicts = evaluate_reflection_rules(
+        state, draft, customer_msg, turn_count, ctx["day_of_week"]
+    )
+    failed = next((v for v in verdicts if v.passed is False), None)
+    if failed is not None:
+        reflection_stats.record(llm_free=True, failed=True)
+        return {
+            "reflection_passed": False,
+            "reflection_feedback": failed.reason,
+            "reflection_rule_violated": failed.rule,
+            "reflection_suggested_fix": failed.suggested_fix,
+            "agent_reasoning": [
+                f"REFLECTION: FAILED by rule engine — Rule: {failed.rule}, "
+                f"Reason: {failed.reason} [{reflection_stats.llm_free_line()}]"
+            ],
+        }
+    undecided = [v.rule for v in verdicts if v.passed is None]
+    if not undecided:
+        reflection_stats.record(llm_free=True)
+        return {
+            "reflection_passed": True,
+            "agent_reasoning": [
+                f"REFLECTION: All 8 rules passed by rule engine ✅ "
+                f"[{reflection_stats.llm_free_line()}]"
+            ],
+        }
+    reflection_stats.record(llm_free=False)
+    verified = [v.rule for v in verdicts if v.passed]
+
     prompt = REFLECTION_PROMPT.format(
         draft_response=draft,
         tool_results=tool_results,
         customer_message=customer_msg,
         turn_count=turn_count,
         day_of_week=ctx["day_of_week"],
+        verified_rules=", ".join(verified) or "none",
     )
 
-    result = await haiku_llm.ainvoke(prompt)
-    text = result.content.strip()
+    try:
+        validation = await _ask_for_verdict(prompt)
+    except LLMDeadlineExceeded:
+        return {
+            "reflection_passed": True,
+            "agent_reasoning": ["REFLECTION: Deadline exceeded, defaulting to pass"],
+        }
+    if validation is None:
+        return {
+            "reflection_passed": True,
+            "agent_reasoning": [
+                "REFLECTION: Parse error after retry, defaulting to pass"
+            ],
+        }
+
+    if validation.get("pass"):
+        return {
+            "reflection_passed": True,
+            "agent_reasoning": ["REFLECTION: All 8 rules passed ✅"],
+        }
+
+    return {
+        "reflection_passed": False,
+        "reflection_feedback": validation.get("reason", ""),
+        "reflection_rule_violated": validation.get("rule_violated", ""),
+        "reflection_suggested_fix": validation.get("suggested_fix", ""),
+        "agent_reasoning": [
+            f"REFLECTION: FAILED — Rule: {validation.get('rule_violated')}, "
+            f"Reason: {validation.get('reason')}"
+        ],
+    }
+
+
+# ─── Verdict parsing ─────────────────────────────────────────────────────────
+
+class ReflectionVerdict(BaseModel):
+    """Verdict of the 8-rule review of a draft customer-support response."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    passed: bool = Field(alias="pass", description="true if no rule is violated")
+    rule_violated: str = Field("", description="RULE_NAME of the first violated rule")
+    reason: str = Field("", description="brief explanation of the violation")
+    suggested_fix: str = Field("", description="what should change in the draft")
+
+
+_structured: tuple[Any, Any] = (None, None)  # (haiku_llm it was bound from, bound model)
+
 
-    # ── Parse JSON (with fallbacks) ──────────────────────────────────────
-    validation: dict | None = None
+def _structured_model() -> Any:
+    """haiku_llm with ReflectionVerdict forced as its only tool (None if unsupported)."""
+    global _structured
+    if _structured[0] is not haiku_llm:
+        bind_tools = getattr(haiku_llm, "bind_tools", None)
+        bound = bind_tools([ReflectionVerdict], tool_choice=ReflectionVerdict.__name__) if bind_tools else None
+        _structured = (haiku_llm, bound)
+    return _structured[1]
 
-    # Strip markdown fences
-    text = text.replace("```json", "").replace("```", "").strip()
 
+def _structured_verdict(result: Any) -> dict | None:
+    for call in getattr(result, "tool_calls", None) or []:
+        if call.get("name") == ReflectionVerdict.__name__:
+            try:
+                verdict = ReflectionVerdict.model_validate(call.get("args") or {})
+            except ValidationError:
+                return None
+            return {"pass": verdict.passed, **verdict.model_dump(exclude={"passed"})}
+    return None
+
+
+def _text_verdict(text: str) -> dict | None:
+    text = (text or "").strip().replace("```json", "").replace("```", "").strip()
     try:
-        validation = json.loads(text)
+        return json.loads(text)
     except json.JSONDecodeError:
         # Try extracting the first JSON object
         start = text.find("{")
         end = text.rfind("}")
         if start != -1 and end != -1 and end > start:
             try:
-                validation = json.loads(text[start : end + 1])
+                return json.loads(text[start : end + 1])
             except json.JSONDecodeError:
                 pass
+    return None
 
-    # If still can't parse → retry once WITH context for accurate re-parsing
-    if validation is None:
-        retry_prompt = f"""{prompt}
+
+async def _ask_for_verdict(prompt: str) -> dict | None:
+    """
+    One Haiku call for the verdict. With tool calling the schema is enforced
+    (ReflectionVerdict), so no parse retry; plain-text models keep the JSON
+    parse + one retry. Parse failures / retries are counted per mode.
+    """
+    structured = _structured_model()
+    if structured is not None:
+        reflection_stats.record_verdict_call("structured")
+        result = await structured.ainvoke(prompt)
+        validation = _structured_verdict(result)
+        if validation is None:
+            validation = _text_verdict(_content_text(result))
+        if validation is None:
+            reflection_stats.record_parse_failure("structured")
+        return validation
+
+    reflection_stats.record_verdict_call("text")
+    result = await haiku_llm.ainvoke(prompt)
+    text = _content_text(result)
+    validation = _text_verdict(text)
+    if validation is not None:
+        return validation
+
+    # Can't parse → retry once WITH context for accurate re-parsing
+    reflection_stats.record_parse_failure("text", retried=True)
+    retry_prompt = f"""{prompt}
 
 IMPORTANT: Your previous response was not valid JSON:
 ---
@@ -77,38 +231,26 @@ IMPORTANT: Your previous response was not valid JSON:
 Please respond ONLY with valid JSON. No markdown, no backticks.
 Required format: {{"pass": true}} OR {{"pass": false, "rule_violated": "...", "reason": "...", "suggested_fix": "..."}}
 """
+    with model_call_step("parse_retry"):
         retry_result = await haiku_llm.ainvoke(retry_prompt)
-        retry_text = retry_result.content.strip().replace("```json", "").replace("```", "").strip()
-        try:
-            validation = json.loads(retry_text)
-        except json.JSONDecodeError:
-            return {
-                "reflection_passed": True,
-                "agent_reasoning": [
-                    "REFLECTION: Parse error after retry, defaulting to pass"
-                ],
-            }
+    validation = _text_verdict(_content_text(retry_result))
+    if validation is None:
+        reflection_stats.record_parse_failure("text")
+    return validation
 
-    if validation.get("pass"):
-        return {
-            "reflection_passed": True,
-            "agent_reasoning": ["REFLECTION: All 8 rules passed ✅"],
-        }
 
-    return {
-        "reflection_passed": False,
-        "reflection_feedback": validation.get("reason", ""),
-        "reflection_rule_violated": validation.get("rule_violated", ""),
-        "reflection_suggested_fix": validation.get("suggested_fix", ""),
-        "agent_reasoning": [
-            f"REFLECTION: FAILED — Rule: {validation.get('rule_violated')}, "
-            f"Reason: {validation.get('reason')}"
-        ],
-    }
+def _content_text(result: Any) -> str:
+    content = getattr(result, "content", "")
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block) for block in content
+        )
+    return content or ""
 
 
 # ─── Revision Node ───────────────────────────────────────────────────────────
 
+@track_model_calls("revise_response")
 async def revise_response_node(state: dict) -> dict:
     """Rewrite draft fixing the identified quality issue. Max 1 cycle."""
     draft = state["messages"][-1].content
@@ -128,11 +270,17 @@ async def revise_response_node(state: dict) -> dict:
         day_of_week=ctx["day_of_week"],
     )
 
-    revised = await sonnet_llm.ainvoke(prompt)
+    try:
+        revised = await sonnet_llm.ainvoke(prompt)
+    except LLMDeadlineExceeded:
+        return {
+            "agent_reasoning": ["REVISION: Deadline exceeded, keeping the draft response"],
+        }
 
     return {
         "messages": [AIMessage(content=revised.content)],
         "was_revised": True,
+        "reflection_failures": int(state.get("reflection_failures") or 0) + 1,
         "agent_reasoning": [
             f"REVISION: Response corrected for "
             f"{state.get('reflection_rule_violated', 'quality issue')}"
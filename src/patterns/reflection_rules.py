@@ -0,0 +1,378 @@
+"""
+Deterministic pre-checks for the 8 reflection rules.
+
+Each rule gets PASS / FAIL / undecided from the draft, the customer message
+and this turn's tool_calls_log. reflection_validator only calls Haiku when at
+least one rule stays undecided, and the prompt tells it which rules the code
+already verified. Checks are conservative: a rule is only FAILed on a clear
+signal (missing signature, wrong wait-promise day, refund on turn 1, ...).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+RULES: tuple[str, ...] = (
+    "RESOLUTION_ORDER",
+    "WAIT_PROMISE",
+    "ESCALATION_CHECK",
+    "INFORMATION_GATHERING",
+    "TONE_PERSONA",
+    "FACTUAL_ACCURACY",
+    "GID_FORMAT",
+    "RESOLUTION_WATERFALL",
+)
+
+# Tools that change the customer's order / account (rule 4: info first).
+_ACTION_TOOLS = {
+    "shopify_cancel_order",
+    "shopify_refund_order",
+    "shopify_create_store_credit",
+    "shopify_create_return",
+    "shopify_create_discount_code",
+    "shopify_update_order_shipping_address",
+    "skio_cancel_subscription",
+    "skio_pause_subscription",
+    "skio_skip_next_order_subscription",
+}
+
+# Action tools whose id parameter must be a Shopify GID (rule 7).
+_GID_PARAMS = {
+    "shopify_cancel_order": "orderId",
+    "shopify_refund_order": "orderId",
+    "shopify_create_return": "orderId",
+    "shopify_update_order_shipping_address": "orderId",
+    "shopify_add_tags": "id",
+}
+
+_REFUND_CLAIMS = (
+    "refund has been processed",
+    "refund has been issued",
+    "processed your refund",
+    "processed a refund",
+    "issued your refund",
+    "issued a refund",
+    "i've refunded",
+    "i have refunded",
+    "refunded your order",
+)
+_ALTERNATIVES = ("store credit", "replacement", "reship", "swap", "resend")
+
+_FORBIDDEN_PROMISES = (
+    "guarantee",
+    "i promise",
+    "we promise",
+    "100%",
+    "within 24 hours",
+    "definitely",
+)
+
+_FRIDAY_PROMISE_RE = re.compile(r"until (?:this )?friday")
+_NEXT_WEEK_PROMISE_RE = re.compile(r"until early next week")
+_FRIDAY_DAYS = {
+    "wismo": {"monday", "tuesday", "wednesday"},
+    "cancel_refund": {"monday", "tuesday"},
+}
+_WISMO_CATEGORIES = {"WISMO"}
+_CANCEL_REFUND_CATEGORIES = {"REFUND", "ORDER_MODIFY", "SUBSCRIPTION"}
+
+_DOUBLE_BILLING = ("charged twice", "double charged", "billed twice", "double billed")
+
+_AMOUNT_RE = re.compile(r"\$\s?(\d{1,6}(?:,\d{3})*(?:\.\d{1,2})?)")
+_NUMBER_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+_DELIVERED_CLAIMS = ("has been delivered", "was delivered", "shows as delivered")
+_SHIPPED_CLAIMS = ("has shipped", "has been shipped", "was shipped")
+# Status words in the draft → strings that must appear in the tool results.
+_STATUS_EVIDENCE: dict[str, tuple[str, ...]] = {
+    "in transit": ("in_transit", "in transit"),
+    "out for delivery": ("out_for_delivery", "out for delivery"),
+    "delivered": ("delivered",),
+    "shipped": ("fulfilled", "shipped", "in_transit"),
+    "tracking": ("tracking",),
+}
+
+
+@dataclass
+class RuleVerdict:
+    rule: str
+    passed: Optional[bool]  # None → undecided, needs the LLM
+    reason: str = ""
+    suggested_fix: str = ""
+
+
+def _verdict(rule: str, checks: Iterable[RuleVerdict]) -> RuleVerdict:
+    """Combine sub-checks: any FAIL fails, all PASS passes, otherwise undecided."""
+    checks = list(checks)
+    for check in checks:
+        if check.passed is False:
+            return RuleVerdict(rule, False, check.reason, check.suggested_fix)
+    if all(check.passed for check in checks):
+        return RuleVerdict(rule, True)
+    return RuleVerdict(rule, None)
+
+
+def _turn_calls(state: dict, turn_count: int) -> list[dict]:
+    """This turn's tool calls (all calls when the log carries no turn index)."""
+    calls = [c for c in (state.get("tool_calls_log") or []) if isinstance(c, dict)]
+    if any(c.get("turn_index") is not None for c in calls):
+        return [c for c in calls if c.get("turn_index") == turn_count]
+    return calls
+
+
+def _succeeded(call: dict) -> bool:
+    result = call.get("result")
+    return isinstance(result, dict) and bool(result.get("success"))
+
+
+def _walk_values(value: Any) -> Iterable[Any]:
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _walk_values(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _walk_values(item)
+    else:
+        yield value
+
+
+def _tool_amounts(calls: list[dict], state: dict) -> set[float]:
+    amounts: set[float] = set()
+    values = list(_walk_values([c.get("result") for c in calls]))
+    values.append(state.get("order_total"))
+    for value in values:
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            amounts.add(round(float(value), 2))
+        elif isinstance(value, str) and _NUMBER_RE.match(value.strip()):
+            amounts.add(round(float(value), 2))
+    return amounts
+
+
+def _tool_text(calls: list[dict]) -> str:
+    return " ".join(
+        str(v).lower() for v in _walk_values([c.get("result") for c in calls]) if isinstance(v, str)
+    )
+
+
+# ─── Individual checks ──────────────────────────────────────────────────────
+
+def _check_refund_first(draft: str, calls: list[dict], turn_count: int) -> RuleVerdict:
+    """Rules 1 + 8: no cash refund before alternatives on the first turn."""
+    refunded = any(
+        c.get("tool_name") == "shopify_refund_order" and _succeeded(c) for c in calls
+    ) or any(claim in draft for claim in _REFUND_CLAIMS)
+    if refunded:
+        if turn_count <= 1:
+            return RuleVerdict(
+                "", False,
+                "Cash refund processed on the first turn without offering alternatives",
+                "Offer a fix, free reship or store credit (+10%) before any cash refund.",
+            )
+        return RuleVerdict("", None)  # earlier turns may hold the declined alternatives
+    if "refund" in draft and not any(alt in draft for alt in _ALTERNATIVES):
+        return RuleVerdict("", None)
+    return RuleVerdict("", True)
+
+
+def _check_wait_promise(draft: str, category: str, day_of_week: str) -> RuleVerdict:
+    """Rule 2: the promised wait matches today's day for the ticket context."""
+    friday = bool(_FRIDAY_PROMISE_RE.search(draft))
+    next_week = bool(_NEXT_WEEK_PROMISE_RE.search(draft))
+    if not friday and not next_week:
+        return RuleVerdict("", True)  # not a wait-promise response → rule skipped
+    if friday and next_week:
+        return RuleVerdict("", None)
+    if category in _WISMO_CATEGORIES:
+        context = "wismo"
+    elif category in _CANCEL_REFUND_CATEGORIES:
+        context = "cancel_refund"
+    else:
+        return RuleVerdict("", None)
+    expects_friday = day_of_week.lower() in _FRIDAY_DAYS[context]
+    if friday == expects_friday:
+        return RuleVerdict("", True)
+    expected = "this Friday" if expects_friday else "early next week"
+    return RuleVerdict(
+        "", False,
+        f"Wait promise does not match {day_of_week} for {category}",
+        f"Ask the customer to give it until {expected}.",
+    )
+
+
+def _check_escalation(
+    state: dict, customer_message: str, calls: list[dict], turn_count: int,
+) -> RuleVerdict:
+    """Rule 3: PASS only when no escalation trigger is present at all."""
+    triggers = [
+        state.get("flag_health_concern"),
+        state.get("flag_chargeback_threat"),
+        state.get("flag_entire_order_wrong"),
+        state.get("flag_reship_acceptance"),
+        turn_count >= 3,
+        any(not _succeeded(c) for c in calls),
+        any(p in customer_message for p in _DOUBLE_BILLING),
+    ]
+    return RuleVerdict("", None if any(triggers) else True)
+
+
+def _check_information_gathering(calls: list[dict]) -> RuleVerdict:
+    """Rule 4: nothing to gather when no action tool ran this turn."""
+    acted = any(c.get("tool_name") in _ACTION_TOOLS and _succeeded(c) for c in calls)
+    return RuleVerdict("", None if acted else True)
+
+
+def _check_signature(draft: str) -> RuleVerdict:
+    if "caz" in draft:
+        return RuleVerdict("", True)
+    return RuleVerdict("", False, "Response is not signed as Caz", 'End the response with "Caz".')
+
+
+def _check_forbidden_promises(draft: str) -> RuleVerdict:
+    for phrase in _FORBIDDEN_PROMISES:
+        if phrase in draft:
+            return RuleVerdict(
+                "", False,
+                f"Response makes a forbidden promise ('{phrase}')",
+                "Replace absolute promises with softer wording (\"typically\", \"we aim to\").",
+            )
+    return RuleVerdict("", True)
+
+
+def _check_first_name(draft: str, first_name: str) -> RuleVerdict:
+    name = (first_name or "").strip().lower()
+    if name and name != "there" and name in draft:
+        return RuleVerdict("", True)
+    return RuleVerdict("", None)  # warmth without the name is the LLM's call
+
+
+def _check_amounts(draft: str, calls: list[dict], state: dict) -> RuleVerdict:
+    """Rule 6: dollar amounts in the draft must come from tool results (or +10%)."""
+    quoted = [round(float(m.replace(",", "")), 2) for m in _AMOUNT_RE.findall(draft)]
+    if not quoted:
+        return RuleVerdict("", True)
+    known = _tool_amounts(calls, state)
+    if not known:
+        return RuleVerdict("", None)  # may come from an earlier turn's lookup
+    allowed = known | {round(a * 1.10, 2) for a in known}
+    if all(any(abs(q - a) <= 0.01 for a in allowed) for q in quoted):
+        return RuleVerdict("", True)
+    return RuleVerdict("", None)  # may be a sum/partial amount
+
+
+def _check_status(draft: str, calls: list[dict]) -> RuleVerdict:
+    """Rule 6: delivery status claims must be backed by tool results."""
+    mentioned = [word for word in _STATUS_EVIDENCE if word in draft]
+    if not mentioned:
+        return RuleVerdict("", True)
+    tool_text = _tool_text(calls)
+    shipped_text = tool_text.replace("unfulfilled", "")
+    if tool_text and any(c in draft for c in _DELIVERED_CLAIMS) and "delivered" not in tool_text:
+        return RuleVerdict(
+            "", False,
+            "Response says the order was delivered but tool results do not show delivery",
+            "Describe the status exactly as the order lookup reports it.",
+        )
+    if any(c in draft for c in _SHIPPED_CLAIMS) and "unfulfilled" in tool_text and "fulfilled" not in shipped_text:
+        return RuleVerdict(
+            "", False,
+            "Response says the order shipped but tool results show it unfulfilled",
+            "Tell the customer the order has not shipped yet.",
+        )
+    if all(any(e in shipped_text for e in _STATUS_EVIDENCE[word]) for word in mentioned):
+        return RuleVerdict("", True)
+    return RuleVerdict("", None)
+
+
+def _check_gid_format(calls: list[dict]) -> RuleVerdict:
+    """Rule 7: action tools that ran received GIDs (blocked or failed calls don't count)."""
+    for call in filter(_succeeded, calls):
+        param = _GID_PARAMS.get(call.get("tool_name"))
+        params = call.get("params") if isinstance(call.get("params"), dict) else {}
+        if param and not str(params.get(param, "")).startswith("gid://shopify/"):
+            return RuleVerdict(
+                "", False,
+                f"{call.get('tool_name')} was called without a Shopify GID",
+                "Use the order GID from get_order_details for action tools.",
+            )
+    return RuleVerdict("", True)
+
+
+# ─── Engine ──────────────────────────────────────────────────────────────────
+
+def evaluate_reflection_rules(
+    state: dict,
+    draft: str,
+    customer_message: str,
+    turn_count: int,
+    day_of_week: str,
+) -> list[RuleVerdict]:
+    """One RuleVerdict per rule in RULES order."""
+    text = (draft or "").lower()
+    customer = (customer_message or "").lower()
+    calls = _turn_calls(state, turn_count)
+    category = state.get("ticket_category") or ""
+    refund_first = _check_refund_first(text, calls, turn_count)
+
+    return [
+        _verdict("RESOLUTION_ORDER", [refund_first]),
+        _verdict("WAIT_PROMISE", [_check_wait_promise(text, category, day_of_week)]),
+        _verdict("ESCALATION_CHECK", [_check_escalation(state, customer, calls, turn_count)]),
+        _verdict("INFORMATION_GATHERING", [_check_information_gathering(calls)]),
+        _verdict("TONE_PERSONA", [
+            _check_signature(text),
+            _check_forbidden_promises(text),
+            _check_first_name(text, state.get("customer_first_name", "")),
+        ]),
+        _verdict("FACTUAL_ACCURACY", [_check_amounts(text, calls, state), _check_status(text, calls)]),
+        _verdict("GID_FORMAT", [_check_gid_format(calls)]),
+        _verdict("RESOLUTION_WATERFALL", [refund_first]),
+    ]
+
+
+class ReflectionStats:
+    """
+    Reflection counters: how many the rule engine settled without Haiku, and
+    per verdict mode ("structured" tool call vs. "text" JSON) the LLM calls,
+    parse failures and parse retries.
+    """
+
+    def __init__(self) -> None:
+        self.reflections = 0
+        self.llm_free = 0
+        self.failed_by_rules = 0
+        self.verdict_calls = {"structured": 0, "text": 0}
+        self.parse_failures = {"structured": 0, "text": 0}
+        self.parse_retries = {"structured": 0, "text": 0}
+
+    def record(self, *, llm_free: bool, failed: bool = False) -> None:
+        self.reflections += 1
+        self.llm_free += int(llm_free)
+        self.failed_by_rules += int(failed)
+
+    def record_verdict_call(self, mode: str) -> None:
+        self.verdict_calls[mode] += 1
+
+    def record_parse_failure(self, mode: str, *, retried: bool = False) -> None:
+        self.parse_failures[mode] += 1
+        self.parse_retries[mode] += int(retried)
+
+    def llm_free_line(self) -> str:
+        rate = self.llm_free / self.reflections if self.reflections else 0.0
+        return f"LLM-free {self.llm_free}/{self.reflections} ({rate:.0%})"
+
+    def stats(self) -> dict:
+        return {
+            "reflections": self.reflections,
+            "llm_free": self.llm_free,
+            "failed_by_rules": self.failed_by_rules,
+            "llm_free_rate": round(self.llm_free / self.reflections, 3) if self.reflections else 0.0,
+            "verdict_calls": dict(self.verdict_calls),
+            "parse_failures": dict(self.parse_failures),
+            "parse_retries": dict(self.parse_retries),
+        }
+
+
+reflection_stats = ReflectionStats()
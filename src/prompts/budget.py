@@ -0,0 +1,135 @@
+"""
+Prompt token budgets.
+
+Every agent system prompt is resent on each ReAct iteration, so its size is
+a per-call cost. prompt_token_report() tokenizes each build_*_prompt output
+(full prompt and every per-intent compact variant) plus the shared blocks and
+workflow sections they are assembled from; check_budgets() compares the
+prompts against a budget file so prompt bloat fails CI like any other
+performance regression (see benchmarks/prompt_budget.py).
+
+Token counts default to the ~4 chars/token estimate used by the rate limiter;
+pass count_tokens for exact numbers.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Callable, Optional
+
+from src.llm.limiter import estimate_tokens
+from src.prompts.account_prompt import ACCOUNT_INTENT_WORKFLOWS, ACCOUNT_WORKFLOWS, build_account_prompt
+from src.prompts.intent_classifier_prompt import INTENT_CLASSIFIER_PROMPT
+from src.prompts.issue_prompt import ISSUE_INTENT_WORKFLOWS, ISSUE_WORKFLOWS, build_issue_prompt
+from src.prompts.reflection_prompt import REFLECTION_PROMPT, REVISION_PROMPT
+from src.prompts.shared_blocks import (
+    CROSS_AGENT_HANDOFF_BLOCK,
+    GID_ORDER_NUMBER_BLOCK,
+    REASONING_FORMAT_BLOCK,
+    SESSION_CONTEXT_REFERENCE,
+    prompt_text,
+)
+from src.prompts.supervisor_prompt import build_supervisor_prompt
+from src.prompts.wismo_prompt import build_wismo_prompt
+
+FULL = "full"
+
+# Representative customer for the SESSION CONTEXT suffix.
+_SAMPLE_CUSTOMER = {
+    "first_name": "Jennifer",
+    "last_name": "Montgomery",
+    "email": "jennifer.montgomery@example.com",
+    "customer_shopify_id": "gid://shopify/Customer/7424155189325",
+    "current_date": "2026-02-04",
+    "day_of_week": "Wednesday",
+}
+
+# agent -> (builder, intents with a compact variant)
+PROMPT_BUILDERS: dict[str, tuple[Callable[..., list[dict]], tuple[str, ...]]] = {
+    "supervisor": (build_supervisor_prompt, ()),
+    "wismo_agent": (build_wismo_prompt, ()),
+    "issue_agent": (build_issue_prompt, tuple(ISSUE_INTENT_WORKFLOWS)),
+    "account_agent": (build_account_prompt, tuple(ACCOUNT_INTENT_WORKFLOWS)),
+}
+
+SHARED_BLOCKS: dict[str, str] = {
+    "SESSION_CONTEXT_REFERENCE": SESSION_CONTEXT_REFERENCE,
+    "REASONING_FORMAT_BLOCK": REASONING_FORMAT_BLOCK,
+    "GID_ORDER_NUMBER_BLOCK": GID_ORDER_NUMBER_BLOCK,
+    "CROSS_AGENT_HANDOFF_BLOCK": CROSS_AGENT_HANDOFF_BLOCK,
+    **{f"account.{name}": text for name, text in ACCOUNT_WORKFLOWS.items()},
+    **{f"issue.{name}": text for name, text in ISSUE_WORKFLOWS.items()},
+    "INTENT_CLASSIFIER_PROMPT": INTENT_CLASSIFIER_PROMPT,
+    "REFLECTION_PROMPT": REFLECTION_PROMPT,
+    "REVISION_PROMPT": REVISION_PROMPT,
+}
+
+
+def build_prompt(agent: str, intent: Optional[str] = None) -> list[dict]:
+    """System blocks for one agent (and intent variant) with the sample customer."""
+    builder, _ = PROMPT_BUILDERS[agent]
+    kwargs = dict(_SAMPLE_CUSTOMER)
+    if agent != "supervisor":
+        kwargs["wait_promise"] = "Could you give it until early next week?"
+    if intent is not None:
+        kwargs["intent"] = intent
+    return builder(**kwargs)
+
+
+def prompt_token_report(count_tokens: Callable[[str], int] = estimate_tokens) -> dict:
+    """Tokens per agent/intent prompt (static prefix + session suffix) and per shared block."""
+    prompts = []
+    for agent, (_, intents) in PROMPT_BUILDERS.items():
+        for intent in (None, *intents):
+            blocks = build_prompt(agent, intent)
+            static = count_tokens(blocks[0]["text"])
+            session = count_tokens(prompt_text(blocks[1:]))
+            prompts.append({
+                "agent": agent,
+                "intent": intent or FULL,
+                "static_tokens": static,
+                "session_tokens": session,
+                "total_tokens": static + session,
+            })
+    return {
+        "prompts": prompts,
+        "blocks": {name: count_tokens(text) for name, text in SHARED_BLOCKS.items()},
+    }
+
+
+def load_budgets(path: str) -> dict[str, int]:
+    """Budget file: {"<agent>/<intent>": max total tokens} (intent "full" = no variant)."""
+    with open(path, encoding="utf-8") as f:
+        return {key: int(value) for key, value in json.load(f).items()}
+
+
+def check_budgets(report: dict, budgets: dict[str, int]) -> list[str]:
+    """Over-budget and unbudgeted prompts, as human-readable problems (empty = pass)."""
+    problems = []
+    for row in report["prompts"]:
+        key = f"{row['agent']}/{row['intent']}"
+        budget = budgets.get(key)
+        if budget is None:
+            problems.append(f"{key}: no budget (add it to the budget file)")
+        elif row["total_tokens"] > budget:
+            problems.append(f"{key}: {row['total_tokens']} tokens > budget {budget}")
+    return problems
+
+
+def format_report(report: dict, budgets: Optional[dict[str, int]] = None) -> str:
+    """Plain-text tables: prompts per agent/intent (vs budget and full prompt), then blocks."""
+    budgets = budgets or {}
+    full = {row["agent"]: row["total_tokens"] for row in report["prompts"] if row["intent"] == FULL}
+    lines = [f"{'prompt':<28} {'static':>7} {'session':>8} {'total':>7} {'budget':>7} {'vs full':>8}"]
+    for row in report["prompts"]:
+        key = f"{row['agent']}/{row['intent']}"
+        saved = row["total_tokens"] / full[row["agent"]] - 1 if row["intent"] != FULL else 0.0
+        lines.append(
+            f"{key:<28} {row['static_tokens']:>7} {row['session_tokens']:>8} {row['total_tokens']:>7} "
+            f"{budgets.get(key, '-'):>7} {saved:>+8.0%}"
+        )
+    lines.append("")
+    lines.append(f"{'block':<40} {'tokens':>7}")
+    for name, tokens in report["blocks"].items():
+        lines.append(f"{name:<40} {tokens:>7}")
+    return "\n".join(lines)
@@ -2,10 +2,7 @@
 Intent Classifier prompt — used by Haiku for fast, cheap classification.
 """
 
-INTENT_CLASSIFIER_PROMPT = """Classify the customer message into exactly ONE category
-and rate your confidence (0-100).
-
-CATEGORIES:
+_INTENT_GUIDE = """CATEGORIES:
 - WISMO: shipping delay, order tracking, delivery status, "where is my order",
   package not arrived, shipment update, estimated delivery
 - WRONG_MISSING: wrong item received, missing item in package, damaged item,
@@ -50,7 +47,25 @@ KEY DISTINCTION:
 - "Entire order hasn't arrived" → WISMO
 - Order number does NOT automatically mean WISMO
 
-Response format (ONLY this, nothing else): CATEGORY|CONFIDENCE
+"""
+
+INTENT_CLASSIFIER_PROMPT = """Classify the customer message into exactly ONE category
+and rate your confidence (0-100).
+
+""" + _INTENT_GUIDE + """Response format (ONLY this, nothing else): CATEGORY|CONFIDENCE
 Example: WISMO|92
 
-Customer message: {message}"""
\ No newline at end of file
+Customer message: {message}"""
+
+
+BATCH_INTENT_CLASSIFIER_PROMPT = """Classify EACH numbered customer message below into exactly ONE
+category and rate your confidence (0-100). Messages are independent of each other.
+
+""" + _INTENT_GUIDE + """Response format (ONLY this, nothing else): one line per message, in order,
+INDEX|CATEGORY|CONFIDENCE
+Example:
+1|WISMO|92
+2|SUBSCRIPTION|88
+
+Customer messages:
+{messages}"""
@@ -70,6 +70,8 @@ CUSTOMER MESSAGE:
 
 CONVERSATION TURN COUNT: {turn_count}
 
+ALREADY VERIFIED BY AUTOMATED CHECKS (treat as passed, do not re-check): {verified_rules}
+
 Respond with ONLY valid JSON (no markdown, no explanation):
 {{"pass": true}} OR {{"pass": false, "rule_violated": "RULE_NAME", "reason": "brief explanation", "suggested_fix": "what should change"}}"""
 
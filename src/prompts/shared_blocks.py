@@ -1,5 +1,11 @@
 """
 Shared prompt blocks injected into every agent prompt.
+
+Prompt layout (prompt-cache friendly):
+  [static policy prefix — identical for every customer, cache breakpoint]
+  [SESSION CONTEXT suffix — customer, date, day]
+Anthropic caches tools → system in that order, so the breakpoint on the
+static block also covers the agent's bound tool schemas.
 """
 
 REASONING_FORMAT_BLOCK = """
@@ -67,4 +73,94 @@ Examples:
 - Allergic reaction → ESCALATE: health_concern | REASON: Customer reports allergic reaction
 - Chargeback threat → ESCALATE: chargeback_risk | REASON: Customer threatening chargeback
 - 3+ turns unresolved → ESCALATE: unresolved_loop | REASON: Unable to resolve after multiple attempts
-"""
\ No newline at end of file
+"""
+
+SESSION_CONTEXT_REFERENCE = """Customer details, today's date and day are in the SESSION CONTEXT block
+at the end of these instructions. Use them wherever a step below refers to them."""
+
+
+def build_session_context_block(
+    first_name: str,
+    last_name: str,
+    email: str,
+    customer_shopify_id: str,
+    current_date: str,
+    day_of_week: str,
+    wait_promise: str | None = None,
+    customer_context: str | None = None,
+) -> str:
+    """Small per-customer suffix appended after the cached static prompt."""
+    lines = [
+        "SESSION CONTEXT:",
+        f"- CUSTOMER: {first_name} {last_name} | Email: {email} | Shopify ID: {customer_shopify_id}",
+        f"- TODAY: {current_date} | DAY: {day_of_week}",
+    ]
+    if wait_promise:
+        lines.append(f'- WAIT PROMISE for today: "{wait_promise}"')
+    if customer_context:
+        lines.append(customer_context)
+    return "\n".join(lines)
+
+
+def format_customer_context(order_details: dict | None, subscription_status: dict | list | None) -> str | None:
+    """Orders / subscriptions looked up at session start, as SESSION CONTEXT lines (None if neither)."""
+    if order_details is None and subscription_status is None:
+        return None
+    lines = []
+    if isinstance(order_details, dict):
+        orders = [o for o in order_details.get("orders") or [] if isinstance(o, dict)]
+        lines.append(f"- ORDERS ON FILE ({len(orders) or 'none'} found):")
+        for order in orders:
+            parts = [order.get("name"), order.get("status"), str(order.get("createdAt") or "")[:10], order.get("id")]
+            if order.get("trackingUrl"):
+                parts.append(f"tracking {order['trackingUrl']}")
+            lines.append("  • " + " | ".join(str(p) for p in parts if p))
+        older = order_details.get("olderOrders")
+        if isinstance(older, dict) and older.get("count"):
+            lines.append(f"  • (+{older['count']} older orders)")
+    subscriptions = subscription_status
+    if isinstance(subscriptions, dict):
+        subscriptions = subscriptions.get("subscriptions") or [subscriptions]
+    if isinstance(subscriptions, list):
+        lines.append(f"- SUBSCRIPTIONS ({len(subscriptions) or 'none'} found):")
+        for sub in subscriptions:
+            if isinstance(sub, dict):
+                parts = [sub.get("subscriptionId"), sub.get("status")]
+                if sub.get("nextBillingDate"):
+                    parts.append(f"next billing {sub['nextBillingDate']}")
+                lines.append("  • " + " | ".join(str(p) for p in parts if p))
+    lines.append(
+        "  (Looked up at session start for this first turn: no need to call "
+        "shopify_get_customer_orders or skio_get_subscriptions again. GIDs above are valid "
+        "for action tools; re-check an order with shopify_get_order_details after changing it.)"
+    )
+    return "\n".join(lines)
+
+
+def cached_system_blocks(static_prompt: str, dynamic_suffix: str) -> list[dict]:
+    """System-message content blocks with a cache breakpoint after the static prefix."""
+    return [
+        {"type": "text", "text": static_prompt, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": dynamic_suffix},
+    ]
+
+
+def prompt_text(content: str | list) -> str:
+    """Flatten system-message content (str or content blocks) to plain text."""
+    if isinstance(content, str):
+        return content
+    return "\n\n".join(
+        block.get("text", "") if isinstance(block, dict) else str(block)
+        for block in content
+    )
+
+
+def format_handoff_context(handoff_note: str | None, findings: list[str]) -> str | None:
+    """HANDOFF line + lookups the previous agent already made this turn (None if no handoff)."""
+    if not handoff_note:
+        return None
+    lines = [f"- HANDOFF THIS TURN: {handoff_note}"]
+    if findings:
+        lines.append("- ALREADY LOOKED UP THIS TURN (use these; repeating a call returns the same data):")
+        lines.extend(findings)
+    return "\n".join(lines)
@@ -41,6 +41,7 @@ from src.tools.skio_tools import (
 
 # Pre-configured tool groups
 from src.tools.tool_groups import (
+    READ_ONLY_TOOLS,
     wismo_tools,
     issue_tools,
     account_tools,
@@ -74,4 +75,5 @@ __all__ = [
     "wismo_tools",
     "issue_tools",
     "account_tools",
+    "READ_ONLY_TOOLS",
 ]
@@ -0,0 +1,176 @@
+"""
+Tool result compaction for the ReAct loop.
+
+Each tool result is fed back to the model as a ToolMessage and resent on every
+later iteration, so a customer order page (up to 250 orders) or a long
+knowledge-base article is paid for many times over. compact_tool_result()
+projects each lookup to the fields the agent prompts actually use (order
+name/GID/status/tracking/total, subscription status/ID/dates, product and
+article essentials) and summarises long lists. The full payload stays in
+tool_calls_log for guardrails, escalation payloads and traces.
+
+Failed results and action-tool results are small and pass through unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+from src.config import TOOL_RESULT_COMPACTION_ENABLED
+from src.llm.limiter import estimate_tokens
+
+_ORDER_FIELDS = (
+    "id", "name", "createdAt", "status", "displayFulfillmentStatus", "displayFinancialStatus",
+    "trackingUrl", "trackingNumber", "trackingCompany", "totalPrice", "currencyCode", "cancelledAt",
+)
+_LINE_ITEM_FIELDS = ("title", "quantity", "variantTitle", "productId")
+_SUBSCRIPTION_FIELDS = ("subscriptionId", "status", "nextBillingDate", "pausedUntil", "cancelledAt", "productTitle")
+_PRODUCT_FIELDS = ("id", "title", "name", "handle", "productType", "price", "url", "onlineStoreUrl", "description")
+_ARTICLE_FIELDS = ("title", "question", "answer", "content", "body", "url")
+
+MAX_ORDERS = 10
+MAX_ITEMS = 5
+MAX_TEXT_CHARS = 600
+
+
+def _text(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > MAX_TEXT_CHARS:
+        return value[:MAX_TEXT_CHARS].rstrip() + "…"
+    return value
+
+
+def _trim(value: Any) -> Any:
+    """Schema-agnostic fallback: shorten long strings and lists, recursively."""
+    if isinstance(value, dict):
+        return {key: _trim(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_trim(item) for item in value[:MAX_ITEMS]] + (
+            [f"… {len(value) - MAX_ITEMS} more"] if len(value) > MAX_ITEMS else []
+        )
+    return _text(value)
+
+
+def _project(record: Any, fields: tuple[str, ...]) -> Any:
+    """Known fields of a record; an unfamiliar shape is trimmed rather than emptied."""
+    if not isinstance(record, dict):
+        return _trim(record)
+    projected = {key: _text(record[key]) for key in fields if record.get(key) is not None}
+    return projected or _trim(record)
+
+
+def _order(order: Any) -> Any:
+    compact = _project(order, _ORDER_FIELDS)
+    items = order.get("lineItems") if isinstance(order, dict) else None
+    if isinstance(items, list) and isinstance(compact, dict):
+        compact["lineItems"] = [_project(item, _LINE_ITEM_FIELDS) for item in items]
+    return compact
+
+
+def _order_list(data: dict) -> dict:
+    orders = [order for order in data.get("orders") or [] if isinstance(order, dict)]
+    recent = sorted(orders, key=lambda o: str(o.get("createdAt") or ""), reverse=True)
+    compact = {key: data[key] for key in ("hasNextPage", "endCursor") if key in data}
+    compact["orders"] = [_order(order) for order in recent[:MAX_ORDERS]]
+    if len(recent) > MAX_ORDERS:
+        older = recent[MAX_ORDERS:]
+        by_status: dict[str, int] = {}
+        for order in older:
+            status = str(order.get("status") or "UNKNOWN")
+            by_status[status] = by_status.get(status, 0) + 1
+        compact["olderOrders"] = {
+            "count": len(older),
+            "byStatus": by_status,
+            "names": [order.get("name") for order in older if order.get("name")],
+        }
+    return compact
+
+
+def _subscriptions(data: Any) -> Any:
+    if isinstance(data, list):
+        return [_project(sub, _SUBSCRIPTION_FIELDS) for sub in data]
+    if isinstance(data, dict) and isinstance(data.get("subscriptions"), list):
+        rest = {key: value for key, value in data.items() if key != "subscriptions"}
+        return {**(_project(rest, _SUBSCRIPTION_FIELDS) if rest else {}),
+                "subscriptions": _subscriptions(data["subscriptions"])}
+    return _project(data, _SUBSCRIPTION_FIELDS)
+
+
+def _records(fields: tuple[str, ...]) -> Callable[[Any], Any]:
+    """Projection for a record or a list of records (capped at MAX_ITEMS, with a count)."""
+    def compact(data: Any) -> Any:
+        if isinstance(data, list):
+            items = [_project(item, fields) for item in data[:MAX_ITEMS]]
+            return items if len(data) <= MAX_ITEMS else {"items": items, "total": len(data)}
+        if isinstance(data, dict):
+            lists = {key: compact(value) for key, value in data.items() if isinstance(value, list)}
+            if lists:
+                scalars = {key: value for key, value in data.items() if key not in lists}
+                return {**(_project(scalars, fields) if scalars else {}), **lists}
+        return _project(data, fields)
+    return compact
+
+
+# tool name -> projection of result["data"]
+_COMPACTORS: dict[str, Callable[[Any], Any]] = {
+    "shopify_get_order_details": _order,
+    "shopify_get_customer_orders": lambda data: _order_list(data) if isinstance(data, dict) else data,
+    "skio_get_subscriptions": _subscriptions,
+    "shopify_get_product_details": _records(_PRODUCT_FIELDS),
+    "shopify_get_product_recommendations": _records(_PRODUCT_FIELDS),
+    "shopify_get_collection_recommendations": _records(_PRODUCT_FIELDS),
+    "shopify_get_related_knowledge_source": _records(_ARTICLE_FIELDS),
+}
+
+
+def compact_tool_result(tool_name: str, result: Any) -> Any:
+    """Model-facing view of a tool result (the original is never modified)."""
+    compactor = _COMPACTORS.get(tool_name)
+    if (
+        not TOOL_RESULT_COMPACTION_ENABLED
+        or compactor is None
+        or not isinstance(result, dict)
+        or not result.get("success")
+        or "data" not in result
+    ):
+        return result
+    return {**result, "data": compactor(result["data"])}
+
+
+def tool_message_content(tool_name: str, result: Any) -> tuple[str, int]:
+    """(ToolMessage content, estimated tokens saved versus the full JSON payload)."""
+    if not isinstance(result, dict):
+        return str(result), 0
+    full = json.dumps(result, default=str)
+    compact = compact_tool_result(tool_name, result)
+    if compact is result:
+        return full, 0
+    content = json.dumps(compact, default=str)
+    saved = estimate_tokens(full) - estimate_tokens(content)
+    if saved <= 0:
+        return full, 0
+    tool_compaction_stats.record(tool_name, saved)
+    return content, saved
+
+
+class ToolCompactionStats:
+    """Results compacted and estimated tokens saved per tool (per ToolMessage, before resends)."""
+
+    def __init__(self) -> None:
+        self.compacted: dict[str, int] = {}
+        self.tokens_saved: dict[str, int] = {}
+
+    def record(self, tool_name: str, saved: int) -> None:
+        self.compacted[tool_name] = self.compacted.get(tool_name, 0) + 1
+        self.tokens_saved[tool_name] = self.tokens_saved.get(tool_name, 0) + saved
+
+    def stats(self) -> dict:
+        return {
+            "enabled": TOOL_RESULT_COMPACTION_ENABLED,
+            "compacted": dict(self.compacted),
+            "tokens_saved": dict(self.tokens_saved),
+            "tokens_saved_total": sum(self.tokens_saved.values()),
+        }
+
+
+tool_compaction_stats = ToolCompactionStats()
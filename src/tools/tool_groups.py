@@ -58,3 +58,14 @@ account_tools = [
     skio_skip_next_order_subscription,
     skio_unpause_subscription,
 ]
+
+# Lookups without side effects: safe to run concurrently within one ReAct iteration.
+READ_ONLY_TOOLS: frozenset[str] = frozenset(t.name for t in (
+    shopify_get_order_details,
+    shopify_get_customer_orders,
+    shopify_get_product_details,
+    shopify_get_product_recommendations,
+    shopify_get_collection_recommendations,
+    shopify_get_related_knowledge_source,
+    skio_get_subscriptions,
+))
@@ -10,6 +10,8 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from src.llm.accounting import summarize_model_calls
+
 
 class TraceEntry(BaseModel):
     timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
@@ -41,7 +43,7 @@ class SessionTrace(BaseModel):
     handoffs: list[str] = Field(default_factory=list)
     reflection_violations: list[str] = Field(default_factory=list)
     guardrail_blocks: list[str] = Field(default_factory=list)
-    model_calls: dict = Field(default_factory=dict)
+    model_calls: dict = Field(default_factory=dict)  # {"calls": [...], "totals", "by_node", "by_model"}
     messages: list[dict] = Field(default_factory=list)
     escalation_payload: Optional[dict] = None
 
@@ -132,5 +134,9 @@ def build_session_trace(session_id: str, state: dict) -> SessionTrace:
         was_revised=state.get("was_revised", False),
         intent_shifted=state.get("intent_shifted", False),
         escalation_payload=state.get("escalation_payload"),
+        model_calls={
+            "calls": list(state.get("model_calls") or []),
+            **summarize_model_calls(state.get("model_calls") or []),
+        },
         messages=serialized_msgs,
     )
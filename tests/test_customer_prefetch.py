@@ -0,0 +1,168 @@
+"""
+Tests for the session-start customer context prefetch.
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src import main
+from src.agents.customer_context import CustomerContextPrefetch
+from src.agents.react_agents import _run_react_agent
+from src.prompts import build_account_prompt
+from src.prompts.shared_blocks import format_customer_context
+
+_ORDERS = {
+    "success": True,
+    "data": {
+        "orders": [{
+            "id": "gid://shopify/Order/5531567751245",
+            "name": "#1201",
+            "createdAt": "2026-02-03T09:00:00Z",
+            "status": "FULFILLED",
+            "trackingUrl": "https://tracking.example.com/abc",
+        }],
+        "hasNextPage": False,
+        "endCursor": None,
+    },
+}
+_SUBSCRIPTION = {
+    "success": True,
+    "data": {"status": "ACTIVE", "subscriptionId": "sub_123", "nextBillingDate": "2026-03-01"},
+}
+
+
+class _Lookup:
+    def __init__(self, name: str, result: dict, delay: float = 0.0):
+        self.name = name
+        self.result = result
+        self.delay = delay
+        self.calls = []
+
+    async def ainvoke(self, params):
+        self.calls.append(params)
+        await asyncio.sleep(self.delay)
+        return self.result
+
+
+def _prefetch(delay: float = 0.0, ttl_seconds: float = 900.0) -> CustomerContextPrefetch:
+    return CustomerContextPrefetch(lookups=(
+        (_Lookup("shopify_get_customer_orders", _ORDERS, delay), lambda email: {"email": email, "after": "null", "limit": 10}),
+        (_Lookup("skio_get_subscriptions", _SUBSCRIPTION, delay), lambda email: {"email": email}),
+    ), ttl_seconds=ttl_seconds)
+
+
+def test_first_turn_takes_prefetched_lookups():
+    async def scenario():
+        prefetch = _prefetch()
+        prefetch.start("s1", "jane@example.com")
+        first = await prefetch.take("s1", timeout=1.0)
+        second = await prefetch.take("s1", timeout=1.0)
+        return prefetch, first, second
+
+    prefetch, first, second = asyncio.run(scenario())
+
+    assert first["order_details"]["orders"][0]["name"] == "#1201"
+    assert first["subscription_status"]["status"] == "ACTIVE"
+    assert first["current_subscription_id"] == "sub_123"
+    assert [e["tool_name"] for e in first["tool_calls_log"]] == [
+        "shopify_get_customer_orders", "skio_get_subscriptions",
+    ]
+    assert all(e["turn_index"] == 1 and e["prefetched"] for e in first["tool_calls_log"])
+    assert second == {}
+    assert prefetch.stats()["used"] == 1
+
+
+def test_slow_prefetch_does_not_hold_the_first_turn():
+    async def scenario():
+        prefetch = _prefetch(delay=0.5)
+        prefetch.start("s1", "jane@example.com")
+        return prefetch, await prefetch.take("s1", timeout=0.05)
+
+    prefetch, update = asyncio.run(scenario())
+
+    assert update == {}
+    assert prefetch.stats()["timed_out"] == 1
+
+
+def test_untaken_prefetches_are_cancelled_after_ttl():
+    async def scenario():
+        prefetch = _prefetch(delay=10.0, ttl_seconds=0.0)
+        prefetch.start("abandoned", "jane@example.com")
+        abandoned = prefetch._tasks["abandoned"][0]
+        prefetch.start("s2", "john@example.com")
+        await asyncio.sleep(0)
+        return prefetch, abandoned
+
+    prefetch, abandoned = asyncio.run(scenario())
+
+    assert abandoned.cancelled()
+    assert "abandoned" not in prefetch._tasks
+    assert prefetch.stats()["evicted"] == 1
+
+
+def test_successful_action_clears_prefetched_context():
+    class _CancelTool:
+        name = "shopify_cancel_order"
+
+        async def ainvoke(self, _args):
+            return {"success": True, "data": {}}
+
+    class _LLM:
+        def __init__(self):
+            self.calls = 0
+
+        def bind_tools(self, _tools):
+            return self
+
+        async def ainvoke(self, _conversation):
+            self.calls += 1
+            if self.calls == 1:
+                return AIMessage(content="", tool_calls=[{
+                    "id": "c1", "name": "shopify_cancel_order",
+                    "args": {"orderId": "gid://shopify/Order/5531567751245"},
+                }])
+            return AIMessage(content="Your order #1201 is cancelled.\n\nCaz")
+
+    state = {
+        "messages": [HumanMessage(content="Cancel #1201 please")],
+        "order_details": _ORDERS["data"],
+        "subscription_status": _SUBSCRIPTION["data"],
+    }
+    result = asyncio.run(_run_react_agent(_LLM(), [_CancelTool()], "You are a support agent.", state))
+
+    assert result["order_details"] is None and result["subscription_status"] is None
+
+
+def test_prefetched_context_goes_into_session_context_block():
+    context = format_customer_context(_ORDERS["data"], _SUBSCRIPTION["data"])
+    blocks = build_account_prompt(
+        first_name="Jane", last_name="Doe", email="jane@example.com",
+        customer_shopify_id="gid://shopify/Customer/1", current_date="2026-02-04",
+        day_of_week="Wednesday", wait_promise="", customer_context=context,
+    )
+
+    assert "#1201 | FULFILLED | 2026-02-03 | gid://shopify/Order/5531567751245" in blocks[-1]["text"]
+    assert "sub_123 | ACTIVE | next billing 2026-03-01" in blocks[-1]["text"]
+    assert "#1201" not in blocks[0]["text"]
+    assert format_customer_context(None, None) is None
+
+
+@pytest.mark.asyncio
+async def test_session_start_prefetch_feeds_first_message(monkeypatch):
+    prefetch = _prefetch()
+    monkeypatch.setattr(main, "customer_prefetch", prefetch)
+    monkeypatch.setattr(main, "sessions", {})
+    monkeypatch.setattr(main.database, "add_session", lambda **_kwargs: None)
+    monkeypatch.setattr(main.database, "update_preview", lambda *_args, **_kwargs: None)
+
+    started = await main.start_session(main.SessionStartRequest(
+        email="jane@example.com", first_name="Jane", last_name="Doe",
+        customer_shopify_id="gid://shopify/Customer/1",
+    ))
+    _, first = await main._prepare_turn(main.MessageRequest(session_id=started.session_id, message="Hi"))
+    _, second = await main._prepare_turn(main.MessageRequest(session_id=started.session_id, message="Thanks"))
+
+    assert first["order_details"]["orders"][0]["id"] == "gid://shopify/Order/5531567751245"
+    assert second["order_details"] is None and second["subscription_status"] is None
@@ -10,6 +10,10 @@ Requires: pip install pytest-asyncio httpx
 NOTE: These tests are designed to be run against the live system with
 real LLM calls. They validate the system behavior end-to-end.
 For CI without LLM, set MOCK_LLM=1 env var.
+
+Record once with LLM_CASSETTE_MODE=record, then rerun with
+LLM_CASSETTE_MODE=replay to serve every LLM call from tests/cassettes
+(deterministic, no model calls; see src/llm/cassette.py).
 """
 
 import json
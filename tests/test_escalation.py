@@ -6,7 +6,14 @@ import asyncio
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+
 import src.agents.escalation as escalation_module
+from src import main
+from src.graph.state import CustomerSupportState
+from src.llm.accounting import record_model_call
 
 
 class _StubLLM:
@@ -132,3 +139,110 @@ def test_health_escalation_message_includes_stop_using(monkeypatch):
     assert "stop using" in msg
     assert "health" in msg
     assert "monica" in msg
+
+
+def test_escalation_returns_before_summary_and_queue_is_updated(monkeypatch):
+    release = asyncio.Event()
+
+    class _SlowLLM:
+        async def ainvoke(self, _prompt):
+            await release.wait()
+            return SimpleNamespace(content="Customer wants a refund; refund failed.")
+
+    monkeypatch.setattr(escalation_module, "sonnet_llm", _SlowLLM())
+    monkeypatch.setattr(escalation_module, "escalation_queue", escalation_module.EscalationQueue())
+    state = {
+        "customer_first_name": "Sarah",
+        "escalation_reason": "chargeback_risk",
+        "messages": [_msg("I will dispute the charge.")],
+    }
+
+    async def run():
+        result = await escalation_module.escalation_handler_node(state)
+        payload = result["escalation_payload"]
+        release.set()
+        queued = await escalation_module.escalation_queue.wait_for_summary(payload["escalation_id"], 1)
+        return result, payload, queued
+
+    result, payload, queued = asyncio.run(run())
+
+    assert result["is_escalated"] is True
+    assert payload["summary_status"] == "pending"
+    assert "I will dispute the charge." in payload["summary"]
+    assert queued["summary_status"] == "ready"
+    assert queued["summary"] == "Customer wants a refund; refund failed."
+
+
+def test_escalation_summary_deadline_falls_back(monkeypatch):
+    class _TimeoutLLM:
+        async def ainvoke(self, _prompt):
+            raise escalation_module.LLMDeadlineExceeded()
+
+    monkeypatch.setattr(escalation_module, "sonnet_llm", _TimeoutLLM())
+    monkeypatch.setattr(escalation_module, "escalation_queue", escalation_module.EscalationQueue())
+
+    async def run():
+        result = await escalation_module.escalation_handler_node({
+            "escalation_reason": "uncertain",
+            "messages": [_msg("Need a human agent please.")],
+        })
+        escalation_id = result["escalation_payload"]["escalation_id"]
+        return await escalation_module.escalation_queue.wait_for_summary(escalation_id, 1)
+
+    queued = asyncio.run(run())
+
+    assert queued["summary_status"] == "fallback"
+    assert "deadline exceeded" in queued["summary"]
+
+
+def test_background_summary_is_written_to_the_checkpoint(monkeypatch):
+    class _RecordingLLM:
+        async def ainvoke(self, _prompt):
+            await asyncio.sleep(0.05)
+            result = SimpleNamespace(content="Customer wants a refund; refund failed.")
+            record_model_call("claude-sonnet-4-20250514", result, 0.05)
+            return result
+
+    queue = escalation_module.EscalationQueue()
+    monkeypatch.setattr(escalation_module, "sonnet_llm", _RecordingLLM())
+    monkeypatch.setattr(escalation_module, "escalation_queue", queue)
+    builder = StateGraph(CustomerSupportState)
+    builder.add_node("escalation_handler", escalation_module.escalation_handler_node)
+    builder.add_edge(START, "escalation_handler")
+    builder.add_edge("escalation_handler", END)
+    graph = builder.compile(checkpointer=InMemorySaver())
+    monkeypatch.setattr(main, "graph", graph)
+    queue.set_persister(main._persist_escalation_update)
+    config = {"configurable": {"thread_id": "escalated-session"}}
+
+    async def run():
+        await graph.ainvoke({
+            "messages": [HumanMessage(content="I will dispute the charge.")],
+            "customer_first_name": "Sarah",
+            "escalation_reason": "chargeback_risk",
+        }, config)
+        await queue.drain(timeout=5)
+        return (await graph.aget_state(config)).values
+
+    state = asyncio.run(run())
+
+    assert state["escalation_payload"]["summary_status"] == "ready"
+    assert state["escalation_payload"]["summary"] == "Customer wants a refund; refund failed."
+    assert [(c["node"], c["step"]) for c in state["model_calls"]] == [("escalation_handler", "summary")]
+
+
+def test_queue_keeps_only_the_newest_finished_payloads():
+    queue = escalation_module.EscalationQueue(max_finished=2)
+
+    async def run():
+        for n in range(4):
+            queue.add({"escalation_id": f"ESC-{n}", "created_at": f"2026-10-19T10:0{n}:00"})
+        queue.add({"escalation_id": "ESC-pending", "created_at": "2026-10-19T09:00:00"})
+        for n in range(4):
+            queue.set_summary(f"ESC-{n}", "summary", "ready")
+            await queue.persist(f"ESC-{n}", None, [])
+
+    asyncio.run(run())
+
+    assert [p["escalation_id"] for p in queue.list()] == ["ESC-3", "ESC-2", "ESC-pending"]
+    assert list(queue._done) == ["ESC-pending"]
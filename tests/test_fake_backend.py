@@ -0,0 +1,81 @@
+"""
+Tests for the offline fake LLM backend (LLM_BACKEND=fake).
+"""
+
+import asyncio
+import random
+
+import pytest
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from src.llm.fake import FakeChatModel, FakeScript, parse_latency
+
+
+def test_parse_latency_distributions():
+    rng = random.Random(0)
+
+    assert parse_latency("fixed:250", rng)() == 0.25
+    assert 0.1 <= parse_latency("uniform:100:200", rng)() <= 0.2
+    assert parse_latency("lognormal:400:0.3", rng)() > 0
+    with pytest.raises(ValueError):
+        parse_latency("pareto:1", rng)
+
+
+def test_script_tool_call_then_final_answer():
+    script = FakeScript([
+        {"match": "where is my order", "when": "no_tool_result",
+         "response": {"tool_calls": [{"name": "shopify_get_order_details", "args": {"orderId": "#1234"}}]}},
+        {"when": "tool_result", "response": "Your order is in transit.\n\nCaz"},
+    ])
+    llm = FakeChatModel("claude-sonnet", script=script).bind_tools([{"name": "shopify_get_order_details"}])
+
+    first = asyncio.run(llm.ainvoke([HumanMessage(content="Where is my order?")]))
+    call = first.tool_calls[0]
+    second = asyncio.run(llm.ainvoke([
+        HumanMessage(content="Where is my order?"),
+        first,
+        ToolMessage(content='{"status": "IN_TRANSIT"}', tool_call_id=call["id"]),
+    ]))
+
+    assert call["name"] == "shopify_get_order_details"
+    assert call["args"] == {"orderId": "#1234"}
+    assert second.content.startswith("Your order is in transit")
+    assert second.usage_metadata["input_tokens"] > 0
+
+
+def test_times_expires_rule():
+    script = FakeScript([{"times": 1, "response": "first"}])
+    llm = FakeChatModel("claude-haiku", script=script)
+
+    replies = [asyncio.run(llm.ainvoke("hi")).content for _ in range(2)]
+
+    assert replies[0] == "first"
+    assert replies[1].endswith("Caz")
+
+
+def test_defaults_satisfy_classifier_and_reflection():
+    llm = FakeChatModel("claude-haiku")
+    classified = asyncio.run(llm.ainvoke(
+        "Respond with CATEGORY|CONFIDENCE.\n\nCustomer message: I want a refund"
+    ))
+    verdict = asyncio.run(
+        llm.bind_tools([{"name": "ReflectionVerdict"}], tool_choice="ReflectionVerdict").ainvoke("review")
+    )
+
+    assert classified.content == "REFUND|90"
+    assert verdict.tool_calls[0]["args"] == {"pass": True}
+
+
+def test_astream_yields_words_then_usage():
+    async def collect():
+        llm = FakeChatModel("claude-sonnet", latency=lambda: 0.0)
+        return [chunk async for chunk in llm.astream([HumanMessage(content="hello")])]
+
+    chunks = asyncio.run(collect())
+    merged = chunks[0]
+    for chunk in chunks[1:]:
+        merged += chunk
+
+    assert len(chunks) > 2
+    assert merged.content.endswith("Caz")
+    assert merged.usage_metadata["output_tokens"] > 0
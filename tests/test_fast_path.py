@@ -0,0 +1,93 @@
+"""
+Tests for the template fast-path (positive feedback, review follow-up, greetings).
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import src.graph.graph_builder as graph_module
+import src.patterns.fast_path as fast_path_module
+import src.patterns.intent_classifier as classifier_module
+from src.patterns.fast_path import TEMPLATES, FastPathStats, match_fast_path
+
+
+def _state(text: str, intent: str, confidence: int = 95, history=()) -> dict:
+    return {
+        "messages": [*history, HumanMessage(content=text)],
+        "ticket_category": intent,
+        "intent_confidence": confidence,
+        "customer_first_name": "Jane",
+    }
+
+
+def test_match_requires_confidence_and_unambiguous_message():
+    assert match_fast_path(_state("I love these patches, my son sleeps so well!", "POSITIVE")) == "positive_feedback"
+    assert match_fast_path(_state("Hello there!", "GENERAL")) == "greeting"
+
+    assert match_fast_path(_state("I love these patches!", "POSITIVE", confidence=85)) is None
+    assert match_fast_path(_state("Love them, but where is my second order?", "POSITIVE")) is None
+    assert match_fast_path(_state("Loved them, not sure they work though", "POSITIVE")) is None
+    assert match_fast_path(_state("Hi, I need help with my order", "GENERAL")) is None
+    assert match_fast_path(_state("Hello!", "WISMO")) is None
+
+
+def test_review_follow_up_uses_link_or_declined_template():
+    ask = AIMessage(content=TEMPLATES["positive_feedback"].format(first_name="Jane"))
+    history = (HumanMessage(content="Love them!"), ask)
+
+    assert match_fast_path(_state("Yes please!", "POSITIVE", history=history)) == "review_link"
+    assert match_fast_path(_state("No thanks", "POSITIVE", history=history)) == "review_declined"
+    assert match_fast_path(_state("Sure, but can you cancel my subscription?", "POSITIVE", history=history)) is None
+
+
+def test_thank_you_after_the_review_reply_gets_a_closing_not_a_second_ask():
+    ask = AIMessage(content=TEMPLATES["positive_feedback"].format(first_name="Jane"))
+    for reply in ("review_link", "review_declined"):
+        history = (
+            HumanMessage(content="Love them!"), ask,
+            HumanMessage(content="yes"), AIMessage(content=TEMPLATES[reply].format(first_name="Jane")),
+        )
+        assert match_fast_path(_state("thanks", "POSITIVE", history=history)) == "closing"
+        assert match_fast_path(_state("Thank you!", "POSITIVE", history=history)) == "closing"
+
+
+def test_graph_answers_positive_feedback_without_agent(monkeypatch):
+    stats = FastPathStats()
+
+    async def classify(_state):
+        return {"ticket_category": "POSITIVE", "intent_confidence": 96, "current_agent": "account_agent"}
+
+    async def account_agent(_state):
+        raise AssertionError("account agent should not run")
+
+    monkeypatch.setattr(classifier_module, "SPECULATIVE_INTENT_ENABLED", False)
+    monkeypatch.setattr(fast_path_module, "fast_path_stats", stats)
+    monkeypatch.setattr(graph_module, "intent_classifier_node", classify)
+    monkeypatch.setattr(graph_module, "account_agent_node", account_agent)
+    graph = graph_module.build_graph().compile()
+
+    state = asyncio.run(graph.ainvoke({
+        "messages": [HumanMessage(content="The kids absolutely love the sleepy patches!")],
+        "customer_first_name": "Jane",
+    }))
+
+    assert state["messages"][-1].content.startswith("Awww 🥰 Jane!")
+    assert state["messages"][-1].content.endswith("Caz")
+    assert state["current_agent"] == "account_agent"
+    assert stats.stats()["by_intent"]["POSITIVE"]["hits"] == 1
+    assert stats.stats()["by_intent"]["POSITIVE"]["hit_rate"] == 1.0
+
+
+def test_stats_estimate_saved_latency_from_agent_path():
+    stats = FastPathStats()
+    stats.record_eligible("POSITIVE")
+    stats.record_eligible("POSITIVE")
+    stats.record_slow("POSITIVE", 4.0)
+    stats.record_hit("POSITIVE", 0.0)
+
+    positive = stats.stats()["by_intent"]["POSITIVE"]
+
+    assert positive["hit_rate"] == 0.5
+    assert positive["agent_path_ms"] == 4000.0
+    assert positive["saved_ms_est"] == 4000.0
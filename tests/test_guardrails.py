@@ -890,8 +890,9 @@ class TestGraphRouting:
     def test_guardrail_failed_routes_to_revise(self):
         assert _route_after_output_guardrails({"output_guardrail_passed": False}) == "revise_response"
 
-    def test_guardrail_passed_routes_to_reflection(self):
-        assert _route_after_output_guardrails({"output_guardrail_passed": True}) == "reflection_validator"
+    def test_guardrail_passed_routes_to_end(self):
+        # Drafts that need reflection take the parallel review path instead.
+        assert _route_after_output_guardrails({"output_guardrail_passed": True}) == "__end__"
 
     # Reflection
     def test_reflection_passed_routes_to_end(self):
@@ -0,0 +1,100 @@
+"""
+Tests for batched multi-message intent classification.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import src.patterns.intent_classifier as classifier_module
+from src.patterns.intent_cache import IntentCache
+from src.patterns.intent_classifier import _parse_batch_output
+
+
+class _BatchLLM:
+    """Answers batch prompts with a scripted body, single prompts with REFUND|77."""
+
+    def __init__(self, batch_text: str):
+        self.batch_text = batch_text
+        self.batch_calls = 0
+        self.single_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, prompt):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if "Customer messages:" in prompt:
+            self.batch_calls += 1
+            return SimpleNamespace(content=self.batch_text)
+        self.single_calls += 1
+        return SimpleNamespace(content="REFUND|77")
+
+
+def _patch(monkeypatch, llm):
+    monkeypatch.setattr(classifier_module, "haiku_llm", llm)
+    monkeypatch.setattr(classifier_module, "intent_cache", IntentCache())
+
+
+class TestParseBatchOutput:
+    def test_pipe_bracket_and_json_lines(self):
+        text = '1|WISMO|92\n[2] SUBSCRIPTION|88\n3: {"intent": "DISCOUNT", "confidence": 70}'
+        assert _parse_batch_output(text, 3) == {
+            0: ("WISMO", 92),
+            1: ("SUBSCRIPTION", 88),
+            2: ("DISCOUNT", 70),
+        }
+
+    def test_invalid_out_of_range_and_duplicate_lines_dropped(self):
+        text = "1|WISMO|92\n1|REFUND|90\n2|BANANA|99\n7|WISMO|90\nnoise"
+        assert _parse_batch_output(text, 3) == {0: ("WISMO", 92)}
+
+
+def test_classify_intents_batches_and_falls_back_per_item(monkeypatch):
+    llm = _BatchLLM("1|WISMO|92\n2|garbage\n3|POSITIVE|95")
+    _patch(monkeypatch, llm)
+
+    results = asyncio.run(classifier_module.classify_intents(
+        ["where is it", "hmm", "love it"], batch_size=3,
+    ))
+
+    assert results == [("WISMO", 92), ("REFUND", 77), ("POSITIVE", 95)]
+    assert llm.batch_calls == 1
+    assert llm.single_calls == 1
+
+
+def test_classify_intents_limits_concurrency_and_uses_cache(monkeypatch):
+    llm = _BatchLLM("\n".join(f"{i}|WISMO|90" for i in range(1, 3)))
+    _patch(monkeypatch, llm)
+    messages = [f"where is order {i}, message {chr(97 + i)}" for i in range(8)]
+
+    asyncio.run(classifier_module.classify_intents(messages, batch_size=2, max_concurrency=2))
+    assert llm.batch_calls == 4
+    assert llm.max_in_flight <= 2
+
+    asyncio.run(classifier_module.classify_intents(messages, batch_size=2))
+    assert llm.batch_calls == 4
+
+
+def test_failed_batch_falls_back_per_message_and_keeps_other_batches(monkeypatch):
+    class _FlakyLLM(_BatchLLM):
+        async def ainvoke(self, prompt):
+            if "Customer messages:" in prompt and "broken" in prompt:
+                raise RuntimeError("overloaded")
+            if "Customer messages:" not in prompt and "lost" in prompt:
+                raise RuntimeError("overloaded")
+            return await super().ainvoke(prompt)
+
+    llm = _FlakyLLM("1|WISMO|92\n2|POSITIVE|95")
+    cache = IntentCache()
+    monkeypatch.setattr(classifier_module, "haiku_llm", llm)
+    monkeypatch.setattr(classifier_module, "intent_cache", cache)
+
+    results = asyncio.run(classifier_module.classify_intents(
+        ["where is it", "love it", "broken patch", "lost parcel"], batch_size=2,
+    ))
+
+    assert results == [("WISMO", 92), ("POSITIVE", 95), ("REFUND", 77), ("GENERAL", 50)]
+    assert cache.get("broken patch") == ("REFUND", 77)
+    assert cache.get("lost parcel") is None
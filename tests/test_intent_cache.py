@@ -0,0 +1,75 @@
+"""
+Tests for the normalized-message intent cache.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import src.patterns.intent_classifier as classifier_module
+from src.patterns.intent_cache import IntentCache, normalize_message
+
+
+class _CountingLLM:
+    def __init__(self, text: str):
+        self.text = text
+        self.calls = 0
+
+    async def ainvoke(self, _prompt):
+        self.calls += 1
+        return SimpleNamespace(content=self.text)
+
+
+class TestNormalizeMessage:
+    def test_masks_order_numbers_and_emails(self):
+        assert normalize_message("Where is my order #43189?") == "where is my order <order>"
+        assert normalize_message("where is my order  #51234") == "where is my order <order>"
+        assert normalize_message("Order NP9363178 hasn't arrived") == "order <order> hasn t arrived"
+        assert normalize_message("I'm jane@x.com") == "i m <email>"
+
+    def test_redacted_placeholders_collapse(self):
+        assert normalize_message("Email me at [EMAIL REDACTED]") == "email me at <redacted>"
+
+
+class TestIntentCache:
+    def test_hit_after_put_and_stats(self):
+        cache = IntentCache(max_size=10, ttl_seconds=60)
+        assert cache.get("Cancel my subscription!") is None
+        cache.put("Cancel my subscription!", "SUBSCRIPTION", 95)
+        assert cache.get("cancel my   subscription") == ("SUBSCRIPTION", 95)
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_ttl_expiry(self):
+        cache = IntentCache(max_size=10, ttl_seconds=0)
+        cache.put("where is my order", "WISMO", 92)
+        assert cache.get("where is my order") is None
+
+    def test_lru_eviction(self):
+        cache = IntentCache(max_size=2, ttl_seconds=60)
+        cache.put("a message one", "WISMO", 90)
+        cache.put("a message two", "REFUND", 90)
+        cache.get("a message one")
+        cache.put("a message three", "DISCOUNT", 90)
+        assert cache.get("a message two") is None
+        assert cache.get("a message one") == ("WISMO", 90)
+
+    def test_sqlite_persistence_survives_new_instance(self, tmp_path):
+        db_path = str(tmp_path / "intent_cache.db")
+        IntentCache(db_path=db_path).put("my code doesn't work", "DISCOUNT", 93)
+        fresh = IntentCache(db_path=db_path)
+        assert fresh.get("My code doesn't work!!") == ("DISCOUNT", 93)
+        assert fresh.stats()["disk_hits"] == 1
+
+
+def test_classify_intent_serves_repeat_phrasing_from_cache(monkeypatch):
+    llm = _CountingLLM("WISMO|92")
+    monkeypatch.setattr(classifier_module, "haiku_llm", llm)
+    monkeypatch.setattr(classifier_module, "intent_cache", IntentCache(ttl_seconds=60))
+
+    first = asyncio.run(classifier_module.classify_intent("Where is my order #43189?"))
+    second = asyncio.run(classifier_module.classify_intent("where is my order #99999"))
+
+    assert first == second == ("WISMO", 92)
+    assert llm.calls == 1
@@ -0,0 +1,130 @@
+"""
+Tests for the record/replay LLM cassette layer.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from src.llm.cassette import CassetteChatModel, CassetteMiss, CassetteStore, cassette_key
+from src.llm.fake import FakeChatModel, FakeScript
+
+_PARAMS = {"model": "claude-sonnet", "temperature": 0.0, "max_tokens": 2048}
+_TOOLS = [{"name": "shopify_get_order_details", "description": "Look up an order", "parameters": {}}]
+
+
+def _script() -> FakeScript:
+    return FakeScript([
+        {"when": "no_tool_result",
+         "response": {"tool_calls": [{"name": "shopify_get_order_details", "args": {"orderId": "#1"}}]}},
+        {"when": "tool_result", "response": "It shipped.\n\nCaz"},
+    ])
+
+
+async def _react_turn(llm) -> list:
+    bound = llm.bind_tools(_TOOLS)
+    messages = [HumanMessage(content="Where is my order?")]
+    first = await bound.ainvoke(messages)
+    messages += [first, ToolMessage(content="shipped", tool_call_id=first.tool_calls[0]["id"])]
+    second = await bound.ainvoke(messages)
+    return [first, second]
+
+
+def test_record_then_replay_without_model(tmp_path):
+    store = CassetteStore(str(tmp_path))
+    recorder = CassetteChatModel(FakeChatModel("claude-sonnet", script=_script()), store, "record", _PARAMS)
+    recorded = asyncio.run(_react_turn(recorder))
+
+    replayer = CassetteChatModel(None, CassetteStore(str(tmp_path)), "replay", _PARAMS)
+    replayed = asyncio.run(_react_turn(replayer))
+
+    assert store.stats()["recorded"] == 2
+    assert replayed[0].tool_calls == recorded[0].tool_calls
+    assert replayed[1].content == "It shipped.\n\nCaz"
+    assert replayer.store.stats()["hit_rate"] == 1.0
+
+
+def test_replay_miss_raises(tmp_path):
+    replayer = CassetteChatModel(None, CassetteStore(str(tmp_path)), "replay", _PARAMS)
+
+    with pytest.raises(CassetteMiss):
+        asyncio.run(replayer.ainvoke("hello"))
+
+
+def test_auto_records_once(tmp_path):
+    store = CassetteStore(str(tmp_path))
+    llm = CassetteChatModel(FakeChatModel("claude-haiku"), store, "auto", _PARAMS)
+
+    asyncio.run(llm.ainvoke("hello"))
+    asyncio.run(llm.ainvoke("hello"))
+
+    assert store.stats() | {"path": ""} == {
+        "path": "", "hits": 1, "misses": 1, "recorded": 1, "hit_rate": 0.5,
+    }
+
+
+def test_key_covers_params_tools_and_bind_kwargs():
+    base = cassette_key(_PARAMS, _TOOLS, {}, "hello")
+
+    assert cassette_key(_PARAMS, _TOOLS, {}, [HumanMessage(content="hello")]) == base
+    assert cassette_key({**_PARAMS, "max_tokens": 1024}, _TOOLS, {}, "hello") != base
+    assert cassette_key(_PARAMS, [], {}, "hello") != base
+    assert cassette_key(_PARAMS, _TOOLS, {"tool_choice": "any"}, "hello") != base
+
+
+def test_astream_replays_recorded_stream(tmp_path):
+    async def collect(llm):
+        merged = None
+        async for chunk in llm.astream("hello"):
+            merged = chunk if merged is None else merged + chunk
+        return merged
+
+    store = CassetteStore(str(tmp_path))
+    recorded = asyncio.run(collect(CassetteChatModel(FakeChatModel("claude-sonnet"), store, "record", _PARAMS)))
+    replayed = asyncio.run(collect(CassetteChatModel(None, store, "replay", _PARAMS)))
+
+    assert replayed.content == recorded.content
+    assert replayed.usage_metadata == recorded.usage_metadata
+
+
+# Recorded discount-code turn (two calls; recorded with LLM_BACKEND=fake so it needs no API key).
+_RECORDED = Path(__file__).parent / "cassettes" / "discount_turn"
+_DISCOUNT_PARAMS = {"model": "claude-sonnet-4-20250514", "temperature": 0.0, "max_tokens": 2048}
+_DISCOUNT_TOOLS = [{
+    "name": "shopify_create_discount_code",
+    "description": "Create a one-off discount code",
+    "parameters": {"type": "object", "properties": {
+        "type": {"type": "string"}, "value": {"type": "number"}, "duration": {"type": "integer"},
+    }},
+}]
+
+
+def test_committed_cassette_replays_despite_volatile_tool_fields():
+    llm = CassetteChatModel(None, CassetteStore(str(_RECORDED)), "replay", _DISCOUNT_PARAMS).bind_tools(_DISCOUNT_TOOLS)
+
+    async def turn():
+        messages = [HumanMessage(content="Can I get a discount code for my next order?")]
+        first = await llm.ainvoke(messages)
+        # A fresh code and expiry, unlike the recording's.
+        result = {"success": True, "data": {"code": "NATPAT_Q7W2E9R4T1", "expiresAt": "2031-01-02T03:04:05+00:00"}}
+        messages += [first, ToolMessage(content=json.dumps(result), tool_call_id=first.tool_calls[0]["id"])]
+        return first, await llm.ainvoke(messages)
+
+    first, second = asyncio.run(turn())
+
+    assert first.tool_calls[0]["name"] == "shopify_create_discount_code"
+    assert second.content.startswith("Hey Jane! Here is 10% off")
+    assert llm.store.stats()["hit_rate"] == 1.0
+
+
+def test_key_ignores_volatile_tool_result_fields():
+    def key(result: dict) -> str:
+        return cassette_key(_PARAMS, _TOOLS, {}, [ToolMessage(content=json.dumps(result), tool_call_id="t1")])
+
+    base = key({"code": "NATPAT_AAAA", "createdAt": "2026-10-19T10:00:00Z", "id": "gid://shopify/Return/3fa9c2b1e0d4"})
+
+    assert key({"code": "NATPAT_BBBB", "createdAt": "2026-10-20T11:30:00Z", "id": "gid://shopify/Return/77aa01c2d3e4"}) == base
+    assert key({"code": "NATPAT_AAAA", "createdAt": "2026-10-19T10:00:00Z", "id": "gid://shopify/Order/5531"}) != base
@@ -0,0 +1,117 @@
+"""
+Tests for deadline-aware hedged LLM calls.
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.config import LLM_HEDGE_NODES
+from src.llm.accounting import track_model_calls
+from src.llm.hedging import HedgedChatModel, LLMDeadlineExceeded
+
+
+class _DelayModel:
+    def __init__(self, name: str, delay: float, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.started = 0
+        self.cancelled = 0
+
+    async def ainvoke(self, _prompt, _config=None, **_kwargs):
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return AIMessage(content=self.name)
+
+    def bind_tools(self, tools, **_kwargs):
+        return _DelayModel(self.name, self.delay, self.fail)
+
+
+def test_fast_primary_does_not_fire_hedge():
+    primary, fallback = _DelayModel("sonnet", 0.01), _DelayModel("haiku", 0.01)
+    llm = HedgedChatModel(primary, fallback, hedge_after_s=0.2)
+
+    assert asyncio.run(llm.ainvoke("hi")).content == "sonnet"
+    assert fallback.started == 0
+    assert llm.stats()["hedges_fired"] == 0
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    primary, fallback = _DelayModel("sonnet", 1.0), _DelayModel("haiku", 0.01)
+    llm = HedgedChatModel(primary, fallback, hedge_after_s=0.02)
+
+    assert asyncio.run(llm.ainvoke("hi")).content == "haiku"
+    assert primary.cancelled == 1
+    assert llm.stats()["hedges_won"] == 1
+
+
+def test_hedge_without_fallback_retries_primary():
+    primary = _DelayModel("sonnet", 0.05)
+    llm = HedgedChatModel(primary, hedge_after_s=0.01)
+
+    assert asyncio.run(llm.ainvoke("hi")).content == "sonnet"
+    assert primary.started == 2
+
+
+def test_failed_attempt_waits_for_the_other():
+    primary, fallback = _DelayModel("sonnet", 0.05), _DelayModel("haiku", 0.0, fail=True)
+    llm = HedgedChatModel(primary, fallback, hedge_after_s=0.01)
+
+    assert asyncio.run(llm.ainvoke("hi")).content == "sonnet"
+
+
+def test_call_timeout_raises_deadline_exceeded():
+    llm = HedgedChatModel(_DelayModel("sonnet", 1.0), call_timeout_s=0.05)
+
+    with pytest.raises(LLMDeadlineExceeded):
+        asyncio.run(llm.ainvoke("hi"))
+    assert llm.stats()["deadlines_exceeded"] == 1
+
+
+def test_node_budget_is_shared_across_calls_in_a_node():
+    llm = HedgedChatModel(_DelayModel("sonnet", 0.06), node_budgets_s={"supervisor": 0.1})
+
+    @track_model_calls("supervisor")
+    async def node(_state):
+        await llm.ainvoke("first")
+        await llm.ainvoke("second")  # only ~0.04s of budget left
+        return {}
+
+    with pytest.raises(LLMDeadlineExceeded):
+        asyncio.run(node({}))
+
+
+def test_bound_models_share_stats():
+    llm = HedgedChatModel(_DelayModel("sonnet", 1.0), call_timeout_s=0.02)
+    bound = llm.bind_tools(["tool"])
+
+    with pytest.raises(LLMDeadlineExceeded):
+        asyncio.run(bound.ainvoke("hi"))
+    assert llm.stats()["deadlines_exceeded"] == 1
+
+
+def test_only_hedge_nodes_fire_a_hedge():
+    primary, fallback = _DelayModel("sonnet", 0.05), _DelayModel("haiku", 0.0)
+    llm = HedgedChatModel(primary, fallback, hedge_after_s=0.01, hedge_nodes=LLM_HEDGE_NODES)
+    bound = llm.bind_tools(["shopify_cancel_order"])
+
+    @track_model_calls("wismo_agent")
+    async def agent(_state):
+        return {"reply": (await bound.ainvoke("cancel it")).content}
+
+    @track_model_calls("reflection_validator")
+    async def reflection(_state):
+        return {"reply": (await llm.ainvoke("check it")).content}
+
+    assert asyncio.run(agent({}))["reply"] == "sonnet"
+    assert asyncio.run(reflection({}))["reply"] == "haiku"
+    assert llm.stats()["hedges_fired"] == 1
+    assert not {"wismo_agent", "issue_agent", "account_agent"} & LLM_HEDGE_NODES
@@ -0,0 +1,123 @@
+"""
+Tests for the per-model LLM limiter.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.llm.limiter import (
+    ModelLimiter,
+    Priority,
+    RateLimitedChatModel,
+    estimate_tokens,
+    llm_priority,
+)
+
+
+class _SlowModel:
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.order: list[str] = []
+
+    async def ainvoke(self, prompt, _config=None, **_kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.order.append(prompt)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return SimpleNamespace(content="ok", usage_metadata={"input_tokens": 5, "output_tokens": 3})
+
+    def bind_tools(self, tools, **_kwargs):
+        bound = _SlowModel(self.delay)
+        bound.tools = tools
+        return bound
+
+
+def test_estimate_tokens_handles_strings_and_messages():
+    assert estimate_tokens("x" * 40) == 10
+    assert estimate_tokens([SimpleNamespace(content="x" * 40), SimpleNamespace(content="y" * 8)]) == 12
+
+
+def test_max_in_flight_is_enforced_and_wait_recorded():
+    limiter = ModelLimiter("test", max_in_flight=2)
+    model = _SlowModel()
+    llm = RateLimitedChatModel(model, limiter)
+
+    async def _run():
+        await asyncio.gather(*(llm.ainvoke(f"call {i}") for i in range(6)))
+
+    asyncio.run(_run())
+    stats = limiter.stats()
+    assert model.max_in_flight == 2
+    assert stats["granted"] == 6
+    assert stats["in_flight"] == 0
+    assert stats["queue_wait_ms_max"] > 0
+
+
+def test_interactive_calls_jump_background_queue():
+    limiter = ModelLimiter("test", max_in_flight=1)
+    model = _SlowModel()
+    llm = RateLimitedChatModel(model, limiter)
+
+    async def _background(i):
+        with llm_priority(Priority.BACKGROUND):
+            await llm.ainvoke(f"background {i}")
+
+    async def _run():
+        first = asyncio.create_task(llm.ainvoke("first"))
+        await asyncio.sleep(0)
+        background = [asyncio.create_task(_background(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(llm.ainvoke("interactive"))
+        await asyncio.gather(first, interactive, *background)
+
+    asyncio.run(_run())
+    assert model.order[:2] == ["first", "interactive"]
+
+
+def test_requests_per_minute_bucket_delays_burst():
+    limiter = ModelLimiter("test", requests_per_minute=600)  # 10/s, burst of 600
+    limiter._requests.level = 1.0
+    llm = RateLimitedChatModel(_SlowModel(delay=0), limiter)
+
+    async def _run():
+        await asyncio.gather(llm.ainvoke("a"), llm.ainvoke("b"))
+
+    asyncio.run(_run())
+    assert limiter.stats()["queue_wait_ms_max"] >= 50
+
+
+def test_bind_tools_keeps_limiter():
+    limiter = ModelLimiter("test")
+    bound = RateLimitedChatModel(_SlowModel(), limiter).bind_tools(["tool"])
+    assert isinstance(bound, RateLimitedChatModel)
+    assert bound.limiter is limiter
+    assert bound.tools == ["tool"]
+
+
+def test_only_uncached_input_is_charged_to_the_input_bucket():
+    class _CachedModel:
+        async def ainvoke(self, _prompt, _config=None, **_kwargs):
+            return SimpleNamespace(content="ok", usage_metadata={
+                "input_tokens": 9000, "output_tokens": 300,
+                "input_token_details": {"cache_read": 8800},
+            })
+
+        async def astream(self, prompt, config=None, **kwargs):
+            yield await self.ainvoke(prompt, config, **kwargs)
+
+    limiter = ModelLimiter("test", tokens_per_minute=1000, output_tokens_per_minute=1000)
+    llm = RateLimitedChatModel(_CachedModel(), limiter)
+
+    async def _run():
+        await llm.ainvoke("x" * 2000)  # estimated 500 input tokens, really 200 uncached
+        async for _ in llm.astream("x" * 2000):
+            pass
+
+    asyncio.run(_run())
+    stats = limiter.stats()
+    assert (stats["input_tokens"], stats["output_tokens"]) == (400, 600)
+    assert 550 <= limiter._tokens.level <= 1000  # the 2 × 300 token over-estimate was given back
+    assert limiter._output_tokens.level <= 410
@@ -0,0 +1,97 @@
+"""
+Tests for per-call model accounting (tokens, latency, cost).
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.llm.accounting import (
+    ModelCallLedger,
+    estimate_cost,
+    model_call_ledger,
+    model_call_step,
+    summarize_model_calls,
+    track_model_calls,
+)
+from src.llm.limiter import ModelLimiter, RateLimitedChatModel
+from src.tracing.models import build_session_trace
+
+
+class _UsageModel:
+    async def ainvoke(self, _prompt, _config=None, **_kwargs):
+        return AIMessage(
+            content="ok",
+            usage_metadata={
+                "input_tokens": 2000,
+                "output_tokens": 100,
+                "total_tokens": 2100,
+                "input_token_details": {"cache_read": 1500},
+            },
+        )
+
+
+def _llm(model_name="claude-sonnet-4-20250514"):
+    return RateLimitedChatModel(_UsageModel(), ModelLimiter("test"), model_name)
+
+
+def test_estimate_cost_prices_cache_reads_separately():
+    # 500 uncached × $3 + 1500 cached × $0.30 + 100 out × $15, per 1M tokens
+    assert estimate_cost("claude-sonnet-4-20250514", 2000, 100, cache_read=1500) == 0.00345
+    assert estimate_cost("unknown-model", 2000, 100) == 0.0
+
+
+def test_tracked_node_returns_model_calls_with_node_and_step():
+    llm = _llm()
+
+    @track_model_calls("wismo_agent")
+    async def node(_state):
+        with model_call_step("react_iteration_1"):
+            await llm.ainvoke("hi")
+        await llm.ainvoke("again")
+        return {"current_agent": "wismo_agent"}
+
+    output = asyncio.run(node({}))
+
+    calls = output["model_calls"]
+    assert [c["step"] for c in calls] == ["react_iteration_1", None]
+    assert all(c["node"] == "wismo_agent" for c in calls)
+    assert calls[0]["model"] == "claude-sonnet-4-20250514"
+    assert calls[0]["input_tokens"] == 2000
+    assert calls[0]["cache_read_tokens"] == 1500
+    assert calls[0]["cost_usd"] == 0.00345
+    assert calls[0]["latency_ms"] >= 0
+
+
+def test_untracked_calls_only_reach_the_ledger():
+    model_call_ledger.clear()
+    asyncio.run(_llm("claude-haiku-4-5-20251001").ainvoke("hi"))
+
+    (day,) = model_call_ledger.stats()["per_day"].values()
+    assert day["totals"]["calls"] == 1
+    assert "unscoped" in day["by_node"]
+    assert "claude-haiku-4-5-20251001" in day["by_model"]
+
+
+def test_ledger_keeps_per_day_buckets():
+    ledger = ModelCallLedger(max_days=2)
+    for day in ("2026-01-01", "2026-01-02", "2026-01-03"):
+        ledger.add({"node": "supervisor", "model": "m", "input_tokens": 10, "timestamp": f"{day}T10:00:00"})
+    assert list(ledger.stats()["per_day"]) == ["2026-01-02", "2026-01-03"]
+
+
+def test_session_trace_summarizes_model_calls():
+    calls = [
+        {"node": "intent_classifier", "model": "haiku", "input_tokens": 100, "output_tokens": 5, "cost_usd": 0.0001},
+        {"node": "wismo_agent", "model": "sonnet", "input_tokens": 2000, "output_tokens": 80, "cost_usd": 0.003},
+        {"node": "wismo_agent", "model": "sonnet", "input_tokens": 2200, "output_tokens": 60, "cost_usd": 0.002},
+    ]
+    state = {"messages": [HumanMessage(content="Where is my order?")], "model_calls": calls}
+
+    trace = build_session_trace("session_1", state)
+
+    assert trace.model_calls["calls"] == calls
+    assert trace.model_calls["totals"]["calls"] == 3
+    assert trace.model_calls["by_node"]["wismo_agent"]["input_tokens"] == 4200
+    assert trace.model_calls["by_model"]["haiku"]["cost_usd"] == 0.0001
+    assert summarize_model_calls([])["totals"]["calls"] == 0
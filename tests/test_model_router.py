@@ -0,0 +1,94 @@
+"""
+Tests for per-turn Haiku/Sonnet routing of the ReAct agents.
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import src.agents.model_router as router_module
+import src.agents.react_agents as agents_module
+from src.agents.model_router import ModelRouterStats, choose_agent_model
+
+
+class _ReplyLLM:
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.calls = 0
+
+    def bind_tools(self, _tools, **_kwargs):
+        return self
+
+    async def ainvoke(self, _conversation, _config=None, **_kwargs):
+        self.calls += 1
+        return AIMessage(content=self.reply)
+
+
+def _state(text="Where is my order #1234?", intent="WISMO", confidence=95, **extra) -> dict:
+    return {
+        "messages": [HumanMessage(content=text)],
+        "ticket_category": intent,
+        "intent_confidence": confidence,
+        "customer_first_name": "Jane",
+        **extra,
+    }
+
+
+def test_simple_wismo_turn_picks_haiku(monkeypatch):
+    monkeypatch.setattr(router_module, "haiku_llm", object())
+
+    assert choose_agent_model("wismo_agent", _state()).tier == "haiku"
+
+
+def test_complex_signals_keep_sonnet(monkeypatch):
+    monkeypatch.setattr(router_module, "haiku_llm", object())
+
+    cases = [
+        _state(intent="REFUND"),
+        _state(confidence=82),
+        _state(text="Where is my order? If it's not here I want a refund"),
+        _state(reflection_failures=1),
+        _state(flag_escalation_risk=True),
+        {**_state(), "messages": [HumanMessage(content="hi")] * 3},
+    ]
+
+    for state in cases:
+        choice = choose_agent_model("wismo_agent", state)
+        assert choice.tier == "sonnet", state
+        assert choice.reasons
+
+
+def test_failed_haiku_draft_is_rerun_on_sonnet(monkeypatch):
+    stats = ModelRouterStats()
+    haiku = _ReplyLLM("Your order is on the way.")  # no first name, no signature
+    sonnet = _ReplyLLM("Hey Jane! Your order #1234 is on its way to you.\n\nCaz")
+    monkeypatch.setattr(router_module, "haiku_llm", haiku)
+    monkeypatch.setattr(agents_module, "model_router_stats", stats)
+    agents_module.compile_agents(llm=sonnet, haiku=haiku)
+    try:
+        result = asyncio.run(agents_module.wismo_agent_node(_state()))
+    finally:
+        agents_module.compile_agents()
+
+    assert haiku.calls == 1
+    assert sonnet.calls == 1
+    assert result["agent_model"] == "sonnet"
+    assert result["messages"][-1].content.startswith("Hey Jane!")
+    assert any("rerunning on sonnet" in line for line in result["agent_reasoning"])
+    assert stats.stats()["upgrades"] == {"wismo_agent": 1}
+
+
+def test_good_haiku_draft_is_kept(monkeypatch):
+    haiku = _ReplyLLM("Hey Jane! Your order #1234 is on its way to you.\n\nCaz")
+    sonnet = _ReplyLLM("unused")
+    monkeypatch.setattr(router_module, "haiku_llm", haiku)
+    monkeypatch.setattr(agents_module, "model_router_stats", ModelRouterStats())
+    agents_module.compile_agents(llm=sonnet, haiku=haiku)
+    try:
+        result = asyncio.run(agents_module.wismo_agent_node(_state()))
+    finally:
+        agents_module.compile_agents()
+
+    assert sonnet.calls == 0
+    assert result["agent_model"] == "haiku"
+    assert result["agent_reasoning"][0].startswith("MODEL ROUTER: haiku")
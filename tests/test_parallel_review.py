@@ -0,0 +1,137 @@
+"""
+Tests for the parallel draft review (output checks ‖ reflection → review_join).
+"""
+
+import asyncio
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import src.graph.graph_builder as graph_module
+import src.patterns.intent_classifier as classifier_module
+import src.patterns.reflection as reflection_module
+from src.graph.graph_builder import _route_draft, review_join_node
+
+
+class _ReflectionModel:
+    def __init__(self, verdict: dict):
+        self.verdict = verdict
+        self.calls = 0
+
+    async def ainvoke(self, _prompt, _config=None, **_kwargs):
+        self.calls += 1
+        return AIMessage(content=json.dumps(self.verdict))
+
+
+def _run_turn(monkeypatch, draft: str, verdict: dict) -> tuple[dict, _ReflectionModel]:
+    reflection_llm = _ReflectionModel(verdict)
+
+    async def classify(_state):
+        return {"ticket_category": "REFUND", "intent_confidence": 95, "current_agent": "issue_agent"}
+
+    async def agent(_state):
+        return {"messages": [AIMessage(content=draft)]}
+
+    async def revise(state):
+        return {
+            "messages": [AIMessage(content="Revised reply for you.\n\nCaz")],
+            "was_revised": True,
+            "agent_reasoning": [f"REVISION: {state.get('reflection_rule_violated')}"],
+        }
+
+    monkeypatch.setattr(classifier_module, "SPECULATIVE_INTENT_ENABLED", False)
+    monkeypatch.setattr(reflection_module, "haiku_llm", reflection_llm)
+    monkeypatch.setattr(graph_module, "intent_classifier_node", classify)
+    monkeypatch.setattr(graph_module, "issue_agent_node", agent)
+    monkeypatch.setattr(graph_module, "revise_response_node", revise)
+    graph = graph_module.build_graph().compile()
+    state = asyncio.run(graph.ainvoke({
+        "messages": [HumanMessage(content="I want a refund for my order")],
+        "customer_first_name": "Jane",
+    }))
+    return state, reflection_llm
+
+
+def test_route_draft_fans_out_only_reviewable_drafts():
+    refund = {"messages": [AIMessage(content="I've issued your refund.\n\nCaz")]}
+    info = {"messages": [AIMessage(content="Your order shipped Monday.\n\nCaz")]}
+    handoff = {"messages": [AIMessage(content="HANDOFF: issue_agent | REASON: refund")]}
+    escalate = {"messages": [AIMessage(content="ESCALATE: reship | REASON: refund")]}
+
+    assert _route_draft(refund) == ["output_checks", "reflection_check"]
+    assert _route_draft(info) == "output_guardrails"
+    assert _route_draft(handoff) == "output_guardrails"
+    assert _route_draft(escalate) == "output_guardrails"
+
+
+def test_review_join_prefers_output_guardrail_failure():
+    verdict = {"reflection_passed": False, "reflection_rule_violated": "TONE"}
+
+    failed = asyncio.run(review_join_node({
+        "output_guardrail_passed": False,
+        "reflection_rule_violated": "OUTPUT_GUARDRAILS",
+        "reflection_verdict": verdict,
+    }))
+    passed = asyncio.run(review_join_node({
+        "output_guardrail_passed": True,
+        "reflection_verdict": verdict,
+    }))
+
+    assert "reflection_rule_violated" not in failed
+    assert failed["reflection_verdict"] is None
+    assert passed["reflection_passed"] is False
+    assert passed["reflection_rule_violated"] == "TONE"
+
+
+def test_graph_reflection_failure_is_revised(monkeypatch):
+    state, reflection_llm = _run_turn(
+        monkeypatch,
+        "I can offer you store credit for the order value.\n\nCaz",
+        {"pass": False, "rule_violated": "RESOLUTION_ORDER", "reason": "r", "suggested_fix": "f"},
+    )
+
+    assert reflection_llm.calls == 1
+    assert state["messages"][-1].content.startswith("Revised reply")
+    assert "REVISION: RESOLUTION_ORDER" in state["agent_reasoning"]
+    assert state["reflection_verdict"] is None
+
+
+def test_graph_guardrail_failure_wins_over_reflection(monkeypatch):
+    state, reflection_llm = _run_turn(
+        monkeypatch,
+        "Unlike Zevo, I can offer you store credit for the order value.\n\nCaz",
+        {"pass": True},
+    )
+
+    assert reflection_llm.calls == 1
+    assert any(r.startswith("OUTPUT GUARDRAIL: FAILED") for r in state["agent_reasoning"])
+    assert "REVISION: OUTPUT_GUARDRAILS" in state["agent_reasoning"]
+
+
+def test_graph_handoff_draft_skips_reflection(monkeypatch):
+    async def handoff_router(_state):
+        return {"handoff_target": "supervisor", "is_handoff": False}
+
+    async def supervisor(_state):
+        return {
+            "supervisor_route_decision": "respond_direct",
+            "messages": [AIMessage(content="Happy to help with anything else!\n\nCaz")],
+        }
+
+    monkeypatch.setattr(graph_module, "handoff_router_node", handoff_router)
+    monkeypatch.setattr(graph_module, "supervisor_node", supervisor)
+    state, reflection_llm = _run_turn(
+        monkeypatch,
+        "HANDOFF: supervisor | REASON: refund refused",
+        {"pass": True},
+    )
+
+    assert reflection_llm.calls == 0
+    assert state["messages"][-1].content.startswith("Happy to help")
+
+
+def test_serial_path_has_no_reflection_node():
+    graph = graph_module.build_graph()
+
+    assert "reflection_validator" not in graph.nodes
+    assert {"output_checks", "reflection_check", "review_join"} <= set(graph.nodes)
@@ -0,0 +1,111 @@
+"""
+Tests for per-intent compact prompt variants and the prompt token budgets.
+"""
+
+import asyncio
+import os
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+import src.agents.react_agents as agents_module
+import src.patterns.intent_classifier as classifier_module
+from src.prompts.account_prompt import ACCOUNT_STATIC_PROMPT, build_account_prompt
+from src.prompts.budget import check_budgets, load_budgets, prompt_token_report
+from src.prompts.issue_prompt import ISSUE_STATIC_PROMPT, build_issue_prompt
+from src.prompts.shared_blocks import CROSS_AGENT_HANDOFF_BLOCK, GID_ORDER_NUMBER_BLOCK
+
+BUDGET_FILE = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "prompt_budgets.json")
+
+_CUSTOMER = dict(
+    first_name="Jane", last_name="Doe", email="jane@example.com",
+    customer_shopify_id="gid://shopify/Customer/1", current_date="2026-02-04",
+    day_of_week="Wednesday", wait_promise="",
+)
+
+
+@pytest.mark.parametrize(
+    "builder, full, intent, kept, dropped",
+    [
+        (build_account_prompt, ACCOUNT_STATIC_PROMPT, "SUBSCRIPTION", ["WORKFLOW C"], ["WORKFLOW A", "WORKFLOW D"]),
+        (build_account_prompt, ACCOUNT_STATIC_PROMPT, "ORDER_MODIFY", ["WORKFLOW A", "WORKFLOW B"], ["WORKFLOW C"]),
+        (build_issue_prompt, ISSUE_STATIC_PROMPT, "NO_EFFECT", ["WORKFLOW B"], ["WORKFLOW A", "WORKFLOW C"]),
+        (build_issue_prompt, ISSUE_STATIC_PROMPT, "REFUND", ["WORKFLOW A", "WORKFLOW C"], ["WORKFLOW B"]),
+    ],
+)
+def test_compact_variant_keeps_shared_blocks_and_intent_workflows(builder, full, intent, kept, dropped):
+    static = builder(**_CUSTOMER, intent=intent)[0]["text"]
+
+    assert len(static) < len(full)
+    for block in (GID_ORDER_NUMBER_BLOCK, CROSS_AGENT_HANDOFF_BLOCK, "⛔ FORBIDDEN WORDS", "TOOLS:"):
+        assert block in static
+    assert all(section in static for section in kept)
+    assert not any(section in static for section in dropped)
+
+
+def test_unknown_or_missing_intent_uses_full_prompt():
+    assert build_account_prompt(**_CUSTOMER)[0]["text"] == ACCOUNT_STATIC_PROMPT
+    assert build_account_prompt(**_CUSTOMER, intent="WISMO")[0]["text"] == ACCOUNT_STATIC_PROMPT
+    assert build_issue_prompt(**_CUSTOMER, intent=None)[0]["text"] == ISSUE_STATIC_PROMPT
+
+
+def test_prompts_within_token_budgets():
+    report = prompt_token_report()
+
+    assert check_budgets(report, load_budgets(BUDGET_FILE)) == []
+    assert {row["intent"] for row in report["prompts"] if row["agent"] == "account_agent"} == {
+        "full", "ORDER_MODIFY", "SUBSCRIPTION", "DISCOUNT", "POSITIVE",
+    }
+
+
+def test_check_budgets_flags_growth_and_missing_entries():
+    report = {"prompts": [
+        {"agent": "issue_agent", "intent": "full", "total_tokens": 3000},
+        {"agent": "issue_agent", "intent": "REFUND", "total_tokens": 2000},
+    ]}
+
+    assert check_budgets(report, {"issue_agent/full": 2900}) == [
+        "issue_agent/full: 3000 tokens > budget 2900",
+        "issue_agent/REFUND: no budget (add it to the budget file)",
+    ]
+
+
+def test_agent_turn_uses_variant_for_ticket_category():
+    class _CaptureLLM:
+        system = None
+
+        def bind_tools(self, _tools, **_kwargs):
+            return self
+
+        async def ainvoke(self, conversation, _config=None, **_kwargs):
+            _CaptureLLM.system = conversation[0].content[0]["text"]
+            return AIMessage(content="Hey Jane! Happy to help with your subscription.\n\nCaz")
+
+    agents_module.compile_agents(llm=_CaptureLLM(), haiku=_CaptureLLM())
+    try:
+        asyncio.run(agents_module.account_agent_node({
+            "messages": [HumanMessage(content="I want to cancel my subscription")],
+            "ticket_category": "SUBSCRIPTION",
+            "intent_confidence": 95,
+            "customer_first_name": "Jane",
+        }))
+    finally:
+        agents_module.compile_agents()
+
+    assert "WORKFLOW C — SUBSCRIPTION MANAGEMENT" in _CaptureLLM.system
+    assert "WORKFLOW A — ORDER CANCELLATION" not in _CaptureLLM.system
+
+
+def test_same_agent_intent_change_updates_category(monkeypatch):
+    async def classify(_message):
+        return ("DISCOUNT", 92), []
+
+    monkeypatch.setattr(classifier_module, "_classify_turn_message", classify)
+    output = asyncio.run(classifier_module.intent_shift_check_node({
+        "messages": [HumanMessage(content="Actually, could I get a discount code instead?")],
+        "current_agent": "account_agent",
+        "ticket_category": "SUBSCRIPTION",
+    }))
+
+    assert output["intent_shifted"] is False
+    assert output["ticket_category"] == "DISCOUNT"
@@ -0,0 +1,123 @@
+"""
+Tests for the prompt-cache friendly system prompt layout.
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agents.react_agents import _run_react_agent
+from src.llm.usage import cache_usage, format_cache_usage
+from src.prompts import (
+    build_account_prompt,
+    build_issue_prompt,
+    build_supervisor_prompt,
+    build_wismo_prompt,
+    prompt_text,
+)
+
+
+def _customer(first_name, email, shopify_id, day):
+    return dict(
+        first_name=first_name,
+        last_name="Tester",
+        email=email,
+        customer_shopify_id=shopify_id,
+        current_date=f"2026-01-0{len(day)}",
+        day_of_week=day,
+    )
+
+
+@pytest.mark.parametrize(
+    "builder, needs_wait_promise",
+    [
+        (build_wismo_prompt, True),
+        (build_issue_prompt, True),
+        (build_account_prompt, True),
+        (build_supervisor_prompt, False),
+    ],
+)
+def test_static_prefix_is_shared_across_customers(builder, needs_wait_promise):
+    a = _customer("Alice", "alice@example.com", "gid://shopify/Customer/111", "Monday")
+    b = _customer("Bob", "bob@example.com", "gid://shopify/Customer/222", "Friday")
+    if needs_wait_promise:
+        a["wait_promise"] = "until Friday"
+        b["wait_promise"] = "until early next week"
+
+    blocks_a, blocks_b = builder(**a), builder(**b)
+
+    assert blocks_a[0] == blocks_b[0]
+    assert blocks_a[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in blocks_a[-1]
+    for value in ("Alice", "alice@example.com", "111", "Monday"):
+        assert value not in blocks_a[0]["text"]
+        assert value in blocks_a[-1]["text"]
+    assert "SESSION CONTEXT" in prompt_text(blocks_a)
+
+
+def test_wait_promise_only_in_wismo_session_context():
+    kwargs = _customer("Alice", "alice@example.com", "1", "Monday")
+    wismo = build_wismo_prompt(**kwargs, wait_promise="until Friday")
+    issue = build_issue_prompt(**kwargs, wait_promise="until Friday")
+    assert 'WAIT PROMISE for today: "until Friday"' in wismo[-1]["text"]
+    assert "WAIT PROMISE" not in issue[-1]["text"]
+
+
+def test_cache_usage_breakdown():
+    message = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": 1500,
+            "output_tokens": 20,
+            "total_tokens": 1520,
+            "input_token_details": {"cache_read": 1200, "cache_creation": 0},
+        },
+    )
+    assert cache_usage(message) == {
+        "input_tokens": 1500,
+        "cache_read": 1200,
+        "cache_creation": 0,
+        "uncached": 300,
+    }
+    assert "cached 1200" in format_cache_usage(message)
+    assert format_cache_usage(AIMessage(content="no usage")) == ""
+
+
+class _CachedLLM:
+    def __init__(self):
+        self.conversation = None
+
+    def bind_tools(self, _tools):
+        return self
+
+    async def ainvoke(self, conversation):
+        self.conversation = conversation
+        return AIMessage(
+            content="Done.\n\nCaz",
+            usage_metadata={
+                "input_tokens": 2000,
+                "output_tokens": 5,
+                "total_tokens": 2005,
+                "input_token_details": {"cache_read": 1800},
+            },
+        )
+
+
+def test_react_loop_sends_blocks_and_reports_cache_hits():
+    llm = _CachedLLM()
+    blocks = build_wismo_prompt(
+        **_customer("Alice", "alice@example.com", "1", "Monday"),
+        wait_promise="until Friday",
+    )
+    result = asyncio.run(
+        _run_react_agent(
+            llm=llm,
+            tools=[],
+            system_prompt=blocks,
+            state={"messages": [HumanMessage(content="Where is my order?")]},
+        )
+    )
+
+    assert llm.conversation[0].content == blocks
+    assert any("cached 1800" in line for line in result["agent_reasoning"])
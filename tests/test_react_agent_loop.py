@@ -3,6 +3,7 @@ Tests for the internal ReAct loop guardrail state behavior.
 """
 
 import asyncio
+import time
 
 from langchain_core.messages import AIMessage, HumanMessage
 
@@ -20,7 +21,7 @@ class _StubLLM:
     def __init__(self):
         self._turn = 0
 
-    def bind_tools(self, _tools):
+    def bind_tools(self, _tools, **_kwargs):
         return self
 
     async def ainvoke(self, _conversation):
@@ -69,3 +70,128 @@ def test_react_loop_uses_live_guardrail_state_for_discount_limit():
     assert "Already created a discount code" in result["tool_calls_log"][1]["result"]["error"]
     assert result["discount_code_created"] is True
     assert result["discount_code_created_count"] == 1
+
+
+class _CountingLLM:
+    def __init__(self):
+        self.bind_calls = 0
+
+    def bind_tools(self, _tools):
+        self.bind_calls += 1
+        return self
+
+    async def ainvoke(self, _conversation):
+        return AIMessage(content="All good.\n\nCaz")
+
+
+def test_compiled_agent_binds_tools_once_across_turns():
+    from src.agents.react_agents import CompiledAgent
+    from src.tools.tool_groups import wismo_tools
+
+    llm = _CountingLLM()
+    agent = CompiledAgent("wismo_agent", llm, wismo_tools)
+    assert set(agent.tool_map) == {t.name for t in wismo_tools}
+    assert [s["name"] for s in agent.tool_schemas] == [t.name for t in wismo_tools]
+
+    for _ in range(3):
+        asyncio.run(
+            _run_react_agent(
+                agent.llm,
+                agent.tools,
+                "You are a support agent.",
+                {"messages": [HumanMessage(content="Where is my order?")]},
+                compiled=agent,
+            )
+        )
+
+    assert llm.bind_calls == 1
+
+
+class _SlowTool:
+    def __init__(self, name: str, data: dict, delay: float = 0.2):
+        self.name = name
+        self.data = data
+        self.delay = delay
+        self.calls = 0
+
+    async def ainvoke(self, _args):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"success": True, "data": self.data}
+
+
+class _ScriptedLLM:
+    def __init__(self, tool_calls: list[dict]):
+        self.tool_calls = tool_calls
+        self._turn = 0
+
+    def bind_tools(self, _tools):
+        return self
+
+    async def ainvoke(self, _conversation):
+        self._turn += 1
+        if self._turn == 1:
+            return AIMessage(content="", tool_calls=self.tool_calls)
+        return AIMessage(content="Done.\n\nCaz")
+
+
+def test_read_only_tool_calls_run_concurrently_and_keep_order():
+    orders = _SlowTool("shopify_get_customer_orders", {"orders": []})
+    details = _SlowTool("shopify_get_order_details", {"id": "gid://shopify/Order/9", "name": "#1009"})
+    subscriptions = _SlowTool("skio_get_subscriptions", {"subscriptionId": "sub_1"})
+    llm = _ScriptedLLM([
+        {"id": "c1", "name": "shopify_get_customer_orders", "args": {"email": "a@b.co"}},
+        {"id": "c2", "name": "shopify_get_order_details", "args": {"orderId": "#1009"}},
+        {"id": "c3", "name": "skio_get_subscriptions", "args": {"email": "a@b.co"}},
+        {"id": "c4", "name": "shopify_get_order_details", "args": {"orderId": "1009"}},
+    ])
+
+    started = time.perf_counter()
+    result = asyncio.run(_run_react_agent(
+        llm, [orders, details, subscriptions], "You are a support agent.",
+        {"messages": [HumanMessage(content="Where is my order #1009?")]},
+    ))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.4
+    assert [e["tool_name"] for e in result["tool_calls_log"]] == [
+        "shopify_get_customer_orders", "shopify_get_order_details",
+        "skio_get_subscriptions", "shopify_get_order_details",
+    ]
+    # "1009" is corrected to "#1009" and caught as a duplicate of c2 within the batch.
+    assert "Duplicate tool call" in result["tool_calls_log"][3]["result"]["error"]
+    assert details.calls == 1
+    assert result["current_order_id"] == "gid://shopify/Order/9"
+    assert result["current_subscription_id"] == "sub_1"
+    assert any("Ran 3 read-only tools concurrently" in line for line in result["agent_reasoning"])
+
+
+def test_action_tools_stay_sequential_after_lookups():
+    spans = []
+
+    class _TagTool:
+        name = "shopify_add_tags"
+
+        async def ainvoke(self, _args):
+            started = time.perf_counter()
+            await asyncio.sleep(0.05)
+            spans.append((started, time.perf_counter()))
+            return {"success": True}
+
+    lookup = _SlowTool("shopify_get_order_details", {"id": "gid://shopify/Order/9"}, delay=0.05)
+    llm = _ScriptedLLM([
+        {"id": "c1", "name": "shopify_get_order_details", "args": {"orderId": "#1009"}},
+        {"id": "c2", "name": "shopify_add_tags", "args": {"id": "gid://shopify/Order/9", "tags": ["a"]}},
+        {"id": "c3", "name": "shopify_add_tags", "args": {"id": "gid://shopify/Order/9", "tags": ["b"]}},
+    ])
+
+    result = asyncio.run(_run_react_agent(
+        llm, [lookup, _TagTool()], "You are a support agent.",
+        {"messages": [HumanMessage(content="Tag it")]},
+    ))
+
+    assert [e["tool_name"] for e in result["tool_calls_log"]] == [
+        "shopify_get_order_details", "shopify_add_tags", "shopify_add_tags",
+    ]
+    assert spans[0][1] <= spans[1][0]
+    assert not any("concurrently" in line for line in result["agent_reasoning"])
@@ -0,0 +1,145 @@
+"""
+Tests for the per-run ReAct budget.
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agents.react_agents import _FALLBACK_RESPONSE, _FINALIZE_INSTRUCTION, _run_react_agent
+from src.agents.react_budget import INTENT_BUDGETS, ReactBudget
+
+
+class _KnowledgeTool:
+    name = "shopify_get_related_knowledge_source"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, _args):
+        self.calls += 1
+        return {"success": True, "data": [{"title": f"Article {self.calls}"}]}
+
+
+class _LoopingLLM:
+    """Asks for another lookup on every call, with a fixed token usage per call."""
+
+    def __init__(self, input_tokens: int = 1000, preamble: str = ""):
+        self.input_tokens = input_tokens
+        self.preamble = preamble
+        self.conversations = []
+        self.tool_choices = []
+
+    def bind_tools(self, _tools, tool_choice=None):
+        bound = _LoopingLLM(self.input_tokens, self.preamble)
+        bound.conversations, bound.tool_choices = self.conversations, self.tool_choices
+        bound.tool_choice = tool_choice
+        return bound
+
+    async def ainvoke(self, conversation):
+        self.conversations.append(list(conversation))
+        self.tool_choices.append(getattr(self, "tool_choice", None))
+        n = len(self.conversations)
+        return AIMessage(
+            content="Here is what I found.\n\nCaz" if n > 1 else self.preamble,
+            tool_calls=[{"id": f"c{n}", "name": "shopify_get_related_knowledge_source",
+                         "args": {"question": f"q{n}"}}],
+            usage_metadata={"input_tokens": self.input_tokens, "output_tokens": 50, "total_tokens": 0},
+        )
+
+
+def _state(intent: str) -> dict:
+    return {"messages": [HumanMessage(content="Where is my order?")], "ticket_category": intent}
+
+
+def test_looping_agent_is_finalized_on_its_last_iteration():
+    tool, llm = _KnowledgeTool(), _LoopingLLM()
+    max_iterations = INTENT_BUDGETS["WISMO"][0]
+
+    result = asyncio.run(_run_react_agent(llm, [tool], "You are a support agent.", _state("WISMO")))
+
+    assert len(llm.conversations) == max_iterations
+    assert tool.calls == max_iterations - 1
+    assert llm.conversations[-1][-1].content == _FINALIZE_INSTRUCTION
+    assert llm.tool_choices == [None] * (max_iterations - 1) + [{"type": "none"}]
+    assert result["messages"][0].content == "Here is what I found.\n\nCaz"
+    assert any("nearly spent (iterations)" in line for line in result["agent_reasoning"])
+    assert result["agent_reasoning"][-1].startswith(f"ReAct budget: {max_iterations}/{max_iterations} iterations")
+
+
+def test_token_spend_forces_an_early_final_answer():
+    tool, llm = _KnowledgeTool(), _LoopingLLM(input_tokens=50_000)
+    budget = ReactBudget(max_iterations=6, deadline_s=30.0, max_tokens=60_000, max_tool_calls=8)
+
+    result = asyncio.run(_run_react_agent(llm, [tool], "You are a support agent.", _state("REFUND"), budget=budget))
+
+    assert len(llm.conversations) == 2
+    assert tool.calls == 1
+    assert any("nearly spent (tokens)" in line for line in result["agent_reasoning"])
+
+
+def test_tool_call_limit_blocks_extra_calls_and_spent_deadline_stops_the_loop():
+    tool = _KnowledgeTool()
+    budget = ReactBudget(max_iterations=6, deadline_s=30.0, max_tokens=60_000, max_tool_calls=1)
+    result = asyncio.run(_run_react_agent(_LoopingLLM(), [tool], "You are a support agent.", _state("REFUND"),
+                                          budget=budget))
+    assert tool.calls == 1
+    assert any("nearly spent (tool_calls)" in line for line in result["agent_reasoning"])
+
+    llm = _LoopingLLM(preamble="Your refund request is noted.\n\nCaz")
+    spent = ReactBudget(max_iterations=6, deadline_s=0.0, max_tokens=60_000, max_tool_calls=8)
+    result = asyncio.run(_run_react_agent(llm, [tool], "You are a support agent.", _state("REFUND"), budget=spent))
+    assert llm.tool_choices == [{"type": "none"}]
+    assert result["messages"][0].content == "Your refund request is noted.\n\nCaz"
+    assert any("exhausted (deadline)" in line for line in result["agent_reasoning"])
+
+
+def test_budget_spent_after_a_tool_turn_makes_one_call_without_tools():
+    tool = _KnowledgeTool()
+    llm = _LoopingLLM(input_tokens=60_000, preamble="Let me look that up for you.")
+    budget = ReactBudget(max_iterations=6, deadline_s=30.0, max_tokens=60_000, max_tool_calls=8)
+
+    result = asyncio.run(_run_react_agent(llm, [tool], "You are a support agent.", _state("REFUND"), budget=budget))
+
+    assert tool.calls == 1
+    assert llm.tool_choices == [None, {"type": "none"}]
+    assert llm.conversations[-1][-1].content == _FINALIZE_INSTRUCTION
+    assert result["messages"][0].content == "Here is what I found.\n\nCaz"
+    assert any("exhausted (tokens)" in line for line in result["agent_reasoning"])
+
+
+def test_failed_final_call_returns_the_fallback_not_the_preamble():
+    class _EmptyFinalLLM(_LoopingLLM):
+        def bind_tools(self, _tools, tool_choice=None):
+            return self if tool_choice is None else _EmptyFinal()
+
+    class _EmptyFinal:
+        async def ainvoke(self, _conversation):
+            return AIMessage(content="")
+
+    llm = _EmptyFinalLLM(input_tokens=60_000, preamble="Let me look that up for you.")
+    budget = ReactBudget(max_iterations=6, deadline_s=30.0, max_tokens=60_000, max_tool_calls=8)
+
+    result = asyncio.run(_run_react_agent(llm, [_KnowledgeTool()], "You are a support agent.", _state("REFUND"),
+                                          budget=budget))
+
+    assert result["messages"][0].content == _FALLBACK_RESPONSE
+
+
+def test_disabled_budget_keeps_the_iteration_cap():
+    tool, llm = _KnowledgeTool(), _LoopingLLM(input_tokens=90_000)
+    budget = ReactBudget(max_iterations=3, deadline_s=0.0, max_tokens=1, max_tool_calls=0, enabled=False)
+
+    result = asyncio.run(_run_react_agent(llm, [tool], "You are a support agent.", _state("REFUND"), budget=budget))
+
+    assert len(llm.conversations) == 3
+    assert tool.calls == 2
+    assert llm.tool_choices[-1] == {"type": "none"}
+    assert result["messages"][0].content == "Here is what I found.\n\nCaz"
+
+
+def test_intent_defaults_and_explicit_iteration_cap():
+    assert ReactBudget.for_intent("wismo").max_tool_calls == INTENT_BUDGETS["WISMO"][3]
+    assert ReactBudget.for_intent("REFUND").max_iterations == 6
+    assert ReactBudget.for_intent("REFUND", max_iterations=2).max_iterations == 2
+    assert ReactBudget.for_intent(None).deadline_s > 0
@@ -0,0 +1,130 @@
+"""
+Tests for the deterministic reflection rule engine.
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import src.patterns.reflection as reflection_module
+from src.patterns.reflection_rules import RULES, ReflectionStats, evaluate_reflection_rules
+
+
+def _verdicts(draft, *, state=None, customer="where is my order?", turn_count=1, day="Monday"):
+    state = {"customer_first_name": "Jane", "ticket_category": "WISMO", **(state or {})}
+    return {v.rule: v for v in evaluate_reflection_rules(state, draft, customer, turn_count, day)}
+
+
+def _order_lookup(status="IN_TRANSIT", total="30.00"):
+    return {
+        "tool_name": "shopify_get_order_details",
+        "params": {"orderId": "#1234"},
+        "result": {"success": True, "data": {"status": status, "totalPrice": total}},
+        "turn_index": 1,
+    }
+
+
+def test_simple_draft_is_decided_without_llm():
+    verdicts = _verdicts(
+        "Hey Jane! Your order #1234 is in transit. Could you give it until Friday?\n\nCaz",
+        state={"tool_calls_log": [_order_lookup()]},
+    )
+
+    assert list(verdicts) == list(RULES)
+    assert all(v.passed is True for v in verdicts.values())
+
+
+def test_wrong_wait_promise_day_fails():
+    verdicts = _verdicts(
+        "Hey Jane! Could you give it until Friday?\n\nCaz",
+        state={"tool_calls_log": [_order_lookup()]},
+        day="Thursday",
+    )
+
+    assert verdicts["WAIT_PROMISE"].passed is False
+    assert "early next week" in verdicts["WAIT_PROMISE"].suggested_fix
+
+
+def test_first_turn_refund_fails_waterfall():
+    refund = {
+        "tool_name": "shopify_refund_order",
+        "params": {"orderId": "gid://shopify/Order/1"},
+        "result": {"success": True},
+        "turn_index": 1,
+    }
+    verdicts = _verdicts(
+        "Hey Jane, I've processed your refund.\n\nCaz",
+        state={"ticket_category": "REFUND", "tool_calls_log": [_order_lookup(), refund]},
+    )
+
+    assert verdicts["RESOLUTION_ORDER"].passed is False
+    assert verdicts["RESOLUTION_WATERFALL"].passed is False
+    assert verdicts["INFORMATION_GATHERING"].passed is None
+
+
+def test_signature_fails_and_unsupported_amount_is_left_to_llm():
+    verdicts = _verdicts("Hey Jane, I can offer $45.00 in store credit.")
+
+    assert verdicts["TONE_PERSONA"].passed is False
+    # The amount may come from an earlier turn's lookup, so Haiku decides.
+    assert verdicts["FACTUAL_ACCURACY"].passed is None
+
+
+def test_gid_rule_ignores_blocked_calls():
+    blocked = {
+        "tool_name": "shopify_refund_order",
+        "params": {"orderId": "#1234"},
+        "result": {"success": False, "error": "BLOCKED: refund needs an order GID"},
+        "turn_index": 1,
+    }
+    ran = {**blocked, "result": {"success": True}}
+    draft = "Hey Jane, I've looked into your order #1234.\n\nCaz"
+    state = {"ticket_category": "REFUND", "tool_calls_log": [_order_lookup(), blocked]}
+
+    assert _verdicts(draft, state=state)["GID_FORMAT"].passed is True
+    state["tool_calls_log"] = [_order_lookup(), ran]
+    assert _verdicts(draft, state=state)["GID_FORMAT"].passed is False
+
+
+def test_store_credit_bonus_amount_matches_tool_total():
+    verdicts = _verdicts(
+        "Hey Jane, I can offer $33.00 in store credit.\n\nCaz",
+        state={"tool_calls_log": [_order_lookup(total="30.00")]},
+    )
+
+    assert verdicts["FACTUAL_ACCURACY"].passed is True
+
+
+def test_escalation_triggers_leave_rule_to_llm():
+    verdicts = _verdicts("Hey Jane, sorry about that.\n\nCaz", turn_count=3)
+
+    assert verdicts["ESCALATION_CHECK"].passed is None
+
+
+def test_validator_skips_llm_when_rules_decide(monkeypatch):
+    class _NoCallModel:
+        async def ainvoke(self, *_args, **_kwargs):
+            raise AssertionError("Haiku should not be called")
+
+    stats = ReflectionStats()
+    monkeypatch.setattr(reflection_module, "haiku_llm", _NoCallModel())
+    monkeypatch.setattr(reflection_module, "reflection_stats", stats)
+    monkeypatch.setattr(
+        reflection_module, "get_current_context",
+        lambda: {"day_of_week": "Monday", "current_date": "2026-10-12"},
+    )
+    state = {
+        "customer_first_name": "Jane",
+        "ticket_category": "WISMO",
+        "tool_calls_log": [_order_lookup()],
+        "messages": [
+            HumanMessage(content="Where is my order #1234?"),
+            AIMessage(content="Hey Jane! It's in transit, could you give it until Friday?\n\nCaz"),
+        ],
+    }
+
+    output = asyncio.run(reflection_module.reflection_validator_node(state))
+
+    assert output["reflection_passed"] is True
+    assert "LLM-free 1/1 (100%)" in output["agent_reasoning"][0]
+    assert stats.stats()["llm_free_rate"] == 1.0
@@ -0,0 +1,91 @@
+"""
+Tests for structured-output reflection verdicts and parse counters.
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import src.patterns.reflection as reflection_module
+from src.patterns.reflection_rules import ReflectionStats
+
+
+class _ToolCallingModel:
+    def __init__(self, args: dict):
+        self.args = args
+        self.bound_with = None
+        self.calls = 0
+
+    def bind_tools(self, tools, **kwargs):
+        self.bound_with = (tools, kwargs)
+        return self
+
+    async def ainvoke(self, _prompt, _config=None, **_kwargs):
+        self.calls += 1
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": "ReflectionVerdict", "args": self.args, "id": "call_1"}],
+        )
+
+
+class _TextModel:
+    def __init__(self, *replies: str):
+        self.replies = list(replies)
+        self.calls = 0
+
+    async def ainvoke(self, _prompt, _config=None, **_kwargs):
+        self.calls += 1
+        return AIMessage(content=self.replies.pop(0))
+
+
+def _state() -> dict:
+    # No first name in the draft → TONE_PERSONA stays undecided, so Haiku runs.
+    return {
+        "customer_first_name": "Jane",
+        "ticket_category": "WISMO",
+        "messages": [
+            HumanMessage(content="Where is my order?"),
+            AIMessage(content="Hi! Let me know your order number.\n\nCaz"),
+        ],
+    }
+
+
+def _run(monkeypatch, llm) -> tuple[dict, ReflectionStats]:
+    stats = ReflectionStats()
+    monkeypatch.setattr(reflection_module, "haiku_llm", llm)
+    monkeypatch.setattr(reflection_module, "reflection_stats", stats)
+    monkeypatch.setattr(reflection_module, "_structured", (None, None))
+    monkeypatch.setattr(
+        reflection_module, "get_current_context",
+        lambda: {"day_of_week": "Monday", "current_date": "2026-10-12"},
+    )
+    return asyncio.run(reflection_module.reflection_validator_node(_state())), stats
+
+
+def test_structured_verdict_needs_one_call(monkeypatch):
+    llm = _ToolCallingModel({
+        "pass": False,
+        "rule_violated": "TONE_PERSONA",
+        "reason": "No first name",
+        "suggested_fix": "Greet Jane by name",
+    })
+
+    output, stats = _run(monkeypatch, llm)
+
+    assert llm.calls == 1
+    assert llm.bound_with[1] == {"tool_choice": "ReflectionVerdict"}
+    assert output["reflection_passed"] is False
+    assert output["reflection_rule_violated"] == "TONE_PERSONA"
+    assert stats.stats()["verdict_calls"] == {"structured": 1, "text": 0}
+    assert stats.stats()["parse_failures"] == {"structured": 0, "text": 0}
+
+
+def test_text_mode_counts_parse_failure_and_retry(monkeypatch):
+    llm = _TextModel("Looks fine to me!", '{"pass": true}')
+
+    output, stats = _run(monkeypatch, llm)
+
+    assert llm.calls == 2
+    assert output["reflection_passed"] is True
+    assert stats.stats()["parse_failures"]["text"] == 1
+    assert stats.stats()["parse_retries"]["text"] == 1
@@ -14,7 +14,10 @@ from src.patterns.intent_classifier import (
 )
 from src.graph.graph_builder import (
     _route_after_input_guardrails,
+    _route_after_pre_routing,
+    build_graph,
     output_guardrails_final_node,
+    pre_routing_node,
 )
 
 
@@ -100,3 +103,126 @@ class TestGraphRouting:
         state = {"messages": [_MockMessage("Your order is guaranteed by tomorrow!")]}
         result = asyncio.run(output_guardrails_final_node(state))
         assert result["output_guardrail_passed"] is False
+
+
+class TestFusedPreRouting:
+    def _human(self, content: str):
+        return _MockMessage(content, "human")
+
+    def test_locked_session_short_circuits_to_end(self):
+        state = {"is_escalated": True, "customer_first_name": "Sarah", "messages": [self._human("Any update?")]}
+        update = asyncio.run(pre_routing_node(state))
+        assert update["is_escalated"] is True
+        assert "Monica" in update["messages"][0].content
+        assert update["agent_reasoning"] == [
+            "ESCALATION LOCK: Session is locked",
+            "SESSION LOCKED: Post-escalation auto-response",
+        ]
+        assert _route_after_pre_routing({**state, **update}) == "__end__"
+
+    def test_blocked_input_matches_separate_nodes(self):
+        state = {"customer_first_name": "Sarah", "messages": [self._human("?? !!")]}
+        update = asyncio.run(pre_routing_node(state))
+        assert update["input_blocked"] is True
+        assert update["was_revised"] is False
+        assert update["agent_reasoning"][-1] == "INPUT GUARDRAIL: Empty or gibberish message"
+        assert _route_after_pre_routing({**state, **update}) == "__end__"
+
+    def test_health_concern_folds_auto_escalate(self):
+        state = {"messages": [self._human("My son got a rash from the patches")]}
+        update = asyncio.run(pre_routing_node(state))
+        assert update["escalation_reason"] == "health_concern"
+        assert update["current_agent"] == "issue_agent"
+        assert update["agent_reasoning"][-1].startswith("AUTO-ESCALATE")
+        assert _route_after_pre_routing({**state, **update}) == "escalation_handler"
+
+    def test_clean_input_routes_to_classifier(self):
+        state = {"messages": [self._human("Where is my order #43189?")]}
+        update = asyncio.run(pre_routing_node(state))
+        assert update["input_blocked"] is False
+        assert _route_after_pre_routing({**state, **update}) == "intent_classifier"
+
+    def test_fused_graph_compiles_without_separate_nodes(self):
+        graph = build_graph(fused_pre_routing=True)
+        assert "pre_routing" in graph.nodes
+        assert "escalation_lock" not in graph.nodes
+        assert "input_guardrails" not in graph.nodes
+
+
+class TestSpeculativeIntentClassification:
+    def test_classifier_reuses_speculative_result_on_redacted_text(self, monkeypatch):
+        from langchain_core.messages import HumanMessage
+
+        import src.patterns.intent_classifier as classifier_module
+        from src.graph.graph_builder import escalation_lock_node
+        from src.patterns.guardrails import input_guardrails_node
+
+        seen: list[str] = []
+
+        async def fake_classify(message, *, strict=False):
+            seen.append(message)
+            await asyncio.sleep(0)
+            return "WISMO", 95
+
+        monkeypatch.setattr(classifier_module, "classify_intent", fake_classify)
+        monkeypatch.setattr(classifier_module, "SPECULATIVE_INTENT_ENABLED", True)
+        state = {
+            "messages": [HumanMessage(content="Where is my order? Email me at jane@example.com", id="m1")],
+            "customer_first_name": "Jane",
+        }
+
+        async def _turn():
+            await escalation_lock_node(state)
+            input_guardrails_node(state)
+            return await classifier_module.intent_classifier_node(state)
+
+        result = asyncio.run(_turn())
+
+        assert result["ticket_category"] == "WISMO"
+        assert seen == ["Where is my order? Email me at [EMAIL REDACTED]"]
+        assert "m1" not in classifier_module._speculations
+
+    def test_blocked_turn_cancels_speculation(self, monkeypatch):
+        from langchain_core.messages import HumanMessage
+
+        import src.patterns.intent_classifier as classifier_module
+
+        async def slow_classify(message, *, strict=False):
+            await asyncio.sleep(10)
+            return "GENERAL", 50
+
+        monkeypatch.setattr(classifier_module, "classify_intent", slow_classify)
+        monkeypatch.setattr(classifier_module, "SPECULATIVE_INTENT_ENABLED", True)
+        state = {"messages": [HumanMessage(content="Where is my package?", id="m2")]}
+
+        async def _turn():
+            assert classifier_module.start_speculative_classification(state)
+            task = classifier_module._speculations["m2"].task
+            route = _route_after_input_guardrails({**state, "input_blocked": True})
+            await asyncio.sleep(0)
+            return route, task
+
+        route, task = asyncio.run(_turn())
+
+        assert route == "__end__"
+        assert task.cancelled()
+        assert "m2" not in classifier_module._speculations
+
+    def test_short_acknowledgement_is_not_speculated(self, monkeypatch):
+        from langchain_core.messages import AIMessage, HumanMessage
+
+        import src.patterns.intent_classifier as classifier_module
+
+        monkeypatch.setattr(classifier_module, "SPECULATIVE_INTENT_ENABLED", True)
+        state = {
+            "messages": [
+                HumanMessage(content="Where is my order?", id="h1"),
+                AIMessage(content="Let me check."),
+                HumanMessage(content="ok thanks", id="h2"),
+            ]
+        }
+
+        async def _start():
+            return classifier_module.start_speculative_classification(state)
+
+        assert asyncio.run(_start()) is False
@@ -36,6 +36,10 @@ Usage:
     CATEGORIES     — Comma-separated categories to run (default: all)
     RESET_BETWEEN  — Reset mock API state between scenarios (default: true)
     VERBOSE        — Show full JSON payloads in log (default: true)
+
+  Record/replay (set on the app server, see src/llm/cassette.py):
+    LLM_CASSETTE_MODE=record  — first run stores every LLM response
+    LLM_CASSETTE_MODE=replay  — later runs serve them from LLM_CASSETTE_DIR
 """
 
 from __future__ import annotations
@@ -990,6 +994,29 @@ def main():
             logger.log(f"    {status} {r['id']:20s} {r['duration_s']:6.1f}s")
         logger.log()
 
+        # ── Latency & model usage (compare runs with/without model routing) ─
+        turn_times = sorted(t["duration_s"] for r in results for t in r.get("turns", []) if "duration_s" in t)
+        if turn_times:
+            logger.subsection("LATENCY & MODEL USAGE")
+            logger.log(f"    Median turn:  {turn_times[len(turn_times) // 2]:.2f}s")
+            logger.log(f"    p95 turn:     {turn_times[min(len(turn_times) - 1, int(len(turn_times) * 0.95))]:.2f}s")
+            try:
+                app_metrics = client.get(f"{APP_URL}/metrics", timeout=5).json()
+                for day, summary in app_metrics.get("model_calls", {}).get("per_day", {}).items():
+                    for model, totals in summary.get("by_model", {}).items():
+                        logger.log(
+                            f"    {day} {model:30s} calls={totals['calls']:4d} "
+                            f"cost=${totals['cost_usd']:.4f}"
+                        )
+                routing = app_metrics.get("agent_model_routing", {})
+                logger.log(
+                    f"    Agent turns on Haiku: {routing.get('haiku_share', 0):.0%} "
+                    f"(upgrades: {routing.get('upgrades', {})})"
+                )
+            except Exception as e:
+                logger.log(f"    (metrics unavailable: {e})")
+            logger.log()
+
         # ── Multi-turn analysis ──────────────────────────────────────────
         multi_turn = [r for r in results if len(r.get("turns", [])) > 1]
         if multi_turn:
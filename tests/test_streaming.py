@@ -0,0 +1,159 @@
+"""
+Tests for streaming the final ReAct answer to a per-request channel.
+"""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessageChunk, HumanMessage
+
+from src import main
+import src.agents.model_router as router_module
+import src.agents.react_agents as agents_module
+from src.agents.model_router import ModelRouterStats
+from src.agents.react_agents import _run_react_agent
+from src.llm.streaming import CustomerTextFilter, TokenChannel, current_channel, stream_to
+
+
+def _drain(channel: TokenChannel) -> list[dict]:
+    events = []
+    while not channel._queue.empty():
+        event = channel._queue.get_nowait()
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def _streamed_text(events: list[dict]) -> str:
+    text = ""
+    for event in events:
+        if event["type"] == "reset":
+            text = ""
+        elif event["type"] == "token":
+            text += event["text"]
+    return text
+
+
+def test_filter_hides_reasoning_lines_and_flags_control_commands():
+    f = CustomerTextFilter()
+    out = "".join(f.feed(piece) for piece in ["THO", "UGHT: check order\nHey Sa", "rah!\n", "Caz"])
+    assert out + f.flush() == "Hey Sarah!\nCaz"
+    assert not f.control_seen
+
+    f = CustomerTextFilter()
+    assert f.feed("HANDOFF: account_agent | REASON: cancel") + f.flush() == ""
+    assert f.control_seen
+
+
+class _StreamingLLM:
+    """First iteration: preamble text then a tool call. Second: final answer."""
+
+    def __init__(self):
+        self.turn = 0
+
+    def bind_tools(self, _tools):
+        return self
+
+    async def astream(self, _conversation):
+        self.turn += 1
+        if self.turn == 1:
+            yield AIMessageChunk(content="Let me check that.")
+            yield AIMessageChunk(
+                content="",
+                tool_call_chunks=[{"name": "lookup", "args": "{}", "id": "call_1", "index": 1}],
+            )
+            return
+        for piece in ["Thought: shipped\n", "Your order ", "is on its way!\n\n", "Caz"]:
+            yield AIMessageChunk(content=piece)
+
+
+class _LookupTool:
+    name = "lookup"
+
+    async def ainvoke(self, _args):
+        return {"success": True, "data": {}}
+
+
+def test_react_loop_streams_only_the_final_answer():
+    channel = TokenChannel()
+
+    async def run():
+        with stream_to(channel):
+            return await _run_react_agent(
+                _StreamingLLM(),
+                [_LookupTool()],
+                "You are a support agent.",
+                {"messages": [HumanMessage(content="Where is my order?")]},
+            )
+
+    result = asyncio.run(run())
+    events = _drain(channel)
+
+    assert {"type": "reset"} in events
+    assert _streamed_text(events) == "Your order is on its way!\n\nCaz"
+    assert result["messages"][0].content == "Your order is on its way!\n\nCaz"
+
+
+class _StreamingReplyLLM:
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.calls = 0
+
+    def bind_tools(self, _tools, **_kwargs):
+        return self
+
+    async def astream(self, _conversation):
+        self.calls += 1
+        for word in self.reply.split(" "):
+            yield AIMessageChunk(content=word + " ")
+
+
+def test_rejected_haiku_draft_is_retracted_before_sonnet_rerun(monkeypatch):
+    haiku = _StreamingReplyLLM("Your order is on the way.")  # no first name, no signature
+    sonnet = _StreamingReplyLLM("Hey Jane! Your order #1234 is on its way.\n\nCaz")
+    monkeypatch.setattr(router_module, "haiku_llm", haiku)
+    monkeypatch.setattr(agents_module, "model_router_stats", ModelRouterStats())
+    agents_module.compile_agents(llm=sonnet, haiku=haiku)
+    channel = TokenChannel()
+
+    async def run():
+        with stream_to(channel):
+            return await agents_module.wismo_agent_node({
+                "messages": [HumanMessage(content="Where is my order #1234?")],
+                "ticket_category": "WISMO",
+                "intent_confidence": 95,
+                "customer_first_name": "Jane",
+            })
+
+    try:
+        result = asyncio.run(run())
+    finally:
+        agents_module.compile_agents()
+    events = _drain(channel)
+
+    assert result["agent_model"] == "sonnet"
+    assert haiku.calls == 1 and sonnet.calls == 1
+    assert "Your order is on the way." in "".join(e.get("text", "") for e in events)
+    assert _streamed_text(events).strip() == "Hey Jane! Your order #1234 is on its way.\n\nCaz"
+
+
+class _StreamingGraph:
+    async def ainvoke(self, _input_state, config=None):
+        current_channel().token("Hi Sarah")
+        return {"messages": [], "current_agent": "wismo_agent", "ticket_category": "WISMO"}
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_emits_tokens_then_final(monkeypatch):
+    monkeypatch.setattr(main, "graph", _StreamingGraph())
+    monkeypatch.setattr(main, "sessions", {})
+    monkeypatch.setattr(main.database, "update_preview", lambda *_args, **_kwargs: None)
+
+    resp = await main.send_message_stream(main.MessageRequest(session_id="s1", message="hello"))
+    body = [chunk async for chunk in resp.body_iterator]
+    events = [json.loads(line[len("data: "):]) for line in body]
+
+    assert events[0] == {"type": "token", "text": "Hi Sarah"}
+    assert events[-1]["type"] == "final"
+    assert events[-1]["agent"] == "wismo_agent"
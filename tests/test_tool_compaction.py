@@ -0,0 +1,98 @@
+"""
+Tests for model-facing tool result compaction.
+"""
+
+import asyncio
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.agents.react_agents import _run_react_agent
+from src.tools.compaction import MAX_ORDERS, compact_tool_result, tool_message_content
+
+
+def _order(n: int, status: str = "FULFILLED") -> dict:
+    return {
+        "id": f"gid://shopify/Order/{5000 + n}",
+        "name": f"#{1000 + n}",
+        "createdAt": f"2026-01-{n % 28 + 1:02d}T10:00:00Z",
+        "status": status,
+        "trackingUrl": f"https://tracking.example.com/{n}",
+        "totalPrice": "29.99",
+        "shippingAddress": {"address1": "1 Long Street", "city": "Springfield", "zip": "12345",
+                            "country": "United States", "phone": "+1 555 0100"},
+        "lineItems": [{"title": "SleepyPatch", "quantity": 2, "sku": "SP-24", "vendor": "NatPat",
+                       "image": {"url": "https://cdn.example.com/sleepy.png"}}],
+        "note": "Leave at the door. " * 20,
+    }
+
+
+def test_order_keeps_prompt_fields_and_drops_the_rest():
+    result = {"success": True, "data": _order(3)}
+
+    data = compact_tool_result("shopify_get_order_details", result)["data"]
+
+    assert data["id"] == "gid://shopify/Order/5003"
+    assert data["name"] == "#1003"
+    assert data["status"] == "FULFILLED"
+    assert data["trackingUrl"].endswith("/3")
+    assert data["totalPrice"] == "29.99"
+    assert data["lineItems"] == [{"title": "SleepyPatch", "quantity": 2}]
+    assert "shippingAddress" not in data and "note" not in data
+    assert "shippingAddress" in result["data"]  # original untouched
+
+
+def test_long_order_list_is_summarised():
+    orders = [_order(n, "DELIVERED" if n % 2 else "FULFILLED") for n in range(25)]
+    result = {"success": True, "data": {"orders": orders, "hasNextPage": True, "endCursor": "abc"}}
+
+    data = compact_tool_result("shopify_get_customer_orders", result)["data"]
+
+    assert len(data["orders"]) == MAX_ORDERS
+    assert data["orders"][0]["createdAt"] >= data["orders"][-1]["createdAt"]
+    assert data["olderOrders"]["count"] == 25 - MAX_ORDERS
+    assert sum(data["olderOrders"]["byStatus"].values()) == 25 - MAX_ORDERS
+    assert data["hasNextPage"] is True and data["endCursor"] == "abc"
+
+
+def test_errors_actions_and_unknown_shapes_are_safe():
+    error = {"success": False, "error": "Order not found"}
+    action = {"success": True, "data": {"code": "DISCOUNT_LF_1"}}
+    odd = {"success": True, "data": {"blob": "x" * 5000}}
+
+    assert compact_tool_result("shopify_get_order_details", error) is error
+    assert compact_tool_result("shopify_create_discount_code", action) is action
+    assert tool_message_content("shopify_create_discount_code", action) == (json.dumps(action), 0)
+    assert len(compact_tool_result("shopify_get_product_details", odd)["data"]["blob"]) < 700
+
+
+def test_react_loop_sends_compact_result_and_logs_full_payload():
+    full = {"success": True, "data": {"orders": [_order(n) for n in range(30)], "hasNextPage": False}}
+    seen = []
+
+    class _OrdersTool:
+        name = "shopify_get_customer_orders"
+
+        async def ainvoke(self, _args):
+            return full
+
+    class _LLM:
+        def bind_tools(self, _tools):
+            return self
+
+        async def ainvoke(self, conversation):
+            if not any(isinstance(m, ToolMessage) for m in conversation):
+                return AIMessage(content="", tool_calls=[
+                    {"id": "c1", "name": "shopify_get_customer_orders", "args": {"email": "a@b.co"}},
+                ])
+            seen.append(conversation[-1].content)
+            return AIMessage(content="Found your orders.\n\nCaz")
+
+    result = asyncio.run(_run_react_agent(
+        _LLM(), [_OrdersTool()], "You are a support agent.",
+        {"messages": [HumanMessage(content="What did I order?")]},
+    ))
+
+    assert len(seen[0]) < len(json.dumps(full)) / 3
+    assert result["tool_calls_log"][0]["result"] is full
+    assert any(line.startswith("Tool result compaction: ~") for line in result["agent_reasoning"])
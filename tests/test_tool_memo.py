@@ -0,0 +1,105 @@
+"""
+Tests for the turn-scoped tool memo used across agent handoffs.
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.agents.react_agents import _build_system_message, _run_react_agent
+from src.agents.tool_memo import TurnToolMemo, turn_findings
+from src.patterns.handoff import handoff_router_node
+from src.prompts import build_issue_prompt
+
+_ORDER = {
+    "success": True,
+    "data": {"id": "gid://shopify/Order/5531", "name": "#1234", "status": "FULFILLED", "totalPrice": "29.99"},
+}
+
+
+def _entry(tool_name: str, params: dict, result: dict, turn_index: int = 1) -> dict:
+    return {"tool_name": tool_name, "params": params, "result": result, "turn_index": turn_index}
+
+
+class _OrderTool:
+    name = "shopify_get_order_details"
+
+    def __init__(self):
+        self.calls = []
+
+    async def ainvoke(self, args):
+        self.calls.append(args)
+        return _ORDER
+
+
+class _ScriptedLLM:
+    def __init__(self, *tool_calls):
+        self.tool_calls = list(tool_calls)
+        self.seen = []
+
+    def bind_tools(self, _tools):
+        return self
+
+    async def ainvoke(self, conversation):
+        if self.tool_calls:
+            return AIMessage(content="", tool_calls=[self.tool_calls.pop(0)])
+        self.seen.append(conversation[-1])
+        return AIMessage(content="Your order #1234 was delivered.\n\nCaz")
+
+
+def test_handoff_target_reuses_lookup_without_calling_the_api():
+    tool = _OrderTool()
+    llm = _ScriptedLLM({"id": "c1", "name": "shopify_get_order_details", "args": {"orderId": "1234"}})
+    state = {
+        "messages": [HumanMessage(content="Where is order 1234?")],
+        "tool_calls_log": [_entry("shopify_get_order_details", {"orderId": "#1234"}, _ORDER)],
+    }
+
+    result = asyncio.run(_run_react_agent(llm, [tool], "You are a support agent.", state))
+
+    assert tool.calls == []
+    assert isinstance(llm.seen[0], ToolMessage) and "#1234" in llm.seen[0].content
+    assert result["tool_calls_log"][-1]["reused"] is True
+    assert result["current_order_id"] == "gid://shopify/Order/5531"
+    assert any("Reused shopify_get_order_details" in line for line in result["agent_reasoning"])
+
+
+def test_memo_is_turn_scoped_and_cleared_by_actions():
+    log = [
+        _entry("shopify_get_order_details", {"orderId": "#1234"}, _ORDER, turn_index=1),
+        _entry("shopify_get_order_details", {"orderId": "#1234"}, _ORDER, turn_index=2),
+    ]
+    memo = TurnToolMemo(log, turn_index=2)
+    assert memo.get("shopify_get_order_details", {"orderId": "#1234"}) is _ORDER
+    assert TurnToolMemo(log, turn_index=3).get("shopify_get_order_details", {"orderId": "#1234"}) is None
+
+    memo.record(_entry("shopify_cancel_order", {"orderId": "gid://shopify/Order/5531"}, {"success": False}))
+    assert memo.get("shopify_get_order_details", {"orderId": "#1234"}) is _ORDER
+
+    memo.record(_entry("shopify_cancel_order", {"orderId": "gid://shopify/Order/5531"}, {"success": True}))
+    assert memo.get("shopify_get_order_details", {"orderId": "#1234"}) is None
+
+
+def test_handoff_note_and_findings_reach_the_target_prompt():
+    first_turn = HumanMessage(content="Hi")
+    this_turn = HumanMessage(content="Order 1234 arrived broken")
+    state = {
+        "messages": [first_turn, AIMessage(content="Hello!"), this_turn,
+                     AIMessage(content="HANDOFF: issue_agent | REASON: damaged item", id="m4")],
+        "current_agent": "wismo_agent",
+        "tool_calls_log": [
+            _entry("shopify_get_order_details", {"orderId": "#9999"}, _ORDER, turn_index=1),
+            _entry("shopify_get_order_details", {"orderId": "#1234"}, _ORDER, turn_index=2),
+        ],
+        "customer_first_name": "Jane",
+    }
+
+    update = handoff_router_node(state)
+    assert update["handoff_note"] == "wismo_agent → issue_agent: damaged item"
+
+    routed = {**state, **{key: value for key, value in update.items() if key != "messages"}}
+    blocks = _build_system_message(build_issue_prompt, routed)
+    context = blocks[-1]["text"]
+    assert "HANDOFF THIS TURN: wismo_agent → issue_agent: damaged item" in context
+    assert '"#1234"' in context and "#9999" not in context
+    assert turn_findings(state["tool_calls_log"], turn_index=3) == []